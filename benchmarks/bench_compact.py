@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Compare memory held by full and compact (read-only) entities.
+
+Builds N strategies from the strategy fixture, as T1.get would from parser
+output, and reports the memory retained by each representation, measured
+with tracemalloc. Run from the repository root:
+
+    python benchmarks/bench_compact.py [N]
+"""
+
+from __future__ import absolute_import, division, print_function
+import copy
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+sys.path.insert(0, ROOT)
+
+from terminalone import T1  # noqa: E402
+from terminalone.xmlparser import XMLParser  # noqa: E402
+
+FIXTURE = os.path.join(ROOT, 'tests', 'fixtures', 'xml',
+                       'strategy_with_deals.xml')
+
+
+def load_strategy():
+    with open(FIXTURE, 'rb') as f:
+        strategy = XMLParser(f.read()).entities
+    strategy.pop('relations', None)
+    return strategy
+
+
+def measure(t1, template, number, compact):
+    # Parser output is dropped afterwards, so what's left is only what the
+    # entities keep alive (full entities keep the parsed dict itself)
+    tracemalloc.start()
+    dicts = [dict(template, id=i) for i in range(number)]
+    entities = [t1._return_class(d, compact=compact) for d in dicts]
+    del dicts
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(entities) == number
+    return size
+
+
+def main(number=50000):
+    t1 = T1(auth_method='delayed', api_base='api.mediamath.com')
+    template = load_strategy()
+    full = measure(t1, copy.deepcopy(template), number, compact=False)
+    compact = measure(t1, copy.deepcopy(template), number, compact=True)
+    print('{} strategies, {} properties each'.format(number, len(template)))
+    print('{:<10}{:>12}{:>14}'.format('mode', 'total MiB', 'bytes/entity'))
+    for mode, size in (('full', full), ('compact', compact)):
+        print('{:<10}{:>12.1f}{:>14.0f}'.format(
+            mode, size / 2 ** 20, size / number))
+    print('compact uses {:.1%} of full'.format(compact / full))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Measure how long `import terminalone` takes in a fresh interpreter.
+
+Runs `python -X importtime -c "import terminalone"` a number of times and
+reports the best total, the share spent in terminalone's own modules and
+the slowest modules imported. Also lists which models and optional
+dependencies got imported, which should be none until used.
+Run from the repository root (requires Python 3.7+):
+
+    python benchmarks/bench_import.py [runs]
+"""
+
+from __future__ import absolute_import, division, print_function
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+CHECK = ('import sys, terminalone; '
+         'print(sorted(m for m in sys.modules if m.startswith("terminalone.models.") '
+         'or m in ("jwt", "dotenv", "numpy", "pandas", "pyarrow")))')
+
+
+def import_times():
+    """Return {module: (self us, cumulative us)} for one fresh import."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import terminalone'],
+        stderr=subprocess.STDOUT, env=env, cwd=ROOT).decode('utf-8')
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative))
+    return times, env
+
+
+def main(runs=10):
+    best = None
+    for _ in range(runs):
+        times, env = import_times()
+        if best is None or times['terminalone'][1] < best['terminalone'][1]:
+            best = times
+    own = sum(self_us for name, (self_us, _) in best.items()
+              if name.startswith('terminalone'))
+    print('import terminalone: {:.1f} ms (best of {}), {:.1f} ms in '
+          'terminalone modules'.format(best['terminalone'][1] / 1000, runs,
+                                       own / 1000))
+    print('\nslowest modules (self ms):')
+    slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_us, _) in slowest[:10]:
+        print('  {:<40}{:>8.1f}'.format(name, self_us / 1000))
+    loaded = subprocess.check_output([sys.executable, '-c', CHECK], env=env,
+                                     cwd=ROOT).decode('utf-8').strip()
+    print('\nmodels and optional dependencies imported: {}'.format(loaded))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
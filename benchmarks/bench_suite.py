@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""Offline benchmarks of parsing, entity construction and encoding.
+
+Scales the test fixtures up to large synthetic pages (the top-level
+entities are repeated with new IDs) and measures, without any network:
+
+- json_parse, xml_parse: JSONParser/XMLParser over each fixture page
+- entities: T1._return_class over parsed XML pages, relations included
+- form_encoding: the form data Entity.save would post, for every property
+- report_csv, report_csv_dict: Report.get reading a streamed CSV response,
+  as lists and as dicts
+- report_file: Report.get reading a file saved by Report.download
+
+For each, reports the best time of several runs, throughput, and the peak
+memory allocated during one run (measured with tracemalloc). Results can
+be saved and later compared against, to catch regressions:
+
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json
+
+Exits with status 1 if any benchmark got slower than the baseline by more
+than the tolerance. Run from the repository root (requires Python 3.4+);
+see --help for options.
+"""
+
+from __future__ import absolute_import, division, print_function
+import argparse
+import copy
+import csv
+import gc
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+from timeit import default_timer
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+from terminalone import T1  # noqa: E402
+from terminalone.jsoncodec import get_codec  # noqa: E402
+from terminalone.jsonparser import JSONParser  # noqa: E402
+from terminalone.xmlparser import XMLParser  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+
+# Fixtures with nested relations, which is where most of the work goes
+PAGES = ('campaigns_with_strategies', 'atomic_creatives_with_creative_approvals')
+
+
+def fixture(kind, name):
+    with open(os.path.join(FIXTURES, kind, name + '.' + kind), 'rb') as f:
+        return f.read()
+
+
+def scale_json(body, number):
+    """JSON page of `number` entities repeating those of body."""
+    page = json.loads(body.decode('utf-8'))
+    data = page['data'] if isinstance(page['data'], list) else [page['data']]
+    entities = []
+    for i in range(number):
+        entity = copy.deepcopy(data[i % len(data)])
+        entity['id'] = i + 1
+        entities.append(entity)
+    page['data'] = entities
+    page['meta'].update(count=number, total_count=number, offset=0)
+    return json.dumps(page).encode('utf-8')
+
+
+def scale_xml(body, number):
+    """XML collection page of `number` entities repeating those of body."""
+    root = ET.fromstring(body)
+    parent = root.find('entities')
+    entities = list(parent if parent is not None else root.findall('entity'))
+    result = ET.Element('result', root.attrib)
+    collection = ET.SubElement(result, 'entities',
+                               {'count': str(number), 'start': '0'})
+    for i in range(number):
+        entity = copy.deepcopy(entities[i % len(entities)])
+        entity.set('id', str(i + 1))
+        collection.append(entity)
+    result.append(root.find('status'))
+    return ET.tostring(result)
+
+
+def report_csv(number):
+    """CSV report body of `number` rows, with the performance report's
+    columns."""
+    meta = json.loads(fixture('json', 'performance_meta').decode('utf-8'))
+    structure = meta['structure']
+    columns = (list(structure['time_field']) + list(structure['dimensions']) +
+               list(structure['metrics']))
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(columns)
+    for i in range(number):
+        impressions = 1000 + i % 5000
+        clicks = i % 37
+        writer.writerow(['2016-03-{:02d}'.format(i % 28 + 1),
+                         'Campaign {}'.format(i % 500), '{:.2f}'.format(i / 7),
+                         clicks, '{:.4f}'.format(clicks / impressions),
+                         impressions, '{:.2f}'.format(i / 5)])
+    return out.getvalue().encode('utf-8')
+
+
+def streamed(body):
+    """requests.Response reading body as if from the socket."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'text/csv; charset=UTF-8'
+    response.encoding = 'UTF-8'
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def measure(setup, func, repeat):
+    """Return (best seconds, peak bytes allocated) of func(setup())."""
+    best = None
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        started = default_timer()
+        func(state)
+        elapsed = default_timer() - started
+        best = elapsed if best is None else min(best, elapsed)
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    func(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def benchmarks(t1, number, directory):
+    """Yield (name, items, bytes, setup, func) for each benchmark."""
+    loads = t1.json_codec.loads
+    for name in PAGES:
+        body = scale_json(fixture('json', name), number)
+        yield ('json_parse/' + name, number, len(body), lambda b=body: b,
+               lambda b: list(JSONParser(b, loads=loads).entities))
+    for name in PAGES:
+        body = scale_xml(fixture('xml', name), number)
+        yield ('xml_parse/' + name, number, len(body), lambda b=body: b,
+               lambda b: list(XMLParser(b).entities))
+
+    for name in PAGES:
+        # _return_class takes over the parsed dicts, so parse anew each run
+        body = scale_xml(fixture('xml', name), number)
+        yield ('entities/' + name, number, None,
+               lambda b=body: list(XMLParser(b).entities),
+               lambda entities: [t1._return_class(e) for e in entities])
+
+    body = scale_xml(fixture('xml', 'atomic_creatives_with_creative_approvals'),
+                     number)
+    yield ('form_encoding/atomic_creatives', number, None,
+           lambda: [t1._return_class(e) for e in XMLParser(body).entities],
+           lambda entities: [e.get_formdata(includeunchanged=True)
+                             for e in entities])
+
+    rows = number * 10
+    body = report_csv(rows)
+    path = os.path.join(directory, 'performance.csv')
+    with open(path, 'wb') as f:
+        f.write(body)
+
+    def read_report(as_dict, path=None):
+        def run(response):
+            report = t1.new('report', 'performance')
+            report._get_data = lambda params: response
+            _, reader = report.get(as_dict=as_dict, path=path)
+            for _ in reader:
+                pass
+        return run
+
+    yield ('report_csv', rows, len(body), lambda: streamed(body),
+           read_report(False))
+    yield ('report_csv_dict', rows, len(body), lambda: streamed(body),
+           read_report(True))
+    yield ('report_file', rows, len(body), lambda: None,
+           read_report(False, path))
+
+
+def compare(results, baseline, tolerance):
+    """Print changes against baseline results; return names of regressions."""
+    print('\n{:<52}{:>10}{:>10}'.format('vs baseline', 'time', 'peak'))
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        time_ratio = result['seconds'] / before['seconds']
+        peak_ratio = result['peak'] / max(before['peak'], 1)
+        flag = ''
+        # Ignore peak changes too small to matter (streamed reports peak at
+        # a few KiB)
+        if time_ratio > 1 + tolerance or (
+                peak_ratio > 1 + tolerance and
+                result['peak'] - before['peak'] > 2 ** 20):
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('{:<52}{:>9.2f}x{:>9.2f}x{}'.format(name, time_ratio, peak_ratio,
+                                                 flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Run offline parsing and encoding benchmarks.')
+    parser.add_argument('names', nargs='*',
+                        help='only run benchmarks whose name starts with one '
+                             'of these')
+    parser.add_argument('-n', '--number', type=int, default=10000,
+                        help='entities per page (report rows are 10x); '
+                             'default %(default)s')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='runs to take the best time of; default '
+                             '%(default)s')
+    parser.add_argument('--save', metavar='PATH',
+                        help='write results to a JSON file')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare with results saved by --save')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='slowdown (time or peak memory) counted as a '
+                             'regression; default %(default)s')
+    args = parser.parse_args(argv)
+
+    t1 = T1(auth_method='delayed', api_base='api.mediamath.com')
+    print('{} entities per page, JSON codec {}, best of {}'.format(
+        args.number, get_codec(None).name, args.repeat))
+    print('{:<52}{:>10}{:>12}{:>10}{:>10}'.format(
+        'benchmark', 'ms', 'items/s', 'MB/s', 'peak MiB'))
+    results = {}
+    directory = tempfile.mkdtemp()
+    try:
+        for name, items, size, setup, func in benchmarks(t1, args.number,
+                                                         directory):
+            if args.names and not name.startswith(tuple(args.names)):
+                continue
+            seconds, peak = measure(setup, func, args.repeat)
+            results[name] = {'items': items, 'bytes': size,
+                             'seconds': seconds, 'peak': peak}
+            print('{:<52}{:>10.1f}{:>12.0f}{:>10}{:>10.1f}'.format(
+                name, seconds * 1000, items / seconds,
+                '{:.1f}'.format(size / seconds / 1e6) if size else '-',
+                peak / 2 ** 20))
+    finally:
+        shutil.rmtree(directory)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Benchmark t1types.strpt against the strptime-based parser it falls back to.
+
+Run from the repository root:
+
+    python benchmarks/bench_t1types.py [number]
+"""
+
+from __future__ import absolute_import, print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from terminalone import t1types  # noqa: E402
+
+# The formats listed in strpt's docstring
+FORMATS = [
+    '2016-11-07T09:07:57',
+    '2016-11-07T09:07:57+0000',
+    '2016-11-16T12:31:10+00:00',
+]
+
+
+def bench(func, value, number):
+    return min(timeit.repeat(lambda: func(value), number=number, repeat=5))
+
+
+def main(number=100000):
+    print('{:<28}{:>14}{:>14}{:>10}'.format(
+        'format', 'strptime us', 'strpt us', 'speedup'))
+    for value in FORMATS:
+        assert t1types.strpt(value) == t1types._strpt(value)
+        slow = bench(t1types._strpt, value, number)
+        fast = bench(t1types.strpt, value, number)
+        print('{:<28}{:>14.2f}{:>14.2f}{:>9.1f}x'.format(
+            value, slow / number * 1e6, fast / number * 1e6, slow / fast))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
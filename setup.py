@@ -26,7 +26,8 @@ requirements = [
     'requests>=2.3.0',
     'requests-oauthlib>=0.5.0',
     'python-dotenv',
-    'pyjwt==1.7.1'
+    'pyjwt==1.7.1',
+    'futures; python_version < "3"',
 ]
 
 metadata = {}
@@ -74,6 +75,15 @@ setup(
     long_description_content_type='text/markdown',
     packages=packages,
     install_requires=requirements,
+    extras_require={
+        'async': ['aiohttp>=3.0'],
+        'fast-json': ['orjson'],
+        'columns': ['numpy'],
+        'pandas': ['numpy', 'pandas'],
+        'zstd': ['zstandard'],
+        'arrow': ['pyarrow'],
+        'tracing': ['opentelemetry-api'],
+    },
     platforms=['any'],
     license='Apache 2.0',
     classifiers=[
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""Provides asyncio service object for T1.
+
+Requires Python 3.6+ and the third-party module aiohttp
+(https://docs.aiohttp.org/). Not imported by `terminalone` itself, so the
+rest of the package works without it.
+"""
+
+from __future__ import absolute_import
+import asyncio
+from collections import deque
+from collections.abc import Iterator
+from types import GeneratorType
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
+from .connection import _http_attributes
+from .entity import Entity
+from .errors import ClientError
+from .retry import monotonic
+from .t1mappings import MODEL_PATHS
+from .vendor import six
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _flatten(mapping):
+    """Flatten a params/form dict the way requests encodes it.
+
+    None values are dropped and list values become repeated keys.
+    """
+    flat = []
+    for key, value in six.iteritems(mapping):
+        if value is None:
+            continue
+        if not isinstance(value, (list, tuple, set)):
+            value = [value]
+        flat.extend((key, str(item)) for item in value if item is not None)
+    return flat
+
+
+def _requests_error(exc):
+    """Map an aiohttp failure to the requests exception RetryPolicy expects.
+
+    A connection that was never established is safe to retry for any
+    method, like requests' ConnectTimeout; other dropped connections and
+    timeouts only for idempotent ones.
+    """
+    if isinstance(exc, aiohttp.ClientConnectorError):
+        return ConnectTimeout(exc)
+    if isinstance(exc, asyncio.TimeoutError):
+        return Timeout(exc)
+    if isinstance(exc, aiohttp.ClientConnectionError):
+        return ConnectionError(exc)
+    return exc
+
+
+class _BufferedResponse(object):
+    """Fully-read aiohttp response, shaped for Connection._parse_response."""
+
+    def __init__(self, response, content):
+        self.headers = response.headers
+        self.status_code = response.status
+        self.content = content
+        self.encoding = response.charset or 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding)
+
+
+class AsyncT1(object):
+    """Asynchronous service for T1 entities, e.g.: t1a = AsyncT1(t1).
+
+    Wraps an authenticated T1 object and shares its credentials, URL and
+    query construction, parsers and Entity models, but makes its requests
+    on an aiohttp session so one event loop can keep many in flight:
+
+        async with AsyncT1(t1) as t1a:
+            advertiser = await t1a.get('advertisers', 1)
+            async for campaign in t1a.get_all('campaigns', workers=8):
+                ...
+            advertiser.name = 'New name'
+            await t1a.save(advertiser)
+    """
+
+    def __init__(self, service, limit=100):
+        """Set up async service.
+
+        :param service: T1 authenticated service object
+        :param limit: int maximum number of simultaneous connections
+        :raise ClientError: if aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise ClientError('AsyncT1 requires the aiohttp package')
+        self.service = service
+        self.limit = limit
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def session(self):
+        """aiohttp session carrying the T1 session's headers and cookies.
+
+        Created on first use so that it binds to the running event loop.
+        """
+        if self._session is None:
+            sync_session = self.service.session
+            self._session = aiohttp.ClientSession(
+                headers=dict(sync_session.headers),
+                cookies=dict((c.name, c.value) for c in sync_session.cookies),
+                connector=aiohttp.TCPConnector(limit=self.limit))
+        return self._session
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def new(self, *args, **kwargs):
+        """Return a fresh class instance for a new entity. See T1.new."""
+        return self.service.new(*args, **kwargs)
+
+    def _params(self, params=None):
+        merged = dict(self.service.session.params or {})
+        merged.update(params or {})
+        return merged
+
+    async def _request(self, method, path, rest, params=None, **kwargs):
+        """Make a request on the aiohttp session.
+
+        Counterpart of Connection._request: waits on the service's rate
+        limiter before every attempt, and retries as its retry policy
+        allows, without blocking the event loop.
+        """
+        url = '/'.join([self.service._base_url(), path, rest])
+        service = self.service
+        event = service._request_info(method, url, rest, params)
+        kwargs['params'] = _flatten(params or {})
+        attempt = 0
+        while True:
+            await self._acquire()
+            response = None
+            if event is not None:
+                event.update(attempt=attempt, status_code=None, error=None)
+                service._fire('before_request', event)
+                span = service.tracer.start_span('HTTP ' + method,
+                                                 _http_attributes(event))
+                started = monotonic()
+            try:
+                async with self.session.request(method, url,
+                                                **kwargs) as raw:
+                    content = await raw.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if event is not None:
+                    event.update(error=exc,
+                                 network_time=monotonic() - started)
+                    service._fire('after_response', event)
+                    service.tracer.end_span(span, exc)
+                if service.retry is None or not service.retry.should_retry(
+                        method, attempt, exc=_requests_error(exc)):
+                    raise
+            else:
+                response = _BufferedResponse(raw, content)
+                if event is not None:
+                    event.update(status_code=response.status_code,
+                                 network_time=monotonic() - started)
+                    service._fire('after_response', event)
+                    span.set_attribute('http.status_code',
+                                       response.status_code)
+                    service.tracer.end_span(span)
+                if service.retry is None or not service.retry.should_retry(
+                        method, attempt, response=response):
+                    return service._parse_response(response, _event=event)
+            await asyncio.sleep(service.retry.delay(attempt, response))
+            attempt += 1
+
+    async def _acquire(self):
+        """Wait on the service's rate limiter, if set."""
+        limiter = self.service.rate_limiter
+        if limiter is None:
+            return
+        wait = limiter.try_acquire()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = limiter.try_acquire()
+
+    async def _get(self, path, rest, params=None):
+        """Coroutine counterpart of Connection._get."""
+        return await self._request('GET', path, rest,
+                                   params=self._params(params))
+
+    async def _post(self, path, rest, data=None, json=None):
+        """Coroutine counterpart of Connection._post."""
+        if data is None and json is None:
+            raise ClientError('No POST data.')
+        if data and json:
+            raise ClientError('Cannot specify both data and json POST data.')
+
+        if data is not None:
+            return await self._request('POST', path, rest,
+                                       params=self._params(),
+                                       data=_flatten(data))
+        return await self._request('POST', path, rest,
+                                   params=self._params(),
+                                   data=self.service.json_codec.dumps(json),
+                                   headers={'Content-Type': 'application/json'})
+
+    async def get(self,
+                  collection,
+                  entity=None,
+                  child=None,
+                  limit=None,
+                  include=None,
+                  full=None,
+                  page_limit=100,
+                  page_offset=0,
+                  sort_by='id',
+                  parent=None,
+                  query=None,
+                  other_params={},
+                  count=False):
+        """Coroutine counterpart of T1.get. Same parameters, minus get_all.
+
+        :return: If:
+            Collection is requested => list of entity objects, since the
+                page has already been read in full
+            Entity ID is provided => Entity object
+            `count` is True => number of entities as second return val
+        """
+        service = self.service
+        if type(collection) == type and issubclass(collection, Entity):
+            collection = MODEL_PATHS[collection]
+
+        url, child_id = service._construct_url(collection, entity, child, limit)
+
+        # some child endpoints need to have full overridden to ensure correct behaviour
+        if child:
+            full = True
+
+        params = service._construct_params(entity,
+                                           include=include,
+                                           full=full,
+                                           page_limit=page_limit,
+                                           page_offset=page_offset,
+                                           sort_by=sort_by,
+                                           parent=parent,
+                                           query=query,
+                                           other_params=other_params)
+
+        entities, ent_count = await self._get(
+            service._get_service_path(collection), url, params=params)
+
+        if not isinstance(entities, (GeneratorType, Iterator)):
+            return service._return_class(entities, child, child_id,
+                                         entity, collection)
+
+        ents = list(service._gen_classes(entities, child, child_id,
+                                         entity, collection))
+        if count:
+            return ents, ent_count
+        return ents
+
+    async def get_all(self, collection, workers=4, **kwargs):
+        """Async generator over every entity in a collection.
+
+        Takes the same keyword arguments as `get`. Like T1.get_all, probes
+        the total count first; then up to `workers` pages are requested at
+        once, and entities are yielded in order.
+        """
+        page_limit = kwargs.pop('page_limit', 100)
+        kwargs.pop('page_offset', None)
+        kwargs.pop('count', None)
+
+        probe = dict(kwargs, include=None, full=None)
+        _, num_recs = await self.get(collection, page_limit=1, count=True,
+                                     **probe)
+
+        pending = deque()
+        try:
+            for page_offset in range(0, num_recs, page_limit):
+                if len(pending) >= workers:
+                    for item in await pending.popleft():
+                        yield item
+                pending.append(asyncio.ensure_future(self._get_page(
+                    collection, page_limit, page_offset, kwargs)))
+            while pending:
+                for item in await pending.popleft():
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_page(self, collection, page_limit, page_offset, kwargs):
+        page = await self.get(collection, page_limit=page_limit,
+                              page_offset=page_offset, **kwargs)
+        if isinstance(page, Entity):
+            page = [page]
+        return page
+
+    def find(self, collection, variable, operator, candidates, **kwargs):
+        """Counterpart of T1.find, with the same arguments.
+
+        Returns the `get` coroutine to await or, with get_all=True, the
+        `get_all` async generator over every match:
+
+            strategies = await t1a.find('strategies', None, filters.IN, [1, 2])
+            async for strategy in t1a.find(..., get_all=True):
+                ...
+        """
+        query = self.service._construct_query(variable, operator, candidates)
+        if kwargs.pop('get_all', False):
+            return self.get_all(collection, query=query, **kwargs)
+        return self.get(collection, query=query, **kwargs)
+
+    async def save(self, entity, data=None, url=None):
+        """Coroutine counterpart of Entity.save: await t1a.save(entity).
+
+        Posts what `entity.save()` would: its changes, as adjusted by its
+        model, or nothing if it has none. The entity is then updated in
+        place from the response.
+        """
+        data = entity._save_payload(data)
+        if data is None:
+            return
+        if url is None:
+            url = entity._construct_url()
+
+        path = entity._get_service_path()
+        if entity._post_format == 'formdata':
+            result, _ = await self._post(path, url, data=data)
+        else:
+            result, _ = await self._post(path, url, json=data)
+
+        entity._after_save(result)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""Provides session-scoped identity map for T1 entities."""
+
+from __future__ import absolute_import
+import threading
+from collections import OrderedDict
+from .entity import SubEntity
+from .retry import monotonic
+from .vendor import six
+
+
+class EntityCache(object):
+    """Identity map of entities keyed by (collection, id), with TTL and LRU.
+
+    While an entity is cached, every response containing it (directly or as
+    a relation) hands back the same object, refreshed with the new data.
+    `T1.get(collection, id)` is served without a request if the entity was
+    last fetched by ID within the TTL; relations and collection pages may
+    only hold some of its properties, so they don't count. Entities with
+    unsaved changes are never overwritten.
+    """
+
+    def __init__(self, maxsize=10000, ttl=300):
+        """Set up cache.
+
+        :param maxsize: int maximum entities held; least recently used are
+            evicted first
+        :param ttl: float seconds after fetching an entity by ID that it
+            may serve `T1.get` without a request
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self._key(*key) in self._entries
+
+    @staticmethod
+    def _key(collection, entity_id):
+        try:
+            entity_id = int(entity_id)
+        except (TypeError, ValueError):
+            pass
+        return collection, entity_id
+
+    @staticmethod
+    def _entity_key(entity):
+        # Sub-entities are addressed through their parent, not by ID
+        if isinstance(entity, SubEntity):
+            return None
+        collection = getattr(type(entity), 'collection', None)
+        entity_id = entity._init_properties.get('id')
+        if collection is None or entity_id is None:
+            return None
+        return EntityCache._key(collection, entity_id)
+
+    def get(self, collection, entity_id):
+        """Return cached entity if fetched by ID within the TTL, else None."""
+        key = self._key(collection, entity_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entity, fetched_on = entry
+            if fetched_on is None or monotonic() - fetched_on > self.ttl:
+                return None
+            self._touch(key)
+            return entity
+
+    def add(self, entity, fetched=False):
+        """Add entity to the map, returning the canonical instance.
+
+        If an instance is already cached, it takes over the state of
+        `entity`, which the model has just built from the response (unless
+        it has unsaved changes), and is returned instead. Properties missing
+        from the response, such as those of a relation, keep their values.
+
+        :param fetched: bool whether `entity` was fetched by ID, in full, so
+            may serve `get`
+        """
+        key = self._entity_key(entity)
+        if key is None:
+            return entity
+
+        with self._lock:
+            entry = self._entries.get(key)
+            fetched_on = monotonic() if fetched else None
+            if entry is not None:
+                cached = entry[0]
+                if not cached.get_changes():
+                    self._refresh(cached, entity)
+                entity = cached
+                if fetched_on is None:
+                    fetched_on = entry[1]
+            self._entries[key] = (entity, fetched_on)
+            self._touch(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entity
+
+    @staticmethod
+    def _refresh(cached, fresh):
+        """Update cached with the state of fresh, another instance of it."""
+        for attr, value in six.iteritems(cached._init_properties):
+            if attr in fresh._init_properties:
+                continue
+            fresh._init_properties[attr] = value
+            if attr in cached._pending:
+                fresh._pending.add(attr)
+            if attr in cached._snapshot:
+                fresh._snapshot[attr] = cached._snapshot[attr]
+            # Values models derive in __init__ (e.g. Strategy's parsed
+            # pixel_target_expr) would otherwise be derived from nothing
+            if attr in cached._properties:
+                fresh._properties[attr] = cached._properties[attr]
+        cached.__dict__.update(fresh.__dict__)
+
+    def discard(self, collection, entity_id):
+        """Remove entity from the map, if present."""
+        with self._lock:
+            self._entries.pop(self._key(collection, entity_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _touch(self, key):
+        self._entries[key] = self._entries.pop(key)
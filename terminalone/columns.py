@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Provides columnar result sets for T1 collections and reports.
+
+Rows are taken straight from parser output and gathered per property,
+without creating Entity objects. Each column is then converted as a whole
+to the type given by the model's `_pull` converter: with NumPy installed,
+numbers and booleans become typed arrays, dates `datetime64` arrays (in
+UTC) and everything else object arrays; without it, columns are lists of
+the same values an Entity would hold.
+Report columns are typed the same way from the report's metadata.
+"""
+
+from __future__ import absolute_import
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+from . import t1types
+from .errors import ClientError
+from .utils import FixedOffset
+from .vendor import six
+
+# NumPy and pandas are slow to import, so they're imported on first use:
+# `np` and `pd` are module attributes resolved by __getattr__, None if not
+# installed.
+_OPTIONAL = {'np': 'numpy', 'pd': 'pandas'}
+
+
+def __getattr__(name):
+    try:
+        module = _OPTIONAL[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(
+            __name__, name))
+    try:
+        value = __import__(module)
+    except ImportError:
+        value = None
+    globals()[name] = value
+    return value
+
+
+def _optional(name):
+    """Return optional module by alias, importing it if needed."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+    np, pd = _optional('np'), _optional('pd')
+
+_UTC = FixedOffset(0)
+
+DTYPES = {
+    int: 'int64',
+    float: 'float64',
+    t1types.int_or_none: 'int64',
+    t1types.float_or_none: 'float64',
+    t1types.int_to_bool: 'bool',
+    t1types.strpt: 'datetime64[us]',
+}
+
+
+def dtype_for(converter):
+    """Return NumPy dtype name for a `_pull` converter; object if unknown."""
+    if isinstance(converter, partial):
+        converter = converter.func
+    try:
+        return DTYPES.get(converter, 'object')
+    except TypeError:  # unhashable converter
+        return 'object'
+
+
+def to_columns(rows, get_model):
+    """Gather parsed entities into typed columns.
+
+    :param rows: iterable of entity dicts as returned by the parsers.
+        Nested relations are skipped.
+    :param get_model: callable returning the model class for an entity type
+    :return: OrderedDict of column name => array (or list without NumPy),
+        in the order properties were first seen
+    """
+    raw = OrderedDict()
+    pull = {}
+    num_rows = 0
+    for row in rows:
+        if num_rows == 0:
+            ent_type = row.get('_type', row.get('type'))
+            pull = get_model(ent_type)._pull
+        for key, value in six.iteritems(row):
+            if key == 'relations':
+                continue
+            column = raw.get(key)
+            if column is None:
+                column = raw[key] = [None] * num_rows
+            column.append(value)
+        num_rows += 1
+        for column in six.itervalues(raw):
+            if len(column) < num_rows:
+                column.append(None)
+
+    return OrderedDict((key, _convert(column, pull.get(key)))
+                       for key, column in six.iteritems(raw))
+
+
+def _convert(column, converter):
+    """Convert a column of raw values."""
+    np = _optional('np')
+    if np is not None:
+        dtype = dtype_for(converter)
+        if dtype != 'object':
+            try:
+                return _to_array(column, dtype, converter)
+            except (TypeError, ValueError):
+                pass
+    if converter is not None:
+        column = [converter(v) if v is not None else None for v in column]
+    if np is not None:
+        array = np.empty(len(column), dtype=object)
+        array[:] = column
+        return array
+    return column
+
+
+def _to_array(column, dtype, converter):
+    """Vectorized conversion of a column to a NumPy dtype.
+
+    Integer and boolean columns containing nulls fall back to float64 (with
+    NaN) and object respectively, as in pandas.
+    """
+    np = _optional('np')
+    has_nulls = any(v is None for v in column)
+    if dtype == 'datetime64[us]':
+        return np.array([_naive_utc(converter(v)) if v is not None else None
+                         for v in column], dtype=dtype)
+    if dtype == 'bool':
+        if has_nulls:
+            raise TypeError('nulls in bool column')
+        return np.array(column).astype('int64').astype(bool)
+    if has_nulls:
+        column = [v if v is not None else 'nan' for v in column]
+        dtype = 'float64'
+    return np.array(column).astype(dtype)
+
+
+def _naive_utc(value):
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(_UTC).replace(tzinfo=None)
+    return value
+
+
+# Report metadata column types => NumPy dtypes
+REPORT_DTYPES = {
+    'id': 'int64',
+    'int': 'int64',
+    'integer': 'int64',
+    'number': 'float64',
+    'float': 'float64',
+    'decimal': 'float64',
+    'money': 'float64',
+    'percent': 'float64',
+    'date': 'datetime64[us]',
+    'datetime': 'datetime64[us]',
+}
+
+
+def report_column(values, dtype):
+    """Convert a column of report CSV strings, where '' is null.
+
+    Without NumPy, returns a list of ints, floats, datetimes or strings.
+    """
+    np = _optional('np')
+    if np is None:
+        convert = _REPORT_CONVERTERS.get(dtype)
+        if convert is None:
+            return list(values)
+        return [convert(v) if v != '' else None for v in values]
+
+    if dtype == 'datetime64[us]':
+        return np.array([v or 'NaT' for v in values], dtype=dtype)
+    if dtype in ('int64', 'float64'):
+        if '' in values:
+            values = [v or 'nan' for v in values]
+            dtype = 'float64'
+        return np.array(values).astype(dtype)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _strpdate(value):
+    """Parse report date or date-time, e.g. "2016-03-31 10:00:00"."""
+    if len(value) == 10:
+        return datetime.strptime(value, '%Y-%m-%d')
+    return datetime.strptime(value.replace('T', ' ')[:19], '%Y-%m-%d %H:%M:%S')
+
+
+_REPORT_CONVERTERS = {
+    'int64': int,
+    'float64': float,
+    'datetime64[us]': _strpdate,
+}
+
+
+def to_dataframe(columns):
+    """Build a pandas DataFrame from `to_columns` output.
+
+    Date columns are localized to UTC.
+
+    :raise ClientError: if pandas is not installed
+    """
+    pd = _optional('pd')
+    if pd is None:
+        raise ClientError('to_dataframe requires the pandas package')
+    frame = pd.DataFrame(columns)
+    for key in frame.columns:
+        if frame[key].dtype.kind == 'M':
+            frame[key] = frame[key].dt.tz_localize('UTC')
+    return frame
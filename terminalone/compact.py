@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Provides compact, read-only representation of T1 entities."""
+
+from __future__ import absolute_import
+from .errors import ClientError
+from .vendor import six
+
+_CLASSES = {}
+
+
+class CompactEntity(object):
+    """Read-only entity holding its properties in slots.
+
+    Each model's `_pull` keys become slots of a generated subclass (see
+    `compact_class`), so an instance needs no `__dict__`, no property dicts
+    and no per-instance connection state: the service that retrieved it is
+    held by reference. Properties outside `_pull`, such as included
+    relations, are kept in a dict only when present.
+    Use `to_entity` to get a full, saveable Entity.
+    """
+
+    __slots__ = ('_ctx', '_extra')
+    _model = None
+    _fields = frozenset()
+
+    def __init__(self, ctx, properties):
+        """Convert and store properties.
+
+        :param ctx: T1 service object the entity was retrieved with
+        :param properties: dict of entity properties as parsed from T1
+        """
+        set_slot = object.__setattr__
+        set_slot(self, '_ctx', ctx)
+        pull = self._model._pull
+        fields = self._fields
+        extra = None
+        for key, value in six.iteritems(properties):
+            if value is not None and pull.get(key) is not None:
+                value = pull[key](value)
+            if key in fields:
+                set_slot(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        set_slot(self, '_extra', extra)
+
+    def __getattr__(self, attribute):
+        # Only reached for unset slots and properties outside `_pull`
+        extra = object.__getattribute__(self, '_extra')
+        if extra is not None and attribute in extra:
+            return extra[attribute]
+        raise AttributeError(attribute)
+
+    def __setattr__(self, attribute, value):
+        raise ClientError('Compact entities are read-only; '
+                          'use to_entity() to modify.')
+
+    def __delattr__(self, attribute):
+        raise ClientError('Compact entities are read-only; '
+                          'use to_entity() to modify.')
+
+    def __repr__(self):
+        return '{cname}({props})'.format(
+            cname=type(self).__name__,
+            props=', '.join(
+                '{key}={value!r}'.format(key=key, value=value)
+                for key, value in six.iteritems(self.get_properties())
+            )
+        )
+
+    def get_properties(self):
+        properties = {}
+        for key in self.__slots__:
+            try:
+                properties[key] = object.__getattribute__(self, key)
+            except AttributeError:
+                pass
+        if self._extra is not None:
+            properties.update(self._extra)
+        return properties
+
+    def to_entity(self):
+        """Return a full Entity with the same properties."""
+        properties = {}
+        for key, value in six.iteritems(self.get_properties()):
+            if isinstance(value, CompactEntity):
+                value = value.to_entity()
+            elif isinstance(value, list):
+                value = [v.to_entity() if isinstance(v, CompactEntity) else v
+                         for v in value]
+            properties[key] = value
+        return self._ctx.new(self._model, properties=properties)
+
+
+def compact_class(model):
+    """Return (and cache) the CompactEntity subclass for an Entity model."""
+    cls = _CLASSES.get(model)
+    if cls is None:
+        reserved = set(dir(CompactEntity))
+        slots = tuple(sorted(
+            key for key in model._pull
+            if _is_identifier(key) and not key.startswith('__') and
+            key not in reserved))
+        cls = type(model.__name__, (CompactEntity,), {
+            '__slots__': slots,
+            '_model': model,
+            '_fields': frozenset(slots),
+            'collection': getattr(model, 'collection', None),
+        })
+        _CLASSES[model] = cls
+    return cls
+
+
+def _is_identifier(name):
+    try:
+        return name.isidentifier()
+    except AttributeError:  # Python 2
+        return name.replace('_', 'a').isalnum() and not name[:1].isdigit()
@@ -3,15 +3,21 @@
 
 from __future__ import absolute_import
 
+from functools import partial
+from time import sleep
 from requests import Session, post
+from requests.exceptions import RequestException
 from requests.utils import default_user_agent
 from .config import ACCEPT_HEADERS, API_BASES, SERVICE_BASE_PATHS, AUTH_BASES
 from .errors import ClientError, T1Error
+from .hooks import request_info
+from .jsoncodec import get_codec
 from .metadata import __version__
-from .xmlparser import XMLParser, ParseError
-from .jsonparser import JSONParser
-import json
-import jwt
+from .retry import monotonic
+from .tracing import NOOP_TRACER, attributes
+from .vendor.six.moves.urllib.parse import urlparse
+from .xmlparser import XMLParser, ParseError, StreamingXMLParser
+from .jsonparser import JSONParser, StreamingJSONParser
 
 
 def _generate_user_agent(name='t1-python'):
@@ -19,6 +25,25 @@ def _generate_user_agent(name='t1-python'):
                                           ua=default_user_agent())
 
 
+def _body_size(response, body):
+    """Size in bytes of the response body, as far as it is known."""
+    if isinstance(body, bytes):
+        return len(body)
+    size = response.headers.get('Content-Length')
+    return int(size) if size is not None else None
+
+
+def _http_attributes(info):
+    """Span attributes for an HTTP request from its hook info dict."""
+    params = info['params'] or {}
+    return attributes(http_method=info['method'], http_url=info['url'],
+                      t1_collection=info['collection'],
+                      t1_url_template=info['url_template'],
+                      t1_attempt=info['attempt'],
+                      t1_page_offset=params.get('page_offset'),
+                      t1_page_limit=params.get('page_limit'))
+
+
 class Connection(object):
     """Base connection object for TerminalOne session."""
 
@@ -29,13 +54,20 @@ class Connection(object):
                  api_base=None,
                  json=False,
                  auth_params=None,
+                 json_codec=None,
+                 retry=None,
+                 rate_limiter=None,
+                 hooks=None,
+                 tracer=None,
                  _create_session=False):
         """Set up Requests Session to be used for all connections to T1.
 
         :param environment: str to look up API Base to use. e.g. 'production'
             for https://api.mediamath.com/api/v2.0
         :param api_base: str API domain. should be the qualified domain name
-            without trailing slash. e.g. "api.mediamath.com".
+            without trailing slash. e.g. "api.mediamath.com". May include
+            a scheme to use instead of HTTPS, e.g. "http://localhost:8080"
+            for terminalone.mockserver.
         :param json: bool use JSON header for serialization. Currently
             for internal experimentation, JSON will become the default in a
             future version.
@@ -43,6 +75,17 @@ class Connection(object):
             "method" required argument. Determines session handler.
             "oauth2-ro" => "client_id", "client_secret", "username", "password"
             "cookie" => "username", "password", "api_key"
+        :param json_codec: str name of JSON library to decode responses and
+            encode JSON posts with, e.g. "orjson", or a
+            terminalone.jsoncodec.JSONCodec. Defaults to the fastest installed.
+        :param retry: terminalone.retry.RetryPolicy to retry failed requests
+            with. Default makes a single attempt.
+        :param rate_limiter: terminalone.retry.TokenBucket shared by every
+            connection that should count against the same request rate.
+        :param hooks: terminalone.hooks.Hooks with callbacks to fire around
+            requests.
+        :param tracer: terminalone.tracing.Tracer to record spans with.
+            Default records nothing.
         :param _create_session: bool flag to create a Requests Session.
             Should only be used for initial T1 instantiation.
         """
@@ -65,6 +108,12 @@ class Connection(object):
 
         Connection.__setattr__(self, 'json', json)
         Connection.__setattr__(self, 'auth_params', auth_params)
+        Connection.__setattr__(self, 'json_codec', get_codec(json_codec))
+        Connection.__setattr__(self, 'retry', retry)
+        Connection.__setattr__(self, 'rate_limiter', rate_limiter)
+        Connection.__setattr__(self, 'hooks', hooks)
+        Connection.__setattr__(self, 'tracer',
+                               NOOP_TRACER if tracer is None else tracer)
         if _create_session:
             self._create_session()
 
@@ -80,6 +129,33 @@ class Connection(object):
 
         Connection.__setattr__(self, 'session', session)
 
+    def _shared_settings(self):
+        """Settings passed on to entities and reports created from this."""
+        return {
+            'json_codec': self.json_codec,
+            'retry': self.retry,
+            'rate_limiter': self.rate_limiter,
+            'hooks': self.hooks,
+            'tracer': self.tracer,
+        }
+
+    def _base_url(self):
+        """Scheme and domain of the API, e.g. "https://api.mediamath.com"."""
+        if '://' in self.api_base:
+            return self.api_base
+        return 'https://' + self.api_base
+
+    def _request_info(self, method, url, rest, params=None):
+        """Info dict to fire hooks and trace with, or None if neither is on."""
+        if not self.tracer.enabled and (self.hooks is None or
+                                        not self.hooks.enabled):
+            return None
+        return request_info(method, url, rest, params)
+
+    def _fire(self, event, info):
+        if self.hooks is not None:
+            self.hooks.fire(event, info)
+
     def _auth_cookie(self, username, password, api_key=None):
         """Authenticate by generating a session cookie.
 
@@ -109,7 +185,7 @@ class Connection(object):
         self.session.cookies.set(
             name='adama_session',
             value=session_id,
-            domain=self.api_base,
+            domain=urlparse(self._base_url()).hostname,
             expires=(expires or int(time() + 86400)),
         )
         self._check_session()
@@ -183,7 +259,7 @@ class Connection(object):
         if response.status_code != 200:
             raise ClientError(
                 'Failed to get OAuth2 token. Error: ' + response.text)
-        auth_response = json.loads(response.text)
+        auth_response = self.json_codec.loads(response.text)
 
         if 'access_token' in auth_response:
             user_token = auth_response['access_token']
@@ -191,6 +267,7 @@ class Connection(object):
             raise ClientError(
                 'Failed to get OAuth2 token. Error: ' + response.text)
 
+        import jwt  # only needed for OAuth2, and slow to import
         user = jwt.decode(user_token,
                           algorithms=['RS256'],
                           verify=False)
@@ -236,17 +313,22 @@ class Connection(object):
         Connection.__setattr__(self, 'session_id',
                                self.session.cookies['adama_session'])
 
-    def _get(self, path, rest, params=None):
+    def _get(self, path, rest, params=None, stream=False):
         """
         Base method for subclasses to call.
 
         :param path: str API path (can be from terminalone.utils.PATHS)
         :param rest: str rest of url (module-specific path, )
         :param params: dict query string params
+        :param stream: bool parse the response incrementally as it is read,
+            where the parser supports it. The entity count may then only be
+            known once the entities have been consumed.
         """
-        url = '/'.join(['https:/', self.api_base, path, rest])
-        response = self.session.get(url, params=params, stream=True)
-        return self._parse_response(response)
+        url = '/'.join([self._base_url(), path, rest])
+        event = self._request_info('GET', url, rest, params)
+        response = self._request('GET', url, params=params, stream=True,
+                                 _event=event)
+        return self._parse_response(response, stream=stream, _event=event)
 
     def _post(self, path, rest, data=None, json=None):
         """
@@ -261,36 +343,121 @@ class Connection(object):
         if data and json:
             raise ClientError('Cannot specify both data and json POST data.')
 
-        url = '/'.join(['https:/', self.api_base, path, rest])
-        response = self.session.post(url, data=data, json=json, stream=True)
-        return self._parse_response(response)
+        url = '/'.join([self._base_url(), path, rest])
+        event = self._request_info('POST', url, rest)
+        if json is not None:
+            response = self._request(
+                'POST', url, data=self.json_codec.dumps(json), stream=True,
+                headers={'Content-Type': 'application/json'}, _event=event)
+        else:
+            response = self._request('POST', url, data=data, stream=True,
+                                     _event=event)
+        return self._parse_response(response, _event=event)
+
+    def _request(self, method, url, _event=None, **kwargs):
+        """Make a request on the session.
 
-    def _parse_response(self, response):
+        Waits on the rate limiter before every attempt, and retries as
+        allowed by the retry policy, if either is set.
+
+        :param _event: dict request info to fire hooks with, if any
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = None
+            if _event is not None:
+                _event.update(attempt=attempt, status_code=None, error=None)
+                self._fire('before_request', _event)
+                span = self.tracer.start_span(
+                    'HTTP ' + method, _http_attributes(_event))
+                started = monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except RequestException as exc:
+                if _event is not None:
+                    _event.update(error=exc,
+                                  network_time=monotonic() - started)
+                    self._fire('after_response', _event)
+                    self.tracer.end_span(span, exc)
+                if self.retry is None or not self.retry.should_retry(
+                        method, attempt, exc=exc):
+                    raise
+            else:
+                if _event is not None:
+                    _event.update(status_code=response.status_code,
+                                  network_time=monotonic() - started)
+                    self._fire('after_response', _event)
+                    span.set_attribute('http.status_code',
+                                       response.status_code)
+                    self.tracer.end_span(span)
+                if self.retry is None or not self.retry.should_retry(
+                        method, attempt, response=response):
+                    return response
+                response.close()
+            sleep(self.retry.delay(attempt, response))
+            attempt += 1
+
+    def _parse_response(self, response, stream=False, _event=None):
         content_type = response.headers.get('Content-type')
         if content_type is None:
             raise T1Error(None, 'No content type header returned')
 
-        parser, response_body = self._get_parser(content_type, response)
+        if _event is not None:
+            started = monotonic()
+        parser, response_body = self._get_parser(content_type, response,
+                                                 stream=stream)
+        if _event is not None:
+            # Reading the whole body counts as network time; streaming
+            # parsers read as they go, so that time is in parse_time
+            parsed = monotonic()
+            _event['network_time'] = (_event.get('network_time', 0) +
+                                      parsed - started)
+            span = self.tracer.start_span('parse', attributes(
+                t1_url_template=_event['url_template']))
 
         try:
             result = parser(response_body)
         except ParseError as exc:
             Connection.__setattr__(self, 'response', response)
-            raise T1Error(
+            error = T1Error(
                 None, 'Could not parse response: {!r}'.format(exc.caught))
-        except Exception:
+            if _event is not None:
+                self.tracer.end_span(span, error)
+            raise error
+        except Exception as exc:
             Connection.__setattr__(self, 'response', response)
+            if _event is not None:
+                self.tracer.end_span(span, exc)
             raise
+        if _event is not None:
+            _event.update(parse_time=monotonic() - parsed,
+                          bytes=_body_size(response, response_body),
+                          entity_count=result.entity_count)
+            self._fire('after_parse', _event)
+            if _event['entity_count'] is not None:
+                span.set_attribute('t1.total_count', _event['entity_count'])
+            if _event['bytes'] is not None:
+                span.set_attribute('t1.response_bytes', _event['bytes'])
+            self.tracer.end_span(span)
         return result.entities, result.entity_count
 
-    @staticmethod
-    def _get_parser(content_type, response):
-        if 'xml' in content_type:
+    def _get_parser(self, content_type, response, stream=False):
+        if 'xml' in content_type and stream:
+            parser = StreamingXMLParser
+            response.raw.decode_content = True
+            response_body = response.raw
+        elif 'xml' in content_type:
             parser = XMLParser
             response_body = response.content
+        elif 'json' in content_type and stream:
+            parser = partial(StreamingJSONParser,
+                             encoding=response.encoding or 'utf-8')
+            response_body = response.iter_content(StreamingJSONParser.chunk_size)
         elif 'json' in content_type:
-            parser = JSONParser
-            response_body = response.text
+            parser = partial(JSONParser, loads=self.json_codec.loads)
+            response_body = response.content
         else:
             raise T1Error(
                 None, 'Cannot handle content type: {}'.format(content_type))
@@ -2,9 +2,11 @@
 """Provides base object for T1 data classes."""
 
 from __future__ import absolute_import, division
+from copy import deepcopy
 from terminalone import t1types
 from .connection import Connection
 from .errors import ClientError
+from .tracing import attributes, traced
 from .vendor import six
 
 
@@ -31,13 +33,17 @@ class Entity(Connection):
         subclass.
         :param session: requests.Session to be used
         :param properties: dict of entity properties
+        :param lazy: bool for entities retrieved from T1, keep raw values and
+            convert each property on first access
         :param kwargs: additional kwargs to pass to Connection
         """
 
         # __setattr__ is overridden below. So to set self._properties as an empty
         # dict, we need to use the built-in __setattr__ method
+        lazy = kwargs.pop('lazy', False)
         super(Entity, self).__init__(_create_session=False, **kwargs)
         super(Entity, self).__setattr__('session', session)
+        super(Entity, self).__setattr__('_lazy', lazy)
 
         if properties is None:
             properties = {}
@@ -58,6 +64,8 @@ class Entity(Connection):
         if attribute in self._properties:
             return self._properties[attribute]
         elif attribute in self._init_properties:
+            if attribute in self._pending:
+                self._materialize(attribute)
             return self._init_properties[attribute]
         else:
             raise AttributeError(attribute)
@@ -79,6 +87,7 @@ class Entity(Connection):
 
     def __delattr__(self, attribute):
         if attribute in self._init_properties:
+            self._materialize(attribute)
             self._properties[attribute] = t1types.Deleted(self._init_properties[attribute])
         else:
             raise AttributeError(attribute)
@@ -168,27 +177,86 @@ class Entity(Connection):
         return '/'.join(url)
 
     def _update_self(self, properties):
-        """Update own properties based on values returned by API."""
+        """Update own properties based on values returned by API.
+
+        If the entity is lazy, conversion is deferred to `_materialize`,
+        except for the ID, which URLs are built from.
+        """
+        lazy = self._lazy and 'id' in properties
+        pending = set()
         for attr, val in six.iteritems(properties):
             if self._pull.get(attr) is not None and val is not None:
-                properties[attr] = self._pull[attr](val)
+                if lazy and attr != 'id':
+                    pending.add(attr)
+                else:
+                    properties[attr] = self._pull[attr](val)
         super(Entity, self).__setattr__('_init_properties', properties)
-        self._reset_properties(properties)
+        self._reset_properties(properties, pending)
+
+    def _materialize(self, *attributes):
+        """Convert raw values of given properties, or of all, in place."""
+        for attr in attributes or list(self._pending):
+            if attr in self._pending:
+                value = self._pull[attr](self._init_properties[attr])
+                self._init_properties[attr] = value
+                self._pending.discard(attr)
+                self._take_snapshot(attr, value)
+
+    def _take_snapshot(self, attr, value):
+        """Keep a copy of a mutable property, to detect in-place changes."""
+        if (isinstance(value, (list, dict)) and attr in self._pull and
+                attr not in self._relations):
+            self._snapshot[attr] = deepcopy(value)
+
+    def get_changes(self):
+        """Return properties changed since the entity was retrieved or saved.
+
+        Covers values assigned (unless equal to the original), deleted, or
+        modified in place, such as items appended to a list. For a new
+        entity, all properties are changes.
+        """
+        if not self.is_update:
+            return self._properties.copy()
+
+        changes = {}
+        snapshot = self._snapshot
+        for attr, value in six.iteritems(self._properties):
+            if attr in self._init_properties and not isinstance(value, t1types.Deleted):
+                self._materialize(attr)
+                original = snapshot.get(attr, self._init_properties[attr])
+                if value == original:
+                    continue
+            changes[attr] = value
+        for attr, original in six.iteritems(snapshot):
+            if attr in self._properties:
+                continue
+            value = self._init_properties[attr]
+            if value != original:
+                changes[attr] = value
+        return changes
 
     def get_properties(self):
+        self._materialize()
         properties = {}
         properties.update(self._init_properties)
         properties.update(self._properties)
         return properties
 
-    def _reset_properties(self, properties):
+    def _reset_properties(self, properties, pending=None):
         super(Entity, self).__setattr__('_init_properties', properties)
+        super(Entity, self).__setattr__('_pending', pending or set())
+        super(Entity, self).__setattr__('_snapshot', {})
+        for attr, value in six.iteritems(properties):
+            if attr not in self._pending:
+                self._take_snapshot(attr, value)
         if self.is_update:
             super(Entity, self).__setattr__('_properties', {})
         else:
             super(Entity, self).__setattr__('_properties', properties)
 
     def revert(self):
+        for attr, original in six.iteritems(self._snapshot):
+            self._init_properties[attr] = deepcopy(original)
         super(Entity, self).__setattr__('_properties', {})
 
     def is_property(self, prop):
@@ -204,26 +272,54 @@ class Entity(Connection):
         for attr, value in six.iteritems(properties):
             setattr(self, attr, value)
 
+    @traced('Entity.save', lambda self, *args, **kwargs: attributes(
+        t1_collection=self.collection,
+        t1_entity_id=getattr(self, 'id', None)))
     def save(self, data=None, url=None):
-        """Save object to T1."""
+        """Save object to T1.
+
+        Sends only the properties that changed (see `get_changes`). If an
+        existing entity has no changes, nothing is sent.
+        """
+        data = self._save_payload(data)
+        if data is None:
+            return
         if url is None:
             url = self._construct_url()
-        if data is None:
-            data = self._properties
 
-        if self._post_format is 'formdata':
-            data = self._validate_form_post(data)
+        if self._post_format == 'formdata':
             entity, _ = super(Entity, self)._post(self._get_service_path(), url, data=data)
         else:
-            data = self._validate_json_post(data)
             entity, _ = super(Entity, self)._post(self._get_service_path(), url, json=data)
 
-        self._update_self(entity)
+        self._after_save(entity)
+
+    def _save_payload(self, data=None):
+        """Return the data `save` posts, converted for the post format.
+
+        Models override this to adjust what is sent.
+
+        :param data: dict properties to send instead of the changes
+        :return: dict, or None if an existing entity has no changes to send
+        """
+        if data is None:
+            data = self.get_changes()
+        if self.is_update and not data:
+            return None
+
+        if self._post_format == 'formdata':
+            return self._validate_form_post(data)
+        return self._validate_json_post(data)
+
+    def _after_save(self, properties):
+        """Update self from the entity returned by a save."""
+        self._update_self(properties)
 
     def get_formdata(self, data=None, includeunchanged=False):
         if data is None:
-            data = self._properties.copy()
+            data = self.get_changes()
         if includeunchanged:
+            self._materialize()
             data = self._init_properties.copy()
             data.update(self._properties)
         return self._validate_form_post(data)
@@ -57,9 +57,14 @@ class AuthRequiredError(APIError):
 
 
 class ValidationError(APIError):
-    """Raised on validation error on POST"""
+    """Raised on validation error on POST
+
+    `errors` holds the field errors as dict of field name => dict with
+    "code" and "error".
+    """
 
     def __init__(self, code, content, body=None):
+        self.errors = content
         msg_list = ['{}: {}'.format(error, val['error'])
                     for (error, val) in six.iteritems(content)]
         messages = [code] + msg_list
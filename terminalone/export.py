@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""Provides Arrow and Parquet export of T1 collections and reports.
+
+Rows are written in record batches of a fixed size, so memory use depends
+on the batch size, not on the number of rows. Column types come from the
+same place as for columnar results (see `columns`): an entity model's
+`_pull` converters, or a report's metadata.
+"""
+
+from __future__ import absolute_import
+import os
+from datetime import datetime
+from itertools import chain, islice
+from . import columns
+from .compact import CompactEntity
+from .entity import Entity
+from .errors import ClientError
+from .reportcache import _replace
+from .vendor import six
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+
+
+def _arrow_type(dtype, tz=None):
+    """Return Arrow type for a NumPy dtype name from `columns`."""
+    if dtype == 'int64':
+        return pa.int64()
+    if dtype == 'float64':
+        return pa.float64()
+    if dtype == 'bool':
+        return pa.bool_()
+    if dtype == 'datetime64[us]':
+        return pa.timestamp('us', tz=tz)
+    return pa.string()
+
+
+def entity_schema(model, fields=None):
+    """Build Arrow schema for an Entity model from its `_pull` converters.
+
+    Dates are UTC timestamps; properties without a known type are strings.
+
+    :param model: Entity subclass
+    :param fields: list of property names to include. Default all of `_pull`.
+    """
+    _check_pyarrow()
+    pull = model._pull
+    if fields is None:
+        fields = list(pull)
+    return pa.schema([
+        (name, _arrow_type(columns.dtype_for(pull.get(name)), tz='UTC'))
+        for name in fields])
+
+
+def report_schema(dtypes):
+    """Build Arrow schema from `Report.column_types` output."""
+    _check_pyarrow()
+    return pa.schema([(name, _arrow_type(dtype))
+                      for name, dtype in six.iteritems(dtypes)])
+
+
+def write_entities(entities, path, format=None, batch_size=10000,
+                   fields=None, **options):
+    """Write entities to an Arrow or Parquet file.
+
+    :param entities: iterable of Entity or compact entities of one type,
+        e.g. a `T1.get(..., get_all=True)` generator
+    :param path: str file to write
+    :param format: "parquet" or "arrow". Default from the file extension.
+    :param batch_size: int number of entities per record batch
+    :param fields: list of property names to write. Default all of the
+        model's `_pull` properties.
+    :param options: passed on to `pyarrow.parquet.ParquetWriter`, e.g.
+        compression
+    :return: int number of entities written
+    :raise ClientError: if pyarrow is not installed, the format is unknown
+        or there are no entities
+    """
+    format = _format(path, format)
+    entities = iter(entities)
+    first = next(entities, None)
+    if first is None:
+        raise ClientError('No entities to write')
+    schema = entity_schema(_model(first), fields)
+    kinds = [_kind(field.type) for field in schema]
+
+    def batches():
+        for batch in _batches(chain([first], entities), batch_size):
+            rows = [entity.get_properties() for entity in batch]
+            yield [[_value(row.get(name), kind) for row in rows]
+                   for name, kind in zip(schema.names, kinds)]
+
+    return _write(path, format, schema, batches(), options)
+
+
+def write_report(report, path, format=None, batch_size=100000, source=None,
+                 **options):
+    """Write report data to an Arrow or Parquet file.
+
+    Columns are typed as described by the report's metadata (see
+    `Report.column_types`); empty values are nulls.
+
+    :param report: Report with parameters set
+    :param path: str file to write
+    :param format: "parquet" or "arrow". Default from the file extension.
+    :param batch_size: int number of rows per record batch
+    :param source: str file saved by `Report.download` to read instead of
+        requesting the report
+    :param options: passed on to `pyarrow.parquet.ParquetWriter`
+    :return: int number of rows written
+    :raise ClientError: if pyarrow is not installed or the format is unknown
+    """
+    format = _format(path, format)
+    headers, rows = report.get(path=source)
+    dtypes = report.column_types(headers)
+    schema = report_schema(dtypes)
+    converters = [columns._REPORT_CONVERTERS.get(dtype)
+                  for dtype in six.itervalues(dtypes)]
+
+    def batches():
+        for batch in _batches(rows, batch_size):
+            yield [[convert(v) if v != '' else None for v in values]
+                   if convert is not None else list(values)
+                   for values, convert in zip(zip(*batch), converters)]
+
+    return _write(path, format, schema, batches(), options)
+
+
+def _write(path, format, schema, batches, options):
+    """Write column batches to a temporary file and move it into place."""
+    tmp = path + '.part'
+    written = 0
+    try:
+        if format == 'parquet':
+            writer = pq.ParquetWriter(tmp, schema, **options)
+        else:
+            writer = pa.ipc.new_file(tmp, schema)
+        with writer:
+            for values in batches:
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(column, type=field.type)
+                     for column, field in zip(values, schema)],
+                    schema=schema)
+                writer.write_table(pa.Table.from_batches([batch]))
+                written += batch.num_rows
+        _replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def _format(path, format):
+    _check_pyarrow()
+    if format is None:
+        format = FORMATS.get(os.path.splitext(path)[1].lower())
+    if format not in ('parquet', 'arrow'):
+        raise ClientError('Unknown export format for {}: pass format="parquet" '
+                          'or format="arrow"'.format(path))
+    return format
+
+
+def _check_pyarrow():
+    if pa is None:
+        raise ClientError('Export requires the pyarrow package')
+
+
+def _model(entity):
+    if isinstance(entity, CompactEntity):
+        return entity._model
+    if isinstance(entity, Entity):
+        return type(entity)
+    raise ClientError('Cannot export {!r}: expected entities'.format(entity))
+
+
+def _kind(arrow_type):
+    if pa.types.is_timestamp(arrow_type):
+        return 'timestamp'
+    if pa.types.is_string(arrow_type):
+        return 'string'
+    return None
+
+
+def _value(value, kind):
+    """Prepare an entity property for an Arrow column."""
+    if value is None:
+        return None
+    if kind == 'timestamp':
+        return columns._naive_utc(value) if isinstance(value, datetime) else value
+    if kind == 'string' and not isinstance(value, six.string_types):
+        return six.text_type(value)
+    return value
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Provides request instrumentation hooks.
+
+Callbacks registered on `T1.hooks` are called around every API request
+made by the service object and the entities and reports it creates:
+
+- "before_request": before each attempt is sent
+- "after_response": once the response headers have arrived, or the
+  attempt failed
+- "after_parse": once the body has been read and parsed
+
+Each callback is called with one dict describing the request. The same dict
+is passed to all three events of a request (the event name is in
+"event"), gaining keys as it goes:
+
+- method, url, url_template (IDs replaced by "{id}"), collection, params
+- attempt (0 for the first), status_code, error (exception raised by the
+  attempt, if any), network_time (seconds, until the body was read)
+- parse_time (seconds spent in the parser), bytes (body size) and
+  entity_count (the total the API reports for the query, not the page)
+
+With streaming parsers, reading the body happens during parsing, so its
+time is counted in parse_time and entity_count may be unknown (None).
+Report requests have collection "reports"; report data isn't parsed by the
+library, so only report metadata fires "after_parse".
+Exceptions raised by callbacks propagate to the caller.
+"""
+
+from __future__ import absolute_import
+import re
+from .errors import ClientError
+
+EVENTS = ('before_request', 'after_response', 'after_parse')
+
+_ID_SEGMENT = re.compile(r'^\d+$')
+
+
+class Hooks(object):
+    """Registry of instrumentation callbacks.
+
+    Usage:
+        def record(info):
+            statsd.timing(info['url_template'], info['network_time'])
+        t1.hooks.add('after_response', record)
+    """
+
+    def __init__(self):
+        self._callbacks = dict((event, ()) for event in EVENTS)
+
+    @property
+    def enabled(self):
+        """Whether any callbacks are registered."""
+        return any(self._callbacks.values())
+
+    def add(self, event, callback):
+        """Register callback for an event; return the callback.
+
+        :raise ClientError: if event is unknown
+        """
+        self._check(event)
+        # Replaced rather than appended to, so that firing (possibly in
+        # other threads) never sees a list being modified
+        self._callbacks[event] = self._callbacks[event] + (callback,)
+        return callback
+
+    def remove(self, event, callback):
+        """Unregister callback for an event.
+
+        :raise ValueError: if the callback isn't registered
+        """
+        self._check(event)
+        callbacks = list(self._callbacks[event])
+        callbacks.remove(callback)
+        self._callbacks[event] = tuple(callbacks)
+
+    def fire(self, event, info):
+        """Call callbacks for an event with the request info dict."""
+        callbacks = self._callbacks[event]
+        if callbacks:
+            info['event'] = event
+            for callback in callbacks:
+                callback(info)
+
+    @staticmethod
+    def _check(event):
+        if event not in EVENTS:
+            raise ClientError('Unknown hook event {!r}; must be one of {}'
+                              .format(event, ', '.join(EVENTS)))
+
+
+def request_info(method, url, rest, params=None):
+    """Build the info dict for a request to `rest` under a service path."""
+    segments = [segment for segment in rest.split('?', 1)[0].split('/')
+                if segment]
+    template = '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment
+                        for segment in segments)
+    return {
+        'method': method,
+        'url': url,
+        'url_template': template,
+        'collection': segments[0] if segments else None,
+        'params': params,
+    }
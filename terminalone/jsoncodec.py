@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Provides JSON codecs, preferring a fast third-party library if installed.
+
+All codecs decode to the same Python objects as the standard library.
+"""
+
+from __future__ import absolute_import
+import json
+from collections import namedtuple
+from .errors import ClientError
+
+JSONCodec = namedtuple('JSONCodec', ['name', 'loads', 'dumps'])
+
+# Order of preference when no codec is named
+PREFERENCE = ('orjson', 'ujson', 'json')
+
+
+def json_loads(s):
+    """json.loads, also taking UTF-8 bytes on Python < 3.6."""
+    if isinstance(s, bytes):
+        s = s.decode('utf-8')
+    return json.loads(s)
+
+
+def _json():
+    return JSONCodec('json', json_loads, json.dumps)
+
+
+def _orjson():
+    import orjson
+
+    def dumps(obj):
+        # Match the standard library, which coerces non-str keys
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    return JSONCodec('orjson', orjson.loads, dumps)
+
+
+def _ujson():
+    import ujson
+
+    def dumps(obj):
+        return ujson.dumps(obj, escape_forward_slashes=False)
+
+    return JSONCodec('ujson', ujson.loads, dumps)
+
+
+_LOADERS = {
+    'json': _json,
+    'orjson': _orjson,
+    'ujson': _ujson,
+}
+
+_default = []
+
+
+def get_codec(codec=None):
+    """Get a JSON codec.
+
+    :param codec: None to use the fastest installed library; str name of
+        library, one of PREFERENCE; or a JSONCodec, returned as-is.
+    :return: JSONCodec with `loads` and `dumps` functions
+    :raise ClientError: if named library is unknown or not installed
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    if codec is None:
+        if not _default:
+            for name in PREFERENCE:
+                try:
+                    _default.append(_LOADERS[name]())
+                    break
+                except ImportError:
+                    continue
+        return _default[0]
+
+    try:
+        return _LOADERS[codec]()
+    except KeyError:
+        raise ClientError('Unknown JSON codec: {!r}. Must be one of {}'
+                          .format(codec, PREFERENCE))
+    except ImportError:
+        raise ClientError('JSON codec {!r} is not installed'.format(codec))
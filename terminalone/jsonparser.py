@@ -2,6 +2,7 @@
 """Parses JSON output from T1 and returns a Python object"""
 
 from __future__ import absolute_import
+import codecs
 import json
 try:
     from itertools import imap
@@ -9,6 +10,7 @@ try:
 except ImportError:
     pass
 from .errors import (T1Error, ValidationError, ParserException, STATUS_CODES)
+from .jsoncodec import json_loads
 from terminalone.vendor import six
 
 
@@ -35,13 +37,17 @@ class FindKey:
 class JSONParser(object):
     """Parses JSON response"""
 
-    def __init__(self, body):
+    def __init__(self, body, loads=json_loads):
         self.status_code = False
         try:
-            parsed_data = json.loads(body)
+            parsed_data = loads(body)
         except ValueError as e:
             raise ParserException(e)
 
+        self._parse(parsed_data, body)
+
+    def _parse(self, parsed_data, body):
+        """Check status and set entity count and entities from parsed body."""
         self.get_status(parsed_data, body)
 
         try:
@@ -212,3 +218,161 @@ class JSONParser(object):
             if 'id' == key or key.endswith('_id'):
                 output[key] = int(output[key])
         return output
+
+
+class StreamingJSONParser(JSONParser):
+    """Parses JSON response incrementally, as chunks arrive off the socket.
+
+    Elements of a collection's `data` list are decoded and yielded one at a
+    time instead of loading the whole body first. T1 sends `data` before
+    `meta`, so in that case `entity_count` is only set, and an error status
+    only raised, once iteration reaches `meta`. Any other response (single
+    entity, errors, permissions...) is decoded in full and parsed exactly as
+    JSONParser would. Errors carry the raw body text, as with JSONParser;
+    for a streamed collection, only the part read before its entities.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, chunks, encoding='utf-8'):
+        self.status_code = False
+        self.entity_count = None
+        self._reader = _ChunkReader(chunks, encoding)
+        self._doc = {}
+        self._keys_read = 0
+
+        reader = self._reader
+        reader.expect('{')
+        while self._next_key():
+            key = reader.value()
+            reader.expect(':')
+            if key == 'data' and reader.peek() == '[':
+                reader.record = False
+                if 'meta' in self._doc:
+                    self._check_meta()
+                self.entities = self._iter_data()
+                return
+            self._doc[key] = reader.value()
+
+        self._parse(self._doc, reader.text())
+
+    def _next_key(self):
+        """Advance past separators; False if the top-level object is done."""
+        reader = self._reader
+        char = reader.peek()
+        if char == '}':
+            reader.advance()
+            return False
+        if self._keys_read:
+            reader.expect(',')
+            char = reader.peek()
+        if char != '"':
+            raise ParserException(ValueError('Expected key, got {!r}'.format(char)))
+        self._keys_read += 1
+        return True
+
+    def _check_meta(self):
+        self.get_status(self._doc, self._reader.text())
+        try:
+            self.entity_count = int(self._doc['meta']['total_count'])
+        except KeyError:
+            self.entity_count = 1
+
+    def _iter_data(self):
+        """Yield processed entities, then read the rest of the body."""
+        reader = self._reader
+        checked = 'meta' in self._doc
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.advance()
+        else:
+            while True:
+                yield self.process_entity(reader.value())
+                char = reader.peek()
+                reader.advance()
+                if char == ']':
+                    break
+                if char != ',':
+                    raise ParserException(
+                        ValueError('Expected , or ], got {!r}'.format(char)))
+
+        while self._next_key():
+            key = reader.value()
+            reader.expect(':')
+            self._doc[key] = reader.value()
+        if not checked:
+            self._check_meta()
+
+
+class _ChunkReader(object):
+    """Incrementally decode JSON values from an iterator of byte chunks."""
+
+    _decoder = json.JSONDecoder()
+    _whitespace = ' \t\n\r'
+
+    def __init__(self, chunks, encoding):
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.record = True
+        self._text = []
+
+    def fill(self):
+        """Read the next chunk into the buffer. False at end of input."""
+        if self.eof:
+            return False
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.eof = True
+            chunk = b''
+        text = self.text_decoder.decode(chunk, final=self.eof)
+        if self.record:
+            self._text.append(text)
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return not self.eof or bool(text)
+
+    def text(self):
+        """Return the raw text read while recording."""
+        return ''.join(self._text)
+
+    def peek(self):
+        """Return next non-whitespace character without consuming it."""
+        while True:
+            while (self.pos < len(self.buffer) and
+                   self.buffer[self.pos] in self._whitespace):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def advance(self):
+        self.pos += 1
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ParserException(
+                ValueError('Expected {!r}, got {!r}'.format(char, found)))
+        self.advance()
+
+    def value(self):
+        """Decode the next complete JSON value, reading more as needed."""
+        self.peek()
+        while True:
+            try:
+                result, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except ValueError as e:
+                if not self.fill():
+                    raise ParserException(e)
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return result
@@ -0,0 +1,857 @@
+# -*- coding: utf-8 -*-
+"""Provides a local stand-in for the T1 APIs, for load and scale testing.
+
+Serves enough of the APIs for the client's features to be exercised
+against a real socket, on one machine:
+
+- login and session (api/v2.0/login, api/v2.0/session), accepting any
+  credentials
+- collections (api/v2.0/organizations, agencies, advertisers, campaigns
+  and strategies): pages with page_limit/page_offset/sort_by, queries
+  with q, related entities with `with`, full records with `full`, single
+  entities, and saves (with version checks) and creates
+- reports (reporting/v1/std): the list of reports, metadata, and CSV data
+  for the "performance" report, streamed in chunks
+
+Entities are generated from their IDs as they are requested, so data sets
+of millions cost nothing up front; only saved entities are stored.
+Queries other than IN scan the collection. Responses are XML, or JSON if
+the client asks for it (T1(json=True)). Latency can be added to every
+request, and requests other than login throttled with 429 responses.
+
+Usage:
+    from terminalone.mockserver import MockServer
+    with MockServer(size=100000, latency=0.05, throttle=0.1) as server:
+        t1 = T1('user', 'password', 'api_key', auth_method='cookie',
+                api_base=server.api_base, retry=True)
+
+Or run one from the command line (see --help):
+
+    python -m terminalone.mockserver --port 8080 --size 100000
+"""
+
+from __future__ import absolute_import, division, print_function
+import binascii
+import csv
+import fnmatch
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from .metadata import __version__
+from .vendor import six
+from .vendor.six.moves import BaseHTTPServer, socketserver
+from .vendor.six.moves.http_cookies import SimpleCookie
+from .vendor.six.moves.urllib.parse import parse_qs, urlparse
+
+# collection: (entity type, parent collection)
+COLLECTIONS = OrderedDict([
+    ('organizations', ('organization', None)),
+    ('agencies', ('agency', 'organizations')),
+    ('advertisers', ('advertiser', 'agencies')),
+    ('campaigns', ('campaign', 'advertisers')),
+    ('strategies', ('strategy', 'campaigns')),
+])
+
+TYPES = dict((ent_type, collection) for collection, (ent_type, _)
+             in six.iteritems(COLLECTIONS))
+
+EPOCH = datetime(2016, 1, 1)
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+MAX_PAGE_LIMIT = 100
+
+CSV_CHUNK_SIZE = 64 * 1024
+
+JSON_CONTENT_TYPE = 'application/vnd.mediamath.v1+json'
+
+# Operators of T1.find's filters, longest first so that e.g. "==" isn't
+# read as "="
+_CONDITION = re.compile(r'^(\w+)(==|!=|>=|<=|=:|:!|:|>|<)(.*)$')
+
+# dimension: (collection, property)
+DIMENSIONS = OrderedDict(
+    (name, (collection, prop))
+    for collection in COLLECTIONS
+    for name, prop in (
+        (COLLECTIONS[collection][0] + '_id', 'id'),
+        (COLLECTIONS[collection][0] + '_name', 'name'))
+)
+
+METRICS = OrderedDict([
+    ('impressions', 'int'),
+    ('clicks', 'int'),
+    ('ctr', 'percent'),
+    ('total_spend', 'money'),
+    ('billed_spend', 'money'),
+])
+
+REPORTS = {
+    'performance': {
+        'Name': 'Performance Report',
+        'Description': 'Standard Performance Report',
+    },
+}
+
+
+class MockError(Exception):
+    """Error response, with a T1 status code and HTTP status."""
+
+    def __init__(self, code, message, http_status=400, errors=None):
+        super(MockError, self).__init__(message)
+        self.code = code
+        self.message = message
+        self.http_status = http_status
+        self.errors = errors or {}
+
+
+def _timestamp(minutes):
+    return (EPOCH + timedelta(minutes=minutes)).strftime(DATE_FORMAT)
+
+
+class DataSet(object):
+    """Entities served by the mock server.
+
+    Each collection holds IDs 1 to its size. Entity i's parent is
+    `(i - 1) % parents + 1`, so every parent has children. Entities are
+    generated on request; those saved or created are stored.
+    """
+
+    def __init__(self, size=1000, sizes=None):
+        """Set up data set.
+
+        :param size: int number of entities in each collection
+        :param sizes: dict collection: int size, overriding size
+        """
+        self.sizes = dict((collection, size) for collection in COLLECTIONS)
+        self.sizes.update(sizes or {})
+        self._stored = dict((collection, {}) for collection in COLLECTIONS)
+        self._lock = threading.Lock()
+
+    def generate(self, collection, ent_id):
+        """Properties of entity ent_id as generated."""
+        ent_type, parent = COLLECTIONS[collection]
+        entity = OrderedDict([
+            ('id', ent_id),
+            ('name', '{} {}'.format(ent_type.replace('_', ' ').title(),
+                                    ent_id)),
+            ('version', 0),
+            ('status', 1),
+            ('created_on', _timestamp(ent_id)),
+            ('updated_on', _timestamp(ent_id)),
+        ])
+        if parent is not None:
+            entity[COLLECTIONS[parent][0] + '_id'] = (
+                (ent_id - 1) % self.sizes[parent] + 1)
+        if collection == 'organizations':
+            entity['currency_code'] = 'USD'
+        elif collection == 'advertisers':
+            entity.update(domain='http://advertiser{}.example.com'.format(
+                ent_id), ad_server_id=9, vertical_id=11)
+        elif collection in ('campaigns', 'strategies'):
+            entity.update(goal_type='cpa', goal_value=float(ent_id % 50 + 1),
+                          start_date='2016-01-01T00:00:00',
+                          end_date='2026-12-31T23:59:59')
+            if collection == 'campaigns':
+                entity.update(currency_code='USD', zone_name='America/New_York',
+                              total_budget=1000.0 * (ent_id % 10 + 1))
+            else:
+                entity.update(type='REM', budget=100.0 * (ent_id % 10 + 1),
+                              max_bid=float(ent_id % 5 + 1),
+                              pacing_amount=10.0)
+        return entity
+
+    def get(self, collection, ent_id):
+        """Properties of entity ent_id, or None if there is none."""
+        stored = self._stored[collection].get(ent_id)
+        if stored is not None:
+            return stored
+        if 1 <= ent_id <= self.sizes[collection]:
+            return self.generate(collection, ent_id)
+        return None
+
+    def ids(self, collection):
+        return six.moves.range(1, self.sizes[collection] + 1)
+
+    def children(self, collection, parent_id):
+        """IDs of the entities of collection under parent_id."""
+        parent = COLLECTIONS[collection][1]
+        field = COLLECTIONS[parent][0] + '_id'
+        candidates = set(six.moves.range(
+            parent_id, self.sizes[collection] + 1, self.sizes[parent]))
+        candidates.update(self._stored[collection])
+        return [ent_id for ent_id in sorted(candidates)
+                if self.get(collection, ent_id)[field] == parent_id]
+
+    def save(self, collection, ent_id, data):
+        """Update (or with ent_id None, create) an entity from form data.
+
+        :return: dict properties saved
+        :raise MockError: if the entity doesn't exist, or on a version
+            conflict or invalid value
+        """
+        with self._lock:
+            if ent_id is None:
+                ent_id = self.sizes[collection] + 1
+                entity = self.generate(collection, ent_id)
+                if 'name' not in data:
+                    raise MockError('invalid', 'Validation errors',
+                                    errors={'name': 'Name is required'})
+            else:
+                entity = self.get(collection, ent_id)
+                if entity is None:
+                    raise MockError('not_found', 'Not found', 404)
+                entity = OrderedDict(entity)
+                if 'version' in data and _to_int(
+                        data['version']) != entity['version']:
+                    raise MockError('invalid', 'Validation errors', errors={
+                        'version': 'Entity has been modified'})
+                entity['version'] += 1
+            for key, value in six.iteritems(data):
+                if key in ('id', 'version', 'created_on', 'updated_on'):
+                    continue
+                try:
+                    entity[key] = _convert(entity.get(key), value)
+                except ValueError:
+                    raise MockError('invalid', 'Validation errors', errors={
+                        key: 'Invalid value {!r}'.format(value)})
+            entity['updated_on'] = datetime.utcnow().strftime(DATE_FORMAT)
+            self._stored[collection][ent_id] = entity
+            self.sizes[collection] = max(self.sizes[collection], ent_id)
+            return entity
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise MockError('invalid', 'Validation errors', errors={
+            'version': 'Invalid version'})
+
+
+def _convert(current, value):
+    """Convert a posted/queried string to the type of the current value."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(current, bool) or isinstance(current, six.integer_types):
+        return int(value)
+    if isinstance(current, float):
+        return float(value)
+    return value
+
+
+def _matches(entity, condition):
+    """Whether entity satisfies one "field<operator>value" condition."""
+    match = _CONDITION.match(condition)
+    if match is None:
+        raise MockError('bad_request',
+                        'Invalid query: {}'.format(condition))
+    field, operator, value = match.groups()
+    current = entity.get(field)
+    if operator == ':':
+        return current is None or current == ''
+    if operator == ':!':
+        return current is not None and current != ''
+    if current is None:
+        return False
+    if operator == '=:':
+        return fnmatch.fnmatchcase(six.text_type(current).lower(),
+                                   value.lower())
+    try:
+        value = _convert(current, value)
+    except ValueError:
+        raise MockError('bad_request', 'Invalid value for {}: {}'.format(
+            field, value))
+    return {
+        '==': current == value,
+        '!=': current != value,
+        '>=': current >= value,
+        '<=': current <= value,
+        '>': current > value,
+        '<': current < value,
+    }[operator]
+
+
+class MockServer(object):
+    """Threaded HTTP server imitating the T1 APIs."""
+
+    def __init__(self, host='127.0.0.1', port=0, size=1000, sizes=None,
+                 latency=0, throttle=0, retry_after=1, seed=None,
+                 verbose=False):
+        """Set up server. It starts serving on `start` (or `with`).
+
+        :param host: str interface to listen on
+        :param port: int port to listen on. Default picks a free one.
+        :param size: int number of entities in each collection
+        :param sizes: dict collection: int size, overriding size
+        :param latency: float seconds to wait before answering each request,
+            or tuple (min, max) to wait a random time in between
+        :param throttle: float share of requests (other than login) to
+            answer with 429 Too Many Requests
+        :param retry_after: int seconds to send in Retry-After with 429s
+        :param seed: seed of the random number generator for latency and
+            throttling, to repeat a run
+        :param verbose: bool log requests to stderr
+        """
+        self.data = DataSet(size, sizes)
+        self.latency = latency
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.verbose = verbose
+        self.random = random.Random(seed)
+        self.sessions = set()
+        self.stats = {'requests': 0, 'throttled': 0}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = _HTTPServer((host, port), _Handler)
+        self.httpd.mock = self
+
+    @property
+    def api_base(self):
+        """api_base to give T1, e.g. "http://127.0.0.1:8080"."""
+        host, port = self.httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                        name='mockserver')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _before_request(self, throttle):
+        """Wait the latency; return whether to throttle the request."""
+        with self._lock:
+            self.stats['requests'] += 1
+            if isinstance(self.latency, (tuple, list)):
+                delay = self.random.uniform(*self.latency)
+            else:
+                delay = self.latency
+            throttled = throttle and self.random.random() < self.throttle
+            if throttled:
+                self.stats['throttled'] += 1
+        if delay:
+            time.sleep(delay)
+        return throttled
+
+
+class _HTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Routes requests to the mock APIs."""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockT1/' + __version__
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def log_message(self, format, *args):
+        if self.server.mock.verbose:
+            BaseHTTPServer.BaseHTTPRequestHandler.log_message(
+                self, format, *args)
+
+    def _handle(self, method):
+        mock = self.server.mock
+        url = urlparse(self.path)
+        self.params = parse_qs(url.query, keep_blank_values=True)
+        self.form = self._read_form() if method == 'POST' else {}
+        self.json = 'json' in self.headers.get('Accept', '')
+        segments = [s for s in url.path.split('/') if s]
+        is_login = segments[2:] == ['login']
+
+        if mock._before_request(throttle=not is_login):
+            self._finish_error(MockError('error', 'Too Many Requests', 429),
+                               json_=self.json and segments[:1] == ['api'],
+                               headers=[('Retry-After', str(mock.retry_after))])
+            return
+        try:
+            if segments[:2] == ['api', 'v2.0'] and len(segments) > 2:
+                self._mgmt(method, segments[2:])
+            elif (segments[:3] == ['reporting', 'v1', 'std'] and
+                  method == 'GET'):
+                self._reports(segments[3:])
+            else:
+                raise MockError('not_found', 'Not found', 404)
+        except MockError as exc:
+            self._finish_error(exc, json_=self.json and
+                               segments[:1] == ['api'])
+
+    def _read_form(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        if 'json' in self.headers.get('Content-Type', ''):
+            return json.loads(body) if body else {}
+        return dict((key, values[-1]) for key, values
+                    in six.iteritems(parse_qs(body, keep_blank_values=True)))
+
+    def _param(self, name, default=None):
+        values = self.params.get(name)
+        return values[-1] if values else default
+
+    # Management API
+
+    def _mgmt(self, method, segments):
+        mock = self.server.mock
+        if segments == ['login'] and method == 'POST':
+            session_id = binascii.hexlify(os.urandom(20)).decode('ascii')
+            with mock._lock:
+                mock.sessions.add(session_id)
+            self._send_session(session_id, headers=[(
+                'Set-Cookie', 'adama_session={}; Path=/'.format(session_id))])
+            return
+        session_id = self._check_auth()
+        if segments == ['session'] and method == 'GET':
+            self._send_session(session_id)
+            return
+
+        collection = segments[0]
+        if collection not in COLLECTIONS or len(segments) > 2:
+            raise MockError('not_found', 'Not found', 404)
+        ent_id = None
+        if len(segments) == 2:
+            try:
+                ent_id = int(segments[1])
+            except ValueError:
+                raise MockError('not_found', 'Not found', 404)
+
+        data = mock.data
+        if method == 'POST':
+            entity = data.save(collection, ent_id, self.form)
+            self._send_entities(collection, [entity], full=True)
+        elif ent_id is not None:
+            entity = data.get(collection, ent_id)
+            if entity is None:
+                raise MockError('not_found', 'Not found', 404)
+            self._send_entities(collection, [entity], full=True)
+        else:
+            self._send_page(collection)
+
+    def _check_auth(self):
+        """Return the session ID of the request.
+
+        :raise MockError: if it has no valid session cookie or bearer token
+        """
+        if self.headers.get('Authorization', '').startswith('Bearer '):
+            return None
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        morsel = cookie.get('adama_session')
+        if morsel is None or morsel.value not in self.server.mock.sessions:
+            raise MockError('auth_required', 'Authentication required', 401)
+        return morsel.value
+
+    def _send_session(self, session_id, headers=()):
+        now = datetime.utcnow()
+        user = OrderedDict([('id', 1), ('name', 'user')])
+        session = OrderedDict([
+            ('current_time', now.strftime(DATE_FORMAT)),
+            ('expires', (now + timedelta(days=1)).strftime(DATE_FORMAT)),
+            ('sessionid', session_id or ''),
+        ])
+        if self.json:
+            payload = dict(user, entity_type='user', session=session)
+            self._finish_json({'data': payload, 'meta': {'status': 'ok'}},
+                              headers=headers)
+            return
+        result = ET.Element('result')
+        ET.SubElement(result, 'entity', dict(
+            (k, str(v)) for k, v in six.iteritems(user)), type='user')
+        ET.SubElement(result, 'session', session)
+        ET.SubElement(result, 'status', code='ok')
+        self._finish_xml(result, headers=headers)
+
+    def _send_page(self, collection):
+        data = self.server.mock.data
+        try:
+            limit = int(self._param('page_limit', MAX_PAGE_LIMIT))
+            offset = int(self._param('page_offset', 0))
+        except ValueError:
+            raise MockError('bad_request', 'Invalid page_limit/page_offset')
+        if not 0 < limit <= MAX_PAGE_LIMIT or offset < 0:
+            raise MockError('bad_request', 'page_limit must be 1 to {}'
+                            .format(MAX_PAGE_LIMIT))
+
+        query = self._param('q')
+        sort_by = self._param('sort_by') or 'id'
+        if query and query.startswith('('):
+            try:
+                ids = sorted(set(int(i) for i in query.strip('()').split(',')
+                                 if i))
+            except ValueError:
+                raise MockError('bad_request', 'Invalid query: ' + query)
+            entities = [e for e in (data.get(collection, i) for i in ids)
+                        if e is not None]
+        elif query or sort_by.lstrip('-') != 'id':
+            conditions = query.split('&') if query else []
+            entities = [e for e in (data.get(collection, i)
+                                    for i in data.ids(collection))
+                        if all(_matches(e, c) for c in conditions)]
+        else:
+            # Paging by ID needs no scan
+            total = data.sizes[collection]
+            if sort_by == '-id':
+                ids = six.moves.range(total - offset,
+                                      max(total - offset - limit, 0), -1)
+            else:
+                ids = six.moves.range(offset + 1,
+                                      min(offset + limit, total) + 1)
+            entities = [data.get(collection, i) for i in ids]
+            self._send_entities(collection, entities, total, offset)
+            return
+
+        field = sort_by.lstrip('-')
+        entities.sort(key=lambda e: (e.get(field) is None, e.get(field)),
+                      reverse=sort_by.startswith('-'))
+        self._send_entities(collection, entities[offset:offset + limit],
+                            len(entities), offset)
+
+    def _full(self, ent_type):
+        full = self._param('full')
+        if full is None:
+            return False
+        return full == '*' or ent_type in full.split(',')
+
+    def _send_entities(self, collection, entities, total=None, offset=0,
+                       full=False):
+        """Send entities, as a collection page if total is given."""
+        ent_type = COLLECTIONS[collection][0]
+        nodes = [self._node(collection, entity, full or self._full(ent_type),
+                            self.params.get('with', []))
+                 for entity in entities]
+        if self.json:
+            data = [self._json_entity(node) for node in nodes]
+            meta = OrderedDict([('status', 'ok')])
+            if total is None:
+                data = data[0]
+            else:
+                meta.update(count=len(nodes), total_count=total,
+                            offset=offset)
+            self._finish_json(OrderedDict([('data', data), ('meta', meta)]))
+            return
+        result = ET.Element('result')
+        parent = result
+        if total is not None:
+            parent = ET.SubElement(result, 'entities', count=str(total),
+                                   start=str(offset))
+        for node in nodes:
+            parent.append(self._xml_entity(node))
+        ET.SubElement(result, 'status', code='ok')
+        self._finish_xml(result)
+
+    def _node(self, collection, entity, full, includes, rel=None):
+        """Entity with its related entities, for rendering.
+
+        :param includes: list of `with` values, e.g. "advertiser,agency"
+        """
+        data = self.server.mock.data
+        ent_type, parent = COLLECTIONS[collection]
+        if full:
+            props = entity
+        else:
+            props = OrderedDict((key, entity[key])
+                                for key in ('id', 'name', 'version'))
+        related = []
+        for include in includes:
+            if not include:
+                continue
+            name, _, rest = include.partition(',')
+            rest = [rest] if rest else []
+            if parent is not None and name == COLLECTIONS[parent][0]:
+                parent_entity = data.get(parent, entity[name + '_id'])
+                if parent_entity is not None:
+                    related.append(self._node(parent, parent_entity,
+                                              self._full(name), rest, name))
+            elif (name in COLLECTIONS and
+                  COLLECTIONS[name][1] == collection):
+                for child_id in data.children(name, entity['id']):
+                    related.append(self._node(
+                        name, data.get(name, child_id),
+                        self._full(COLLECTIONS[name][0]), rest, name))
+            else:
+                raise MockError('bad_request',
+                                'Invalid relation: {}'.format(name))
+        return ent_type, props, related, rel
+
+    @classmethod
+    def _xml_entity(cls, node):
+        ent_type, props, related, rel = node
+        attrib = OrderedDict([('id', str(props['id'])),
+                              ('name', props['name']),
+                              ('type', ent_type),
+                              ('version', str(props['version']))])
+        if rel is not None:
+            attrib['rel'] = rel
+        element = ET.Element('entity', attrib)
+        for key, value in six.iteritems(props):
+            if key not in attrib:
+                ET.SubElement(element, 'prop', name=key,
+                              value='' if value is None else str(value))
+        for child in related:
+            element.append(cls._xml_entity(child))
+        return element
+
+    @classmethod
+    def _json_entity(cls, node):
+        ent_type, props, related, rel = node
+        output = OrderedDict(props)
+        output['entity_type'] = ent_type
+        if rel is not None:
+            output['rel'] = rel
+        for child in related:
+            child_rel = child[3]
+            if child_rel in TYPES:
+                output[child_rel] = cls._json_entity(child)
+            else:
+                output.setdefault(child_rel, []).append(
+                    cls._json_entity(child))
+        return output
+
+    # Reports API
+
+    def _reports(self, segments):
+        self._check_auth()
+        base = '{}/reporting/v1/std/'.format(self.server.mock.api_base)
+        if segments == ['meta']:
+            reports = dict((name, dict(info, URI_Data=base + name,
+                                       URI_Meta=base + name + '/meta'))
+                           for name, info in six.iteritems(REPORTS))
+            self._finish_json({'reports': reports})
+        elif len(segments) == 2 and segments[1] == 'meta' and \
+                segments[0] in REPORTS:
+            self._finish_json(self._report_meta(base, segments[0]))
+        elif len(segments) == 1 and segments[0] in REPORTS:
+            self._send_report()
+        else:
+            raise MockError('not_found', 'Not found', 404)
+
+    @staticmethod
+    def _report_meta(base, name):
+        def field(key, type_):
+            return key, {'name': key.replace('_', ' ').title(),
+                         'type': type_}
+        return dict(REPORTS[name], URI_Data=base + name, structure={
+            'dimensions': dict(field(key, 'id' if key.endswith('_id')
+                                     else 'string') for key in DIMENSIONS),
+            'metrics': dict(field(key, type_)
+                            for key, type_ in six.iteritems(METRICS)),
+            'time_field': dict([field('day', 'datetime')]),
+        })
+
+    def _report_dates(self):
+        window = self._param('time_window')
+        today = date.today()
+        if window:
+            match = re.match(r'^last_(\d+)_days$', window)
+            if window == 'yesterday':
+                return today - timedelta(days=1), today - timedelta(days=1)
+            if match is None:
+                raise MockError('bad_request',
+                                'Invalid time_window: ' + window)
+            return (today - timedelta(days=int(match.group(1))),
+                    today - timedelta(days=1))
+        try:
+            start = datetime.strptime(self._param('start_date'),
+                                      '%Y-%m-%d').date()
+            end = datetime.strptime(self._param('end_date', '') or
+                                    today.isoformat(), '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            raise MockError('bad_request', 'start_date and end_date must be '
+                            'given as YYYY-MM-DD, or time_window')
+        if end < start:
+            raise MockError('bad_request', 'end_date is before start_date')
+        return start, end
+
+    def _send_report(self):
+        dimensions = [d for d in (self._param('dimensions') or '').split(',')
+                      if d]
+        metrics = [m for m in (self._param('metrics') or '').split(',')
+                   if m] or list(METRICS)
+        if not dimensions:
+            raise MockError('bad_request', 'dimensions are required')
+        unknown = ([d for d in dimensions if d not in DIMENSIONS] +
+                   [m for m in metrics if m not in METRICS])
+        if unknown:
+            raise MockError('bad_request',
+                            'Unknown columns: ' + ','.join(unknown))
+        rollup = self._param('time_rollup') or 'by_day'
+        if rollup not in ('by_day', 'all'):
+            raise MockError('bad_request',
+                            'Unsupported time_rollup: ' + rollup)
+        start, end = self._report_dates()
+        filters = dict((key, int(values[-1])) for key, values in six.iteritems(
+            parse_qs(self._param('filter') or '')) if key in DIMENSIONS)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv; charset=UTF-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        out = io.StringIO() if six.PY3 else io.BytesIO()
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(['start_date', 'end_date'] + dimensions + metrics)
+        for row in self._report_rows(dimensions, metrics, rollup, start, end,
+                                     filters):
+            writer.writerow(row)
+            if out.tell() >= CSV_CHUNK_SIZE:
+                self._write_chunk(out.getvalue())
+                out.seek(0)
+                out.truncate()
+        self._write_chunk(out.getvalue())
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, text):
+        if not text:
+            return
+        if isinstance(text, six.text_type):
+            text = text.encode('utf-8')
+        self.wfile.write('{:x}\r\n'.format(len(text)).encode('ascii'))
+        self.wfile.write(text)
+        self.wfile.write(b'\r\n')
+
+    def _report_rows(self, dimensions, metrics, rollup, start, end, filters):
+        """Rows for each day (or the whole range) and entity of the most
+        detailed collection among the dimensions."""
+        data = self.server.mock.data
+        order = list(COLLECTIONS)
+        collection = max((DIMENSIONS[d][0] for d in dimensions),
+                         key=order.index)
+        if rollup == 'all':
+            periods = [(start, end)]
+        else:
+            periods = [(start + timedelta(days=i),) * 2
+                       for i in range((end - start).days + 1)]
+        for ent_id in data.ids(collection):
+            # Values of every dimension, following parents up the hierarchy
+            values = {}
+            current, entity = collection, data.get(collection, ent_id)
+            while entity is not None:
+                ent_type, parent = COLLECTIONS[current]
+                values[ent_type + '_id'] = entity['id']
+                values[ent_type + '_name'] = entity['name']
+                if parent is None:
+                    break
+                current, entity = parent, data.get(
+                    parent, entity[COLLECTIONS[parent][0] + '_id'])
+            if any(values.get(key) != value
+                   for key, value in six.iteritems(filters)):
+                continue
+            dims = [values.get(d, '') for d in dimensions]
+            for first, last in periods:
+                days = (last - first).days + 1
+                seed = (ent_id * 2654435761 + first.toordinal() * 40503)
+                impressions = days * (1000 + seed % 9000)
+                clicks = days * (seed % 97)
+                spend = impressions * 0.002
+                row = {'impressions': impressions, 'clicks': clicks,
+                       'ctr': '{:.6f}'.format(clicks / impressions),
+                       'total_spend': '{:.2f}'.format(spend),
+                       'billed_spend': '{:.2f}'.format(spend * 1.1)}
+                yield ([first.isoformat(), last.isoformat()] + dims +
+                       [row[m] for m in metrics])
+
+    # Responses
+
+    def _finish_error(self, error, json_=False, headers=()):
+        """Send an error response in T1's format."""
+        if json_:
+            if error.errors:
+                errors = [{'type': 'field-error', 'field': field,
+                           'message': message}
+                          for field, message in six.iteritems(error.errors)]
+            else:
+                errors = [{'message': error.message}]
+            self._finish_json({'errors': errors,
+                               'meta': {'status': error.code}},
+                              error.http_status, headers)
+            return
+        result = ET.Element('result')
+        if error.errors:
+            errors = ET.SubElement(result, 'errors')
+            for field, message in six.iteritems(error.errors):
+                ET.SubElement(errors, 'field-error', name=field, error=message)
+        status = ET.SubElement(result, 'status', code=error.code)
+        status.text = error.message
+        self._finish_xml(result, error.http_status, headers)
+
+    def _finish_xml(self, element, status=200, headers=()):
+        self._finish(ET.tostring(element, encoding='utf-8'),
+                     'text/xml; charset=utf-8', status, headers)
+
+    def _finish_json(self, payload, status=200, headers=()):
+        self._finish(json.dumps(payload).encode('utf-8'), JSON_CONTENT_TYPE,
+                     status, headers)
+
+    def _finish(self, body, content_type, status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='python -m terminalone.mockserver',
+        description='Serve a local stand-in for the T1 APIs.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--size', type=int, default=1000,
+                        help='entities in each collection; default '
+                             '%(default)s')
+    parser.add_argument('--latency', type=float, nargs='+', default=[0],
+                        metavar='SECONDS',
+                        help='delay before each response, or min and max')
+    parser.add_argument('--throttle', type=float, default=0,
+                        help='share of requests to answer with 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--quiet', action='store_true',
+                        help="don't log requests")
+    args = parser.parse_args(argv)
+    latency = args.latency[0] if len(args.latency) == 1 else \
+        tuple(args.latency[:2])
+    server = MockServer(args.host, args.port, size=args.size, latency=latency,
+                        throttle=args.throttle, retry_after=args.retry_after,
+                        seed=args.seed, verbose=not args.quiet)
+    print('Serving T1 mock API; use api_base={!r}'.format(server.api_base))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
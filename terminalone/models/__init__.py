@@ -1,53 +1,65 @@
 # -*-coding: utf-8 -*-
-"""All models for TerminalOne objects. Safe to import *"""
+"""All models for TerminalOne objects. Safe to import *
 
-from .acl import ACL
-from .adserver import AdServer
-from .advertiser import Advertiser
-from .agency import Agency
-from .atomiccreative import AtomicCreative
-from .audiencesegment import AudienceSegment
-from .budgetflight import BudgetFlight
-from .campaign import Campaign
-from .concept import Concept
-from .contact import Contact
-from .contract import Contract
-from .creativeapproval import CreativeApproval
-from .creative import Creative
-from .deal import Deal
-from .organization import Organization
-from .permission import Permission
-from .pixel import ChildPixel
-from .pixelbundle import Pixel, PixelBundle
-from .pixelprovider import PixelProvider
-from .placementslot import PlacementSlot
-from .publisher import Publisher
-from .publishersite import PublisherSite
-from .retiredaudiencesegment import RetiredAudienceSegment
-from .retiredstrategyaudiencesegment import RetiredStrategyAudienceSegment
-from .rmxstrategy import RMXStrategy
-from .rmxstrategyroitargetpixel import RMXStrategyROITargetPixel
-from .seat import Seat
-from .sitelist import SiteList
-from .siteplacement import SitePlacement
-from .strategy import Strategy
-from .strategyaudiencesegment import StrategyAudienceSegment
-from .strategyconcept import StrategyConcept
-from .strategydeal import StrategyDeal
-from .strategydaypart import StrategyDayPart
-from .strategydomain import StrategyDomain
-from .strategysupplysource import StrategySupplySource
-from .strategytargetingsegment import StrategyTargetingSegment
-from .supplysource import SupplySource
-from .targetdimension import TargetDimension
-from .targetvalue import TargetValue
-from .user import User
-from .vendor import Vendor
-from .vendorcontract import VendorContract
-from .vendordomain import VendorDomain
-from .vendorpixel import VendorPixel
-from .vendorpixeldomain import VendorPixelDomain
-from .vertical import Vertical
+Model modules are imported on first access, so that importing the package
+doesn't import all of them.
+"""
+
+from __future__ import absolute_import
+import sys
+from importlib import import_module
+
+# Model class name => module
+_MODULES = {
+    'ACL': 'acl',
+    'AdServer': 'adserver',
+    'Advertiser': 'advertiser',
+    'Agency': 'agency',
+    'AtomicCreative': 'atomiccreative',
+    'AudienceSegment': 'audiencesegment',
+    'BudgetFlight': 'budgetflight',
+    'Campaign': 'campaign',
+    'Concept': 'concept',
+    'Contact': 'contact',
+    'Contract': 'contract',
+    'CreativeApproval': 'creativeapproval',
+    'Creative': 'creative',
+    'Deal': 'deal',
+    'Organization': 'organization',
+    'Permission': 'permission',
+    'ChildPixel': 'pixel',
+    'Pixel': 'pixelbundle',
+    'PixelBundle': 'pixelbundle',
+    'PixelProvider': 'pixelprovider',
+    'PlacementSlot': 'placementslot',
+    'Publisher': 'publisher',
+    'PublisherSite': 'publishersite',
+    'RetiredAudienceSegment': 'retiredaudiencesegment',
+    'RetiredStrategyAudienceSegment': 'retiredstrategyaudiencesegment',
+    'RMXStrategy': 'rmxstrategy',
+    'RMXStrategyROITargetPixel': 'rmxstrategyroitargetpixel',
+    'Seat': 'seat',
+    'SiteList': 'sitelist',
+    'SitePlacement': 'siteplacement',
+    'Strategy': 'strategy',
+    'StrategyAudienceSegment': 'strategyaudiencesegment',
+    'StrategyConcept': 'strategyconcept',
+    'StrategyDeal': 'strategydeal',
+    'StrategyDayPart': 'strategydaypart',
+    'StrategyDomain': 'strategydomain',
+    'StrategySupplySource': 'strategysupplysource',
+    'StrategyTargetingSegment': 'strategytargetingsegment',
+    'SupplySource': 'supplysource',
+    'TargetDimension': 'targetdimension',
+    'TargetValue': 'targetvalue',
+    'User': 'user',
+    'Vendor': 'vendor',
+    'VendorContract': 'vendorcontract',
+    'VendorDomain': 'vendordomain',
+    'VendorPixel': 'vendorpixel',
+    'VendorPixelDomain': 'vendorpixeldomain',
+    'Vertical': 'vertical',
+}
 
 __all__ = ['ACL',
            'AdServer',
@@ -98,3 +110,23 @@ __all__ = ['ACL',
            'VendorPixelDomain',
            'Vertical',
            ]
+
+
+def __getattr__(name):
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(
+            __name__, name))
+    model = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = model
+    return model
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+    for _name in __all__:
+        __getattr__(_name)
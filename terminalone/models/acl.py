@@ -22,5 +22,5 @@ class ACL(SubEntity):
                 self._pull[key] = int
         super(ACL, self).__init__(session, properties, **kwargs)
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('This object is not editable.')
@@ -133,10 +133,10 @@ class Campaign(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(Campaign, self).__init__(session, properties, **kwargs)
 
-    def save(self, data=None, url=None):
-        """Save object to T1 while accounting for old fields"""
+    def _save_payload(self, data=None):
+        """Data to save, accounting for old fields"""
         if data is None:
-            data = self._properties.copy()
+            data = self.get_changes()
 
         if 'merit_pixel_id' in data and data['merit_pixel_id'] is None:
             self._properties.pop('merit_pixel_id', None)
@@ -154,7 +154,7 @@ class Campaign(Entity):
             self._properties.pop('conversion_variable_minutes', None)
             data['conversion_variable_minutes'] = None
 
-        super(Campaign, self).save(data=data, url=url)
+        return super(Campaign, self)._save_payload(data)
 
     def save_budget_flights(self, data=None):
         if data is None and self.budget_flights is None:
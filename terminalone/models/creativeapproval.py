@@ -25,7 +25,7 @@ class CreativeApproval(Entity):
         'version': int,
     }
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('This object is not editable.')
 
     def __init__(self, session, properties=None, **kwargs):
@@ -41,6 +41,7 @@ class Permission(SubEntity):
     def __init__(self, session, properties=None, **kwargs):
         super(Permission, self).__init__(session, properties, **kwargs)
         # we need to do 'full fat' posts on permissions, so override all the _init_properties
+        self._materialize()
         self._properties.update(self._init_properties)
 
     def _change_access(self, entity_access, id_to_change, add):
@@ -72,15 +73,15 @@ class Permission(SubEntity):
     def remove(self, entity_access, entity_id):
         self._change_access(entity_access, entity_id, False)
 
-    def save(self, data=None, url=None):
+    def _save_payload(self, data=None):
         """Extra processing for user permissions
 
         :param data: dict optional data to use instead of self
-        :return: None. Object is updated or error is raised
+        :return: dict data to post
         """
 
         data = self._generate_save_data(data)
-        return super(Permission, self).save(data=data, url=url)
+        return super(Permission, self)._save_payload(data)
 
     def _generate_save_data(self, data=None):
         if data is None:
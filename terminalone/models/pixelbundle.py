@@ -75,17 +75,17 @@ class Pixel(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(Pixel, self).__init__(session, properties, **kwargs)
 
-    def save(self, data=None, url=None):
+    def _save_payload(self, data=None):
         """Extra validation for data pixels
 
         :param data: dict optional data to use instead of self
-        :return: None. Object is updated or error is raised
+        :return: dict data to post
         """
         if self.pixel_type != 'data':
-            return super(Pixel, self).save(data=data)
+            return super(Pixel, self)._save_payload(data)
 
         if data is None:
-            data = self._properties.copy()
+            data = self.get_changes()
         if self.pricing == 'CPM':
             data.pop('cost_cpts', None)
             if not getattr(self, 'cost_pct_cpm', None):
@@ -96,7 +96,7 @@ class Pixel(Entity):
             data.pop('cost_cpm', None)
             data.pop('cost_pct_cpm', None)
 
-        return super(Pixel, self).save(data=data, url=url)
+        return super(Pixel, self)._save_payload(data)
 
 
 PixelBundle = Pixel
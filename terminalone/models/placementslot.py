@@ -86,7 +86,7 @@ class PlacementSlot(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(PlacementSlot, self).__init__(session, properties, **kwargs)
 
-    def save(self, data=None, url=None):
-        """Set defaults for object before saving"""
+    def _save_payload(self, data=None):
+        """Set defaults for object before saving; data is ignored"""
         update_low_priority(self._properties, self.defaults)
-        super(PlacementSlot, self).save()
+        return super(PlacementSlot, self)._save_payload()
@@ -37,5 +37,5 @@ class RetiredAudienceSegment(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(RetiredAudienceSegment, self).__init__(session, properties, **kwargs)
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('This object is not editable.')
@@ -33,5 +33,5 @@ class RetiredStrategyAudienceSegment(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(RetiredStrategyAudienceSegment, self).__init__(session, properties, **kwargs)
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('This object is not editable.')
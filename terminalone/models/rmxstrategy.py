@@ -54,5 +54,5 @@ class RMXStrategy(Entity):
                  'should not be created.', UserWarning, stacklevel=3)
         super(RMXStrategy, self).__init__(session, properties, **kwargs)
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('This object is not editable.')
@@ -42,5 +42,5 @@ class RMXStrategyROITargetPixel(Entity):
         super(RMXStrategyROITargetPixel, self).__init__(session,
                                                         properties, **kwargs)
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('This object is not editable.')
@@ -41,9 +41,9 @@ class SitePlacement(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(SitePlacement, self).__init__(session, properties, **kwargs)
 
-    def save(self, data=None, url=None):
+    def _save_payload(self, data=None):
         if data is None:
-            data = self._properties
-        if not data.get('display_text'):
-            data['display_text'] = data['name']
-        super(SitePlacement, self).save(data=data, url=url)
+            data = self.get_changes()
+        if data and not data.get('display_text', getattr(self, 'display_text', None)):
+            data['display_text'] = data.get('name', getattr(self, 'name', None))
+        return super(SitePlacement, self)._save_payload(data)
@@ -142,12 +142,18 @@ class Strategy(Entity):
 
     def _deserialize_target_expr(self):
         """Deserialize pixel_target_expr string into dict"""
-        if 'AND NOT' in self.pixel_target_expr:
-            include_string, exclude_string = self.pixel_target_expr.split('AND NOT')
-        elif 'NOT' in self.pixel_target_expr:
-            include_string, exclude_string = self.pixel_target_expr.split('NOT')
-        elif self.pixel_target_expr:
-            include_string = self.pixel_target_expr
+        if not isinstance(self.pixel_target_expr, dict):
+            self.pixel_target_expr = self._parse_target_expr(self.pixel_target_expr)
+
+    @staticmethod
+    def _parse_target_expr(expr):
+        """Parse pixel_target_expr string into dict"""
+        if 'AND NOT' in expr:
+            include_string, exclude_string = expr.split('AND NOT')
+        elif 'NOT' in expr:
+            include_string, exclude_string = expr.split('NOT')
+        elif expr:
+            include_string = expr
             exclude_string = ''
         else:
             include_string = ''
@@ -158,7 +164,7 @@ class Strategy(Entity):
             include_operator = include_operator.group(0)
         if exclude_operator:
             exclude_operator = exclude_operator.group(0)
-        self.pixel_target_expr = {
+        return {
             'include': {
                 'pixels': [int(pix) for pix in PIXEL_PATTERN.findall(include_string)],
                 'operator': include_operator,
@@ -222,12 +228,26 @@ class Strategy(Entity):
         else:
             return include_string + exclude_string
 
-    def save(self, data=None, url=None):
-        """Save object to T1 accounting for fields an pixel target expr"""
-        if data is None:
-            data = self._properties.copy()
+    def get_changes(self):
+        """Return changed properties, with pixel_target_expr serialized.
+
+        The expression is compared to the original after parsing both, so
+        it's only sent if it changed.
+        """
+        changes = super(Strategy, self).get_changes()
+        if self.is_update and self.pixel_target_expr == self._parse_target_expr(
+                self._init_properties.get('pixel_target_expr') or ''):
+            changes.pop('pixel_target_expr', None)
+        else:
+            changes['pixel_target_expr'] = self._serialize_target_expr()
+        return changes
 
-        data['pixel_target_expr'] = self._serialize_target_expr()
+    def _save_payload(self, data=None):
+        """Data to save, accounting for fields and pixel target expr"""
+        if data is None:
+            data = self.get_changes()
+        else:
+            data['pixel_target_expr'] = self._serialize_target_expr()
 
         if getattr(self, 'use_campaign_start', False) and 'start_date' in data:
             self._properties.pop('start_date', None)
@@ -239,8 +259,10 @@ class Strategy(Entity):
             self._properties.pop('budget', None)
             data['budget'] = None
 
-        super(Strategy, self).save(data=data, url=url)
+        return super(Strategy, self)._save_payload(data)
 
+    def _after_save(self, properties):
+        super(Strategy, self)._after_save(properties)
         # Re-set the fields so that if the same object get saved, we
         # compare against the re-initialized values
         self._deserialize_target_expr()
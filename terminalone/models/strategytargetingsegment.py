@@ -32,7 +32,7 @@ class StrategyTargetingSegment(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(StrategyTargetingSegment, self).__init__(session, properties, **kwargs)
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('This object is not editable.')
 
     def remove(self):
@@ -39,6 +39,26 @@ class TargetDimension(SubEntity):
             self.include[index] = TargetValue(self.session,
                                               properties=ent_dict,
                                               environment=self.environment)
+        super(Entity, self).__setattr__('_original_targets', self._target_ids())
+
+    def _target_ids(self):
+        return tuple([location.id if isinstance(location, TargetValue)
+                      else location for location in group]
+                     for group in (self.include, self.exclude))
+
+    def get_changes(self):
+        """Return changed properties.
+
+        Include and exclude replace the dimension's targets, so if either
+        changed, both are returned in full, as lists of IDs.
+        """
+        changes = super(TargetDimension, self).get_changes()
+        changes.pop('include', None)
+        changes.pop('exclude', None)
+        include, exclude = self._target_ids()
+        if not self.is_update or (include, exclude) != self._original_targets:
+            changes.update(include=include, exclude=exclude)
+        return changes
 
     def save(self, data=None, **kwargs):
         """Saves the TargetDimension object.
@@ -48,22 +68,27 @@ class TargetDimension(SubEntity):
         if 'obj' in kwargs:
             warn('The obj flag is deprecated: please discontinue use.',
                  DeprecationWarning, stacklevel=2)
+        super(TargetDimension, self).save(data=data)
+
+    def _save_payload(self, data=None):
         if data is None:
-            data = {}
+            data = self.get_changes()
+            if not data:
+                return None
+        else:
+            data['include'], data['exclude'] = self._target_ids()
 
         data.update({
-            'exclude': [location.id if isinstance(location, TargetValue)
-                        else location for location in self.exclude],
-            'include': [location.id if isinstance(location, TargetValue)
-                        else location for location in self.include],
             # TargetDimension doesn't have a version associated.
             # But we want to use .save, rather than ._post.
             # As such, we need to have a version number included.
             # Setting it to None will make _validate_form_post yank it from the body
             'version': None,
         })
+        return super(TargetDimension, self)._save_payload(data)
 
-        super(TargetDimension, self).save(data=data)
+    def _after_save(self, properties):
+        super(TargetDimension, self)._after_save(properties)
         self._deserialize_targets()
 
     def add(self, group, target):
@@ -30,5 +30,5 @@ class TargetValue(Entity):
     def __init__(self, session, properties=None, **kwargs):
         super(TargetValue, self).__init__(session, properties, **kwargs)
 
-    def save(self, *args, **kwargs):
+    def _save_payload(self, *args, **kwargs):
         raise ClientError('TargetValues are not editable.')
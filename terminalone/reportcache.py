@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Provides on-disk cache for report metadata and results."""
+
+from __future__ import absolute_import
+import errno
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    _replace = os.replace
+except AttributeError:  # Python 2
+    def _replace(src, dst):
+        if os.name == 'nt' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+SUFFIXES = ('.csv', '.json')
+
+
+def default_directory():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'terminalone', 'reports')
+
+
+class ReportCache(object):
+    """Size-bounded, least recently used file cache for reports.
+
+    Entries are files named by a hash of their key. They are written to a
+    temporary file and renamed into place, so readers (in this or another
+    process) never see a partial entry. Last use is tracked with access
+    times, which `get` updates; modification times record when an entry
+    was stored, for the TTL.
+    """
+
+    def __init__(self, directory=None, max_size=1 << 30, ttl=86400):
+        """Set up cache.
+
+        :param directory: str directory to keep entries in. Default is
+            terminalone/reports under the user's cache directory
+        :param max_size: int maximum total size of entries in bytes; least
+            recently used are removed first
+        :param ttl: float seconds metadata entries are valid for. Results
+            of closed date ranges don't expire.
+        """
+        self.directory = directory or default_directory()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(self.directory)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                raise
+
+    @staticmethod
+    def key(*parts):
+        """Build key from JSON-serializable parts."""
+        blob = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key, suffix='.csv', ttl=None):
+        """Return path of a stored entry, or None if missing or expired.
+
+        :param ttl: float maximum age in seconds. Default never expires.
+        """
+        path = self._path(key, suffix)
+        now = time.time()
+        with self._lock:
+            try:
+                stored_on = os.path.getmtime(path)
+                if ttl is not None and now - stored_on > ttl:
+                    return None
+                os.utime(path, (now, stored_on))
+            except OSError:
+                return None
+        return path
+
+    def put(self, key, chunks, suffix='.csv'):
+        """Store an entry from an iterable of byte strings; return its path."""
+        path = self._path(key, suffix)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            with self._lock:
+                _replace(tmp, path)
+                self._evict(keep=path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def discard(self, key, suffix='.csv'):
+        try:
+            os.remove(self._path(key, suffix))
+        except OSError:
+            pass
+
+    def clear(self):
+        for _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def size(self):
+        return sum(stat.st_size for stat, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(SUFFIXES):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((os.stat(path), path))
+            except OSError:
+                pass
+        return entries
+
+    def _evict(self, keep):
+        """Remove least recently used entries until under max_size."""
+        entries = self._entries()
+        total = sum(stat.st_size for stat, _ in entries)
+        entries.sort(key=lambda entry: entry[0].st_atime)
+        for stat, path in entries:
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= stat.st_size
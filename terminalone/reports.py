@@ -3,19 +3,43 @@
 
 from __future__ import absolute_import, division
 import csv
+import gzip
+import io
+import json
+import mmap
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from itertools import chain, islice
+from time import sleep
+from requests.exceptions import RequestException
+from . import columns
 from .config import SERVICE_BASE_PATHS
 from .connection import Connection
 from .errors import ClientError, T1Error
-from .utils import compose
+from .reportcache import ReportCache, _replace
+from .retry import RetryPolicy, monotonic
+from .tracing import attributes, traced
+from .utils import bounded_map, compose
 from .vendor import six
 from .vendor.six.moves.urllib.parse import unquote, urlencode
 from .xmlparser import ParseError, XMLParser
 
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 if six.PY3:
     decode = True
 else:
     decode = False
 
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 
 class Report(Connection):
     """Object for pulling reports"""
@@ -31,11 +55,15 @@ class Report(Connection):
         'time_rollup': None,
     }
 
-    def __init__(self, session, report=None, properties=None, version=None, **kwargs):
+    def __init__(self, session, report=None, properties=None, version=None,
+                 report_cache=None, user_id=None, **kwargs):
         super(Report, self).__init__(_create_session=False, **kwargs)
         self.session = session
         self.parameters = {}
         self.version = version
+        self.report_cache = report_cache
+        # Cached data is only shared between sessions of the same user
+        self.user_id = user_id
 
         if report is not None:
             self.report = report
@@ -80,36 +108,43 @@ class Report(Connection):
         for field, value in six.iteritems(data):
             setattr(self, field, value)
 
-    def _get(self, path, params=None):
+    def _url(self, path):
+        if self.version == 'beta':
+            return '/'.join([self._base_url(), SERVICE_BASE_PATHS['reports-beta'], path])
+        return '/'.join([self._base_url(), SERVICE_BASE_PATHS['reports'], path])
+
+    def _get(self, path, params=None, _event=None):
         """Base method customized for the mix of JSON and XML
 
         :param path: str path to hit. Should not start with slash
         :param params: dict query string params
+        :param _event: dict request info to fire hooks with, if any
         """
-
-        if self.version == 'beta':
-            url = '/'.join(['https:/', self.api_base, SERVICE_BASE_PATHS['reports-beta'], path])
-        else:
-            url = '/'.join(['https:/', self.api_base, SERVICE_BASE_PATHS['reports'], path])
-
-        response = self.session.get(url, params=params, stream=True)
+        url = self._url(path)
+        if _event is None:
+            _event = self._request_info('GET', url, 'reports/' + path, params)
+        response = self._request('GET', url, params=params, stream=True,
+                                 _event=_event)
 
         if not response.ok:
-            try:
-                result = XMLParser(response.content)
-            except ParseError as exc:
-                self.response = response
-                raise ClientError('Could not parse XML response: {!r}'.format(exc))
-            raise T1Error(result, None)
+            self._raise_error(response)
 
         return response
 
+    def _raise_error(self, response):
+        try:
+            result = XMLParser(response.content)
+        except ParseError as exc:
+            self.response = response
+            raise ClientError('Could not parse XML response: {!r}'.format(exc))
+        raise T1Error(result, None)
+
     @property
     def metadata(self):
         """Fetch report metadata.
 
         If no report is given, fetches metadata for all reports.
-        Caches for future use.
+        Caches for future use, on disk too if there is a report cache.
         """
         if hasattr(self, '_metadata'):
             return self._metadata
@@ -119,29 +154,199 @@ class Report(Connection):
         else:
             path = 'meta'
 
-        res = self._get(path)
+        cache = self.report_cache
+        if cache is not None:
+            key = cache.key(self.api_base, self.user_id, self.version, path)
+            cached = cache.get(key, '.json', ttl=cache.ttl)
+            if cached is not None:
+                try:
+                    with io.open(cached, 'rb') as f:
+                        self._metadata = self.json_codec.loads(f.read())
+                    return self._metadata
+                except (IOError, OSError, ValueError):
+                    pass
+
+        event = self._request_info('GET', self._url(path), 'reports/' + path)
+        res = self._get(path, _event=event)
 
-        self._metadata = res.json()
+        if event is None:
+            self._metadata = self.json_codec.loads(res.content)
+        else:
+            started = monotonic()
+            content = res.content
+            parsed = monotonic()
+            self._metadata = self.json_codec.loads(content)
+            event.update(network_time=event['network_time'] + parsed - started,
+                         parse_time=monotonic() - parsed, bytes=len(content),
+                         entity_count=None)
+            self._fire('after_parse', event)
+        if cache is not None:
+            cache.put(key, [res.content], '.json')
         return self._metadata
 
-    def get(self, as_dict=False):
+    def _get_params(self):
+        """Serialize report parameters to query string values."""
+        params = {}
+        for key, value in six.iteritems(self.parameters):
+            if self._fields[key]:
+                params[key] = self._fields[key](value)
+            else:
+                params[key] = value
+        return params
+
+    @traced('Report.get', lambda self, *args, **kwargs: attributes(
+        t1_report=getattr(self, 'report', None)))
+    def get(self, as_dict=False, path=None):
         """Get report data. Returns tuple (headers, csv.Reader).
 
         If as_dict == True, return (headers, csv.DictReader).
+        If path is given, read data saved by `download` from that file
+        instead, through a memory map unless it is compressed.
         """
+        if path is not None:
+            return self._reader(_read_file(path), as_dict)
+
         if not hasattr(self, 'report'):
             raise ClientError("Can't run get without report!")
 
-        params = {}
-        for key, value in six.iteritems(self.parameters):
-            if self._fields[key]:
-                params[key] = self._fields[key](value)
-            else:
-                params[key] = value
+        iter_ = self._lines(self._get_data(self._get_params()))
+        return self._reader(iter_, as_dict)
+
+    def download(self, path, compress=None, chunk_size=1 << 20, retries=3):
+        """Save report data to a file, resuming interrupted downloads.
+
+        Raw bytes are streamed to `path` + ".part" in large chunks. If the
+        connection drops, or a previous call left a partial file, the
+        download continues from where it stopped with a Range request; if
+        the server ignores the range, it starts over. A partial file left
+        by a previous call is only resumed if it was for the same report
+        and parameters, and the server gave a validator (ETag or
+        Last-Modified), which is sent as If-Range; these are kept in
+        `path` + ".part.json". Once complete, the data is compressed if
+        asked and moved to `path`.
+
+        :param path: str file to write
+        :param compress: None, "gzip", or "zstd" (requires the zstandard
+            package)
+        :param chunk_size: int bytes to read and write at a time
+        :param retries: int times to resume after a dropped connection
+        :return: str path
+        :raise ClientError: if no report is set, or compress is unknown or
+            unavailable
+        """
+        if not hasattr(self, 'report'):
+            raise ClientError("Can't run get without report!")
+        if compress not in COMPRESSORS:
+            raise ClientError('compress must be one of {}'.format(
+                sorted(k for k in COMPRESSORS if k)))
+        if compress == 'zstd' and zstd is None:
+            raise ClientError('zstd compression requires the zstandard package')
+
+        part = path + '.part'
+        state = part + '.json'
+        url = self._url(self.report)
+        params = self._get_params()
+        key = ReportCache.key(url, params)
+        event = self._request_info('GET', url, 'reports/' + self.report, params)
+        validator = _read_part_state(state, key)
+        if validator is None:
+            _remove(part)
+        attempt = 0
+        while True:
+            offset = os.path.getsize(part) if os.path.exists(part) else 0
+            # Ranges are byte offsets of the body as sent, so ask for it as-is
+            headers = {'Accept-Encoding': 'identity'}
+            if offset:
+                headers['Range'] = 'bytes={}-'.format(offset)
+                if validator is not None:
+                    headers['If-Range'] = validator
+            response = self._request('GET', url, params=params,
+                                     headers=headers, stream=True,
+                                     _event=event)
+            if offset and response.status_code == 416:
+                response.close()  # nothing left to fetch
+                break
+            if not response.ok:
+                self._raise_error(response)
+            if response.status_code != 206 or not response.headers.get(
+                    'Content-Range', '').startswith('bytes {}-'.format(offset)):
+                offset = 0
+            # A server that encodes anyway can't be resumed by byte offset
+            resumable = response.headers.get(
+                'Content-Encoding', 'identity') == 'identity'
+            validator = (response.headers.get('ETag') or
+                         response.headers.get('Last-Modified'))
+            if not offset:
+                _write_part_state(state, key, validator)
+            try:
+                with open(part, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size):
+                        f.write(chunk)
+                break
+            except RequestException:
+                if attempt >= retries:
+                    raise
+                if not resumable:
+                    os.remove(part)
+                attempt += 1
+
+        COMPRESSORS[compress](part, path)
+        _remove(state)
+        return path
+
+    def _get_data(self, params):
+        """Request report data, through the disk cache for closed ranges.
 
-        iter_ = self._get(self.report,
-                          params=params).iter_lines(decode_unicode=decode)
+        Results for date ranges that ended before today can't change, so
+        with a report cache they are downloaded once, to disk, and read
+        from there, by the same user only. Anything else, including relative
+        time windows, is always requested.
 
+        :return: open binary file of cached data, or requests.Response
+        """
+        cache = self.report_cache
+        if (cache is None or self.user_id is None or
+                not self._is_closed(params)):
+            return self._get(self.report, params=params)
+
+        key = cache.key(self.api_base, self.user_id, self.version,
+                        self.report, params)
+        path = cache.get(key)
+        if path is not None:
+            try:
+                return io.open(path, 'rb')
+            except (IOError, OSError):  # evicted meanwhile
+                pass
+        response = self._get(self.report, params=params)
+        path = cache.put(key, response.iter_content(chunk_size=64 * 1024))
+        return io.open(path, 'rb')
+
+    @staticmethod
+    def _lines(data):
+        """Iterate over lines of report data from `_get_data`."""
+        if not isinstance(data, io.IOBase):
+            return data.iter_lines(decode_unicode=decode)
+        return _read_lines(data)
+
+    @staticmethod
+    def _binary(data):
+        """Binary file-like object over report data from `_get_data`."""
+        if isinstance(data, io.IOBase):
+            return data
+        data.raw.decode_content = True
+        return data.raw
+
+    def _is_closed(self, params):
+        """Whether params cover a date range that ended before today."""
+        if params.get('time_window') or not params.get('end_date'):
+            return False
+        try:
+            return self._to_date(params['end_date']) < date.today()
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _reader(iter_, as_dict):
         if as_dict:
             reader = csv.DictReader(iter_)
             headers = reader.fieldnames
@@ -150,3 +355,297 @@ class Report(Connection):
             headers = next(reader)
 
         return headers, reader
+
+    def get_sharded(self, days=7, shards=None, workers=4, as_dict=False,
+                    retries=2, progress=None):
+        """Get report data in shards fetched concurrently.
+
+        By default, splits the date range between `start_date` and
+        `end_date` (inclusive) into windows of `days` days. Each shard is
+        requested separately, up to `workers` at once on the shared session,
+        and retried on failure. Rows are returned in shard order, under a
+        single header, just like `get`.
+
+        :param days: int days per shard
+        :param shards: list of dicts of parameters overriding the report's
+            own for each shard, e.g. one filter per campaign, instead of
+            date windows
+        :param workers: int number of shards to fetch concurrently
+        :param as_dict: bool return a csv.DictReader, as `get` does
+        :param retries: int number of times to retry a failed shard
+        :param progress: callable taking (shards done, total shards,
+            shard parameters), called from worker threads as each shard
+            finishes downloading
+        :return: tuple (headers, csv.reader or csv.DictReader)
+        :raise ClientError: if no report is set, or no shards are given and
+            the report has no start_date and end_date
+        """
+        if not hasattr(self, 'report'):
+            raise ClientError("Can't run get without report!")
+        if shards is None:
+            shards = self._date_windows(days)
+        shards = list(shards)
+        if not shards:
+            raise ClientError('No shards to fetch')
+
+        params = self._get_params()
+        policy = self.retry or RetryPolicy(retries=retries)
+        lock = threading.Lock()
+        done = [0]
+
+        def fetch_shard(shard):
+            shard_params = dict(params)
+            for key, value in six.iteritems(shard):
+                serialize = self._fields.get(key)
+                shard_params[key] = serialize(value) if serialize else value
+            attempt = 0
+            while True:
+                try:
+                    lines = list(self._lines(self._get_data(shard_params)))
+                    break
+                except (RequestException, T1Error) as exc:
+                    if attempt >= retries or isinstance(exc, ClientError):
+                        raise
+                    sleep(policy.delay(attempt))
+                    attempt += 1
+            if progress is not None:
+                with lock:
+                    done[0] += 1
+                    progress(done[0], len(shards), shard)
+            return lines
+
+        # Skip empty bodies; the first non-empty shard provides the header
+        results = (lines for lines in bounded_map(fetch_shard, shards, workers)
+                   if lines)
+        first = next(results, [])
+        headers = first[:1]
+
+        def merged():
+            for lines in chain([first], results):
+                if lines[:1] != headers:
+                    raise ClientError('Shards returned different headers: '
+                                      '{!r}, {!r}'.format(headers, lines[:1]))
+                for line in islice(lines, 1, None):
+                    yield line
+
+        return self._reader(chain(headers, merged()), as_dict)
+
+    def _date_windows(self, days):
+        """Split start_date/end_date into consecutive windows of `days`."""
+        try:
+            start = self._to_date(self.parameters['start_date'])
+            end = self._to_date(self.parameters['end_date'])
+        except KeyError:
+            raise ClientError('Sharding by date needs start_date and end_date')
+        step = timedelta(days=days)
+        windows = []
+        while start <= end:
+            window_end = min(start + step - timedelta(days=1), end)
+            windows.append({'start_date': start.isoformat(),
+                            'end_date': window_end.isoformat()})
+            start = window_end + timedelta(days=1)
+        return windows
+
+    @staticmethod
+    def _to_date(value):
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+    def column_types(self, headers):
+        """Map report columns to NumPy dtype names, from report metadata.
+
+        Types come from `metadata['structure']`; start and end dates are
+        always dates, and anything not described is kept as strings.
+        """
+        types = {'start_date': 'date', 'end_date': 'date'}
+        structure = self.metadata.get('structure', {})
+        for section in six.itervalues(structure):
+            if not isinstance(section, dict):
+                continue
+            for name, info in six.iteritems(section):
+                if isinstance(info, dict) and 'type' in info:
+                    types[name] = info['type']
+        return OrderedDict(
+            (header, columns.REPORT_DTYPES.get(types.get(header), 'object'))
+            for header in headers)
+
+    def get_columns(self, chunk_size=None, as_dataframe=False):
+        """Get report data as typed columns.
+
+        Numbers and dates are converted as described by the report's
+        metadata (see `column_types`), a chunk of rows at a time.
+
+        :param chunk_size: int number of rows per chunk. Default reads the
+            whole report into one.
+        :param as_dataframe: bool return pandas DataFrames, read with
+            pandas' own CSV parser, rather than dicts of columns
+        :return: OrderedDict of column name => NumPy array (or list, without
+            NumPy), or DataFrame. If `chunk_size` is given, a generator of
+            them.
+        :raise ClientError: if no report is set, or as_dataframe is True
+            and pandas is not installed
+        """
+        if not hasattr(self, 'report'):
+            raise ClientError("Can't run get without report!")
+        if as_dataframe and columns.pd is None:
+            raise ClientError('as_dataframe requires the pandas package')
+
+        data = self._get_data(self._get_params())
+        if as_dataframe:
+            chunks = self._read_dataframes(self._binary(data), chunk_size)
+        else:
+            chunks = self._read_columns(self._lines(data), chunk_size)
+        if chunk_size is None:
+            return next(chunks)
+        return chunks
+
+    def _read_columns(self, lines, chunk_size):
+        reader = csv.reader(lines)
+        headers = next(reader)
+        dtypes = list(six.itervalues(self.column_types(headers)))
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows and chunk_size is not None:
+                return
+            values = list(zip(*rows)) or [()] * len(headers)
+            yield OrderedDict(
+                (header, columns.report_column(column, dtype))
+                for header, column, dtype in zip(headers, values, dtypes))
+            if chunk_size is None:
+                return
+
+    def _read_dataframes(self, source, chunk_size):
+        headers = next(csv.reader([source.readline().decode('utf-8')]))
+        dtypes = self.column_types(headers)
+        dates = [h for h, dtype in six.iteritems(dtypes)
+                 if dtype.startswith('datetime')]
+        # Integer columns are left to pandas, which reads them as floats
+        # only if they contain nulls
+        read_dtypes = dict((h, dtype) for h, dtype in six.iteritems(dtypes)
+                           if dtype in ('float64', 'object'))
+        frames = columns.pd.read_csv(source, names=headers, header=None,
+                                     dtype=read_dtypes, parse_dates=dates,
+                                     keep_default_na=False,
+                                     na_values={h: [''] for h in headers
+                                                if dtypes[h] != 'object'},
+                                     chunksize=chunk_size)
+        try:
+            if chunk_size is None:
+                yield frames
+            else:
+                for frame in frames:
+                    yield frame
+        finally:
+            source.close()
+
+
+def _read_lines(f):
+    """Iterate over lines of a binary file as Response.iter_lines does."""
+    with f:
+        for line in iter(f.readline, b''):
+            line = line.rstrip(b'\r\n')
+            yield line.decode('utf-8') if decode else line
+
+
+def _split_lines(chunks):
+    """Iterate over lines of a stream of byte chunks."""
+    pending = b''
+    for chunk in chunks:
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            line = line.rstrip(b'\r')
+            yield line.decode('utf-8') if decode else line
+    if pending:
+        yield pending.decode('utf-8') if decode else pending
+
+
+def _read_file(path):
+    """Iterate over lines of a file written by Report.download."""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return _read_lines(gzip.open(path, 'rb'))
+    if magic.startswith(ZSTD_MAGIC):
+        if zstd is None:
+            raise ClientError('Reading zstd files requires the zstandard package')
+        return _read_zstd(path)
+    return _read_mmap(path)
+
+
+def _read_zstd(path):
+    with open(path, 'rb') as f:
+        for line in _split_lines(zstd.ZstdDecompressor().read_to_iter(f)):
+            yield line
+
+
+def _read_mmap(path):
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for line in iter(mapped.readline, b''):
+                line = line.rstrip(b'\r\n')
+                yield line.decode('utf-8') if decode else line
+        finally:
+            mapped.close()
+
+
+def _read_part_state(state, key):
+    """Validator of a partial download, if it's for the request `key`."""
+    try:
+        with io.open(state, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(saved, dict) or saved.get('key') != key:
+        return None
+    return saved.get('validator')
+
+
+def _write_part_state(state, key, validator):
+    if validator is None:
+        _remove(state)
+        return
+    with io.open(state, 'w', encoding='utf-8') as f:
+        f.write(six.text_type(json.dumps({'key': key, 'validator': validator})))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _move(part, path):
+    _replace(part, path)
+
+
+def _gzip(part, path):
+    tmp = path + '.tmp'
+    with open(part, 'rb') as src:
+        with gzip.open(tmp, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    _replace(tmp, path)
+    os.remove(part)
+
+
+def _zstd(part, path):
+    tmp = path + '.tmp'
+    with open(part, 'rb') as src:
+        with open(tmp, 'wb') as dst:
+            zstd.ZstdCompressor().copy_stream(src, dst)
+    _replace(tmp, path)
+    os.remove(part)
+
+
+COMPRESSORS = {
+    None: _move,
+    'gzip': _gzip,
+    'zstd': _zstd,
+}
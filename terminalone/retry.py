@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Provides retry policy and client-side rate limiting for T1 requests."""
+
+from __future__ import absolute_import, division
+import random
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
+
+try:
+    monotonic = time.monotonic
+except AttributeError:  # Python 2
+    monotonic = time.time
+
+
+class RetryPolicy(object):
+    """Retry failed requests with exponential backoff and full jitter.
+
+    Idempotent requests (GET) are retried on throttling, gateway errors,
+    timeouts and dropped connections. Other requests (POST) are only retried
+    when the server can't have acted on them: throttled (429) responses and
+    connections that timed out before being established.
+    A `Retry-After` header, if sent, is waited out instead of the backoff;
+    if it asks for longer than `max_backoff`, the request isn't retried.
+    """
+
+    idempotent_methods = frozenset(['GET', 'HEAD', 'OPTIONS'])
+    retry_statuses = frozenset([429, 502, 503, 504])
+    unsafe_retry_statuses = frozenset([429])
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30.0):
+        """Set up retry policy.
+
+        :param retries: int maximum number of retries after the first attempt
+        :param backoff: float base delay in seconds; doubles every attempt
+        :param max_backoff: float cap on any single delay in seconds.
+            Responses asking to wait longer (Retry-After) aren't retried.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def should_retry(self, method, attempt, response=None, exc=None):
+        """Whether a request should be retried.
+
+        :param method: str HTTP method
+        :param attempt: int number of retries already made
+        :param response: requests.Response if one was received
+        :param exc: requests exception raised instead of a response
+        :return: bool
+        """
+        if attempt >= self.retries:
+            return False
+        idempotent = method.upper() in self.idempotent_methods
+        if exc is not None:
+            if idempotent:
+                return isinstance(exc, (ConnectionError, Timeout))
+            return isinstance(exc, ConnectTimeout)
+        if idempotent:
+            statuses = self.retry_statuses
+        else:
+            statuses = self.unsafe_retry_statuses
+        if response.status_code not in statuses:
+            return False
+        retry_after = self._retry_after(response)
+        return retry_after is None or retry_after <= self.max_backoff
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait before the next attempt."""
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        cap = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def _retry_after(response):
+        """Parse Retry-After header, in seconds or as an HTTP date."""
+        if response is None:
+            return None
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        parsed = parsedate_tz(value)
+        if parsed is None:
+            return None
+        return max(0.0, mktime_tz(parsed) - time.time())
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket limiting the rate of requests.
+
+    Share one instance between everything that should count against the
+    same limit; T1 passes its limiter to every entity it creates.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """Set up bucket.
+
+        :param rate: float tokens (requests) added per second
+        :param capacity: float maximum burst size. Defaults to `rate`,
+            and at least 1.
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take tokens from the bucket, blocking until they are available."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def try_acquire(self, tokens=1):
+        """Take tokens from the bucket if available, without blocking.
+
+        :return: float 0 if the tokens were taken, else seconds until they
+            may be, for callers that wait their own way (e.g. asyncio)
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
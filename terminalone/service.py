@@ -2,18 +2,57 @@
 """Provides service object for T1."""
 
 from __future__ import absolute_import, division
-from collections import Iterator
+from collections import Iterator, namedtuple
 from types import GeneratorType
-from .models import ACL
+from requests.exceptions import RequestException
+from . import models
+from .cache import EntityCache
+from .columns import to_columns
+from .compact import compact_class
 from .t1mappings import SINGULAR, CLASSES, CHILD_PATHS, MODEL_PATHS
 from .connection import Connection
 from .entity import Entity
-from .errors import ClientError
+from .errors import ClientError, T1Error, ValidationError
+from .hooks import Hooks
 from .reports import Report
-from .utils import filters
+from .reportcache import ReportCache
+from .retry import RetryPolicy, TokenBucket
+from .tracing import attributes, traced
+from .utils import bounded_map, filters
 from .vendor import six
 
 
+class SaveResult(namedtuple('SaveResult', ['entity', 'error'])):
+    """Outcome of saving one entity with `T1.save_many`.
+
+    `error` is the exception raised by the save, or None if it succeeded.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def conflict(self):
+        """Whether the entity was changed in T1 since it was retrieved."""
+        return (isinstance(self.error, ValidationError) and
+                'version' in (self.error.errors or {}))
+
+
+def _get_span_name(self, collection, *args, **kwargs):
+    return 'T1.get_all' if kwargs.get('get_all') else 'T1.get'
+
+
+def _get_span_attributes(self, collection, entity=None, child=None, *args,
+                         **kwargs):
+    return attributes(t1_collection=collection, t1_entity_id=entity,
+                      t1_child=child,
+                      t1_page_offset=kwargs.get('page_offset'),
+                      t1_page_limit=kwargs.get('page_limit'))
+
+
 def _detect_auth_method(username, password, session_id,
                         api_key, client_id, client_secret, token):
     if client_id is not None and client_secret is not None:
@@ -46,6 +85,15 @@ class T1(Connection):
                  access_token=None,
                  realm=None,
                  scope=None,
+                 streaming=False,
+                 json_codec=None,
+                 retry=None,
+                 rate_limit=None,
+                 cache=None,
+                 lazy=False,
+                 report_cache=None,
+                 hooks=None,
+                 tracer=None,
                  **kwargs):
         """Set up session for main service object.
 
@@ -60,7 +108,8 @@ class T1(Connection):
         :param environment: str to look up API Base to use. e.g. 'production'
             for https://api.mediamath.com/api/v2.0
         :param api_base: str API domain. should be the qualified domain name
-            without trailing slash. e.g. "api.mediamath.com".
+            without trailing slash. e.g. "api.mediamath.com". May include
+            a scheme, e.g. "http://localhost:8080" for a local mock server.
         :param json: bool use JSON header for serialization. Currently
             for internal experimentation, JSON will become the default in a
             future version.
@@ -75,6 +124,30 @@ class T1(Connection):
             set, a TokenUpdated warning will be raised when a token
             has been refreshed. This warning will carry the token
             in its token argument.
+        :param streaming: bool parse collection pages incrementally as they
+            are read off the socket, rather than loading each body first.
+            Errors in a page may then be raised while iterating over it.
+        :param json_codec: str name of JSON library to use, e.g. "orjson" or
+            "json". Defaults to the fastest installed. Shared with entities.
+        :param retry: bool/RetryPolicy retry throttled and failed requests
+            with exponential backoff. True uses the default RetryPolicy.
+        :param rate_limit: float/TokenBucket maximum requests per second,
+            shared by this session and every entity created from it.
+        :param cache: bool/EntityCache keep an identity map of entities
+            retrieved, so the same entity is always the same object, and
+            `get(collection, id)` is served locally while fresh. True uses
+            the default EntityCache.
+        :param lazy: bool convert properties of retrieved entities (e.g.
+            parse dates) on first access instead of up front.
+        :param report_cache: bool/ReportCache keep report metadata, and
+            results for date ranges that have ended, on disk. True uses the
+            default ReportCache.
+        :param hooks: terminalone.hooks.Hooks with callbacks to fire around
+            every request, shared with entities and reports. Defaults to an
+            empty registry, available as `hooks`.
+        :param tracer: terminalone.tracing.Tracer to record spans of calls
+            and their requests with, e.g. OpenTelemetryTracer. Default
+            records nothing.
         """
         self.auth_params = {}
         if auth_method is None:
@@ -108,9 +181,21 @@ class T1(Connection):
                 'password': password
             })
 
+        if retry is True:
+            retry = RetryPolicy()
+        if hooks is None:
+            hooks = Hooks()
+        if rate_limit is not None and not isinstance(rate_limit, TokenBucket):
+            rate_limit = TokenBucket(rate_limit)
+
         super(T1, self).__init__(environment, api_base=api_base,
                                  json=json,
                                  auth_params=self.auth_params,
+                                 json_codec=json_codec,
+                                 retry=retry or None,
+                                 rate_limiter=rate_limit,
+                                 hooks=hooks,
+                                 tracer=tracer,
                                  _create_session=True, **kwargs)
 
         self._authenticated = False
@@ -120,6 +205,16 @@ class T1(Connection):
         self.scope = scope
         self.json = json
         self.api_key = api_key
+        self.streaming = streaming
+        self.lazy = lazy
+        if cache is True:
+            cache = EntityCache()
+        elif cache is False:
+            cache = None
+        self.entity_cache = cache
+        if report_cache is True:
+            report_cache = ReportCache()
+        self.report_cache = report_cache or None
 
         if auth_method != 'oauth2' and auth_method != 'delayed':
             self.authenticate(auth_method, session_id=session_id, access_token=access_token)
@@ -167,15 +262,9 @@ class T1(Connection):
         ac = t1.new('atomic_creatives') OR even
         ac = t1.new(terminalone.models.AtomicCreative)
         """
-        if type(collection) == type and issubclass(collection, Entity):
-            ret = collection
-        elif '_acl' in collection:
-            ret = ACL
-        else:
-            try:
-                ret = SINGULAR[collection]
-            except KeyError:
-                ret = CLASSES[collection]
+        ret = self._get_class(collection)
+        settings = self._shared_settings()
+        settings.update(kwargs)
 
         if ret == Report:
             return ret(self.session,
@@ -183,18 +272,33 @@ class T1(Connection):
                        environment=self.environment,
                        api_base=self.api_base,
                        version=version,
-                       **kwargs)
+                       report_cache=self.report_cache,
+                       user_id=getattr(self, 'user_id', None),
+                       **settings)
 
+        settings.setdefault('lazy', self.lazy)
         return ret(self.session,
                    environment=self.environment,
                    api_base=self.api_base,
                    properties=properties,
                    json=self.json,
-                   *args, **kwargs)
+                   *args, **settings)
+
+    @staticmethod
+    def _get_class(collection):
+        """Look up model class for a collection or entity type."""
+        if type(collection) == type and issubclass(collection, Entity):
+            return collection
+        elif '_acl' in collection:
+            return models.ACL
+        try:
+            return SINGULAR[collection]
+        except KeyError:
+            return CLASSES[collection]
 
     def _return_class(self, ent_dict,
                       child=None, child_id=None,
-                      entity_id=None, collection=None):
+                      entity_id=None, collection=None, compact=False):
         """Generate item for new class instantiation."""
         ent_type = ent_dict.get('_type', ent_dict.get('type'))
         relations = ent_dict.get('relations')
@@ -211,17 +315,26 @@ class T1(Connection):
                 if isinstance(data, list):
                     ent_dict[rel_name] = []
                     for cls in data:
-                        ent_dict[rel_name].append(self._return_class(cls))
+                        ent_dict[rel_name].append(
+                            self._return_class(cls, compact=compact))
                 else:
-                    ent_dict[rel_name] = self._return_class(data)
+                    ent_dict[rel_name] = self._return_class(data,
+                                                            compact=compact)
             ent_dict.pop('relations', None)
-        return self.new(ent_type, properties=ent_dict)
-
-    def _gen_classes(self, entities, child, child_id, entity_id, collection):
+        if compact:
+            return compact_class(self._get_class(ent_type))(self, ent_dict)
+        ent = self.new(ent_type, properties=ent_dict)
+        if self.entity_cache is not None and child is None:
+            # Only the entity asked for by ID is complete, not its relations
+            ent = self.entity_cache.add(ent, fetched=entity_id is not None)
+        return ent
+
+    def _gen_classes(self, entities, child, child_id, entity_id, collection,
+                     compact=False):
         """Iterate over entities, returning objects for each."""
         for entity in entities:
             e = self._return_class(
-                entity, child, child_id, entity_id, collection)
+                entity, child, child_id, entity_id, collection, compact)
             yield e
 
     @staticmethod
@@ -315,6 +428,7 @@ class T1(Connection):
 
         return '/'.join(url), child_id
 
+    @traced(_get_span_name, _get_span_attributes)
     def get(self,
             collection,
             entity=None,
@@ -330,8 +444,12 @@ class T1(Connection):
             query=None,
             other_params={},
             count=False,
+            workers=None,
+            compact=False,
+            as_columns=False,
             _url=None,
-            _params=None):
+            _params=None,
+            _raw=False):
         """Main retrieval method for T1 Entities.
 
         :param collection: str T1 collection, e.g. "advertisers", "agencies"
@@ -354,12 +472,23 @@ class T1(Connection):
         :param other_params: optional dict of additional service
             specific params
         :param count: bool return the number of entities as a second parameter
+        :param workers: int number of pages to fetch concurrently when
+            `get_all` is True. Pages share the session's connection pool and
+            entities are still yielded in order. Default fetches sequentially.
+        :param compact: bool return read-only CompactEntity objects, which
+            keep properties in slots and take a fraction of the memory.
+            See terminalone.compact. Not stored in the entity cache.
+        :param as_columns: bool return properties as an OrderedDict of typed
+            column arrays instead of entity objects, with the whole
+            collection if `get_all` is True. See terminalone.columns.
         :param _url: str shortcut to bypass URL determination.
         :param _params: dict query string parameters to bypass
             query determination
+        :param _raw: bool return parser output instead of entity objects
         :return: If:
             Collection is requested => generator over collection of entity
                 objects
+            `as_columns` is True => OrderedDict of columns
             Entity ID is provided => Entity object
             `count` is True => number of entities as second return val
         :raise ClientError: if page_limit > 100
@@ -367,6 +496,14 @@ class T1(Connection):
         if type(collection) == type and issubclass(collection, Entity):
             collection = MODEL_PATHS[collection]
 
+        if (self.entity_cache is not None and entity is not None and
+                not get_all and _url is None and _params is None and
+                not any([child, limit, include, full, other_params, compact,
+                         as_columns, _raw])):
+            cached = self.entity_cache.get(collection, entity)
+            if cached is not None:
+                return cached
+
         child_id = None
         if _url is None:
             _url, child_id = self._construct_url(
@@ -387,11 +524,17 @@ class T1(Connection):
                                 query=query,
                                 page_limit=page_limit,
                                 count=count,
+                                workers=workers,
+                                compact=compact,
                                 other_params=other_params,
                                 _params=_params,
-                                _url=_url)
+                                _url=_url,
+                                _raw=_raw or as_columns)
             if count:
                 ent_count = next(gen)
+            if as_columns:
+                gen = to_columns(gen, self._get_class)
+            if count:
                 return gen, ent_count
             else:
                 return gen
@@ -407,10 +550,18 @@ class T1(Connection):
                                              query=query,
                                              other_params=other_params)
 
+        # Streaming parsers may only learn the count after the last entity
         entities, ent_count = super(T1, self)._get(
-            self._get_service_path(collection), _url, params=_params)
-
-        if not isinstance(
+            self._get_service_path(collection), _url, params=_params,
+            stream=self.streaming and not count)
+
+        if _raw:
+            ent_gen = entities
+        elif as_columns:
+            if isinstance(entities, dict):
+                entities = [entities]
+            ent_gen = to_columns(entities, self._get_class)
+        elif not isinstance(
             entities, GeneratorType
         ) and not isinstance(
             entities, Iterator
@@ -419,10 +570,11 @@ class T1(Connection):
                                       child,
                                       child_id,
                                       entity,
-                                      collection)
-
-        ent_gen = self._gen_classes(
-            entities, child, child_id, entity, collection)
+                                      collection,
+                                      compact)
+        else:
+            ent_gen = self._gen_classes(
+                entities, child, child_id, entity, collection, compact)
         if count:
             return ent_gen, ent_count
         else:
@@ -439,7 +591,8 @@ class T1(Connection):
     def _get_all(self, collection, **kwargs):
         """Construct iterator to get all entities in a collection.
 
-        Pages over 100 entities.
+        Pages over 100 entities. The total count is known after the first
+        probe, so with `workers` the remaining pages are fetched concurrently.
         This method should not be called directly: it's called from T1.get.
         """
         num_to_fetch = kwargs.get('page_limit', 100)
@@ -456,7 +609,8 @@ class T1(Connection):
 
         if kwargs.get('count'):
             yield num_recs
-        for page_offset in six.moves.range(0, num_recs, num_to_fetch):
+
+        def fetch_page(page_offset):
             # get_all=False, otherwise we could go in a loop
             gen = self.get(collection,
                            _url=kwargs['_url'],
@@ -469,10 +623,25 @@ class T1(Connection):
                            parent=kwargs.get('parent'),
                            query=kwargs.get('query'),
                            other_params=kwargs.get('other_params'),
-                           get_all=False)
-            if not isinstance(gen, GeneratorType):
+                           compact=kwargs.get('compact'),
+                           get_all=False,
+                           _raw=kwargs.get('_raw'))
+            if not isinstance(gen, (GeneratorType, Iterator, list)):
                 gen = iter([gen])
-            for item in gen:
+            return gen
+
+        page_offsets = six.moves.range(0, num_recs, num_to_fetch)
+        workers = kwargs.get('workers')
+        if workers is not None and workers > 1:
+            # Page generators are lazy, so drain each one inside its worker.
+            pages = bounded_map(
+                self.tracer.wrap(lambda offset: list(fetch_page(offset))),
+                page_offsets, workers)
+        else:
+            pages = six.moves.map(fetch_page, page_offsets)
+
+        for page in pages:
+            for item in page:
                 yield item
 
     # def get_sub(self, collection, entity, sub, *args):
@@ -490,6 +659,8 @@ class T1(Connection):
             val = "0"
         return val
 
+    @traced('T1.find', lambda self, collection, *args, **kwargs:
+            attributes(t1_collection=collection))
     def find(self, collection, variable, operator, candidates, **kwargs):
         """Find objects based on query criteria.
 
@@ -508,15 +679,114 @@ class T1(Connection):
         :return: generator over collection of objects matching query
         :raise TypeError: if operator is IN and candidates not provided as list
         """
+        query = self._construct_query(variable, operator, candidates)
+        return self.get(collection, query=query, **kwargs)
+
+    def get_many(self, collection, ids, chunk_size=100, workers=4,
+                 ordered=False, **kwargs):
+        """Retrieve entities by ID, however many IDs there are.
+
+        IDs are de-duplicated and split into chunks, each fetched with a
+        single `IN` query (see `find`) so URLs stay short, with up to
+        `workers` chunks in flight at once. IDs that don't match an entity
+        are skipped.
+
+        :param collection: str T1 collection, e.g. "advertisers", "agencies"
+        :param ids: iterable of int IDs
+        :param chunk_size: int IDs per request, 100 max
+        :param workers: int number of chunks to fetch concurrently
+        :param ordered: bool yield entities in the order of `ids`. Default
+            yields each chunk's entities as soon as it arrives.
+        :param kwargs: additional keyword args to pass on to T1.get, e.g.
+            include, full. See that method's signature for details.
+        :return: generator over entity objects
+        :raise ClientError: if chunk_size > 100
+        """
+        if chunk_size > 100:
+            raise ClientError('chunk_size must be <= 100')
+        if type(collection) == type and issubclass(collection, Entity):
+            collection = MODEL_PATHS[collection]
+        for key in ('entity', 'query', 'page_limit', 'page_offset',
+                    'get_all', 'count'):
+            kwargs.pop(key, None)
+
+        def fetch_chunk(chunk):
+            query = self._construct_query(None, filters.IN, chunk)
+            ents = self.get(collection, query=query, page_limit=len(chunk),
+                            **kwargs)
+            if isinstance(ents, Entity):
+                ents = [ents]
+            found = dict((str(ent.id), ent) for ent in ents)
+            # Return chunk's entities in the order they were asked for
+            return [found[key] for key in chunk if key in found]
+
+        chunks = self._chunk_ids(ids, chunk_size)
+        if workers is not None and workers > 1:
+            results = bounded_map(self.tracer.wrap(fetch_chunk), chunks,
+                                  workers, ordered=ordered)
+        else:
+            results = six.moves.map(fetch_chunk, chunks)
+
+        for result in results:
+            for ent in result:
+                yield ent
+
+    @staticmethod
+    def _chunk_ids(ids, chunk_size):
+        """Yield lists of unique IDs, as strings, of at most chunk_size."""
+        seen = set()
+        chunk = []
+        for ent_id in ids:
+            key = str(ent_id)
+            if key in seen:
+                continue
+            seen.add(key)
+            chunk.append(key)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def save_many(self, entities, workers=4):
+        """Save many entities concurrently.
+
+        Each entity is saved as with `Entity.save`, with up to `workers`
+        saves in flight at once, and updated from the response. A failed
+        save doesn't stop the others: its exception is kept in the result.
+        Saves rejected because the entity's version is out of date (it was
+        changed in T1 since it was retrieved) are flagged as conflicts, to
+        be re-fetched and retried by the caller.
+
+        :param entities: iterable of entity objects
+        :param workers: int number of concurrent saves
+        :return: list of SaveResult(entity, error), in the order given
+        """
+        def save(item):
+            index, entity = item
+            try:
+                entity.save()
+            except (T1Error, RequestException) as exc:
+                return index, SaveResult(entity, exc)
+            return index, SaveResult(entity, None)
+
+        items = enumerate(entities)
+        if workers is not None and workers > 1:
+            results = bounded_map(self.tracer.wrap(save), items, workers,
+                                  ordered=False)
+        else:
+            results = six.moves.map(save, items)
+        return [result for _, result in sorted(results, key=lambda r: r[0])]
+
+    @classmethod
+    def _construct_query(cls, variable, operator, candidates):
+        """Construct `q` query string for find."""
         if operator == filters.IN:
             if not isinstance(candidates, list):
                 raise TypeError(
                     '`candidates` must be list of entities for `IN`')
-            query = '(' + ','.join(str(c) for c in candidates) + ')'
-        else:
-            query = operator.join(
-                [variable, self._parse_candidate(candidates)])
-        return self.get(collection, query=query, **kwargs)
+            return '(' + ','.join(str(c) for c in candidates) + ')'
+        return operator.join([variable, cls._parse_candidate(candidates)])
 
 
 T1Service = T1
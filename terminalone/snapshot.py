@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""Provides local SQLite snapshots of T1 collections, synced incrementally.
+
+Each collection is kept in its own SQLite file, in a table of the same
+name with a column per `_pull` property. The first sync pulls the whole
+collection; later syncs ask only for entities updated since the latest
+`updated_on` already stored, and upsert them.
+"""
+
+from __future__ import absolute_import
+import errno
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from itertools import islice
+from . import columns, t1types
+from .entity import Entity
+from .errors import ClientError
+from .t1mappings import MODEL_PATHS
+from .utils import filters
+from .vendor import six
+
+SQL_TYPES = {
+    'int64': 'INTEGER',
+    'float64': 'REAL',
+    'bool': 'INTEGER',
+    'datetime64[us]': 'TEXT',
+}
+
+HIGH_WATER_MARK = 'updated_on'
+
+
+class SnapshotStore(object):
+    """Local copies of T1 collections, one SQLite file per collection.
+
+    Usage:
+        store = SnapshotStore(t1, 'snapshots')
+        store.sync('campaigns')
+        active = list(store.query('campaigns', 'status = ?', (1,)))
+    """
+
+    def __init__(self, t1, directory, batch_size=1000):
+        """Set up store.
+
+        :param t1: T1 service object to fetch entities with
+        :param directory: str directory to keep SQLite files in
+        :param batch_size: int number of entities to upsert at a time
+        """
+        self.t1 = t1
+        self.directory = directory
+        self.batch_size = batch_size
+        try:
+            os.makedirs(directory)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                raise
+
+    def path(self, collection):
+        """Return path of the SQLite file for a collection."""
+        return os.path.join(self.directory,
+                            self._collection(collection) + '.sqlite')
+
+    def connect(self, collection):
+        """Open the SQLite file for a collection, for queries of your own.
+
+        Rows are returned as `sqlite3.Row`.
+        """
+        conn = sqlite3.connect(self.path(collection))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def sync(self, collection, full=False, **kwargs):
+        """Bring the local copy of a collection up to date.
+
+        Asks for entities with `updated_on` at or after the latest stored
+        value (the high-water mark), so that entities updated in the same
+        second as the last one seen aren't missed; re-fetched ones are
+        simply replaced. Collections without `updated_on` are always
+        pulled in full. All changes are committed at once, so an
+        interrupted sync leaves the previous snapshot intact.
+
+        :param collection: str T1 collection, e.g. "campaigns", or model
+        :param full: bool pull the whole collection even if a snapshot exists
+        :param kwargs: additional keyword args to pass on to T1.get, e.g.
+            page_limit
+        :return: int number of entities stored
+        """
+        collection = self._collection(collection)
+        model = self.t1._get_class(collection)
+        fields = sorted(model._pull)
+        for key in ('query', 'get_all', 'count', 'compact', 'as_columns'):
+            kwargs.pop(key, None)
+
+        with closing(self.connect(collection)) as conn:
+            self._ensure_table(conn, collection, model, fields)
+            mark = None
+            if not full and HIGH_WATER_MARK in model._pull:
+                mark = conn.execute('SELECT MAX({}) FROM {}'.format(
+                    _quote(HIGH_WATER_MARK), _quote(collection))).fetchone()[0]
+            if mark is not None:
+                kwargs['query'] = self.t1._construct_query(
+                    HIGH_WATER_MARK, filters.GREATER_OR_EQUAL, mark)
+
+            ents = self.t1.get(collection, get_all=True, compact=True, **kwargs)
+            if isinstance(ents, tuple):
+                ents = ents[0]
+            sql = 'INSERT OR REPLACE INTO {} ({}) VALUES ({})'.format(
+                _quote(collection), ', '.join(_quote(f) for f in fields),
+                ', '.join('?' for _ in fields))
+            stored = 0
+            with conn:
+                while True:
+                    batch = list(islice(ents, self.batch_size))
+                    if not batch:
+                        break
+                    conn.executemany(sql, (_row(ent, fields) for ent in batch))
+                    stored += len(batch)
+        return stored
+
+    def high_water_mark(self, collection):
+        """Return latest `updated_on` stored for a collection, or None."""
+        collection = self._collection(collection)
+        if not os.path.exists(self.path(collection)):
+            return None
+        with closing(self.connect(collection)) as conn:
+            try:
+                mark = conn.execute('SELECT MAX({}) FROM {}'.format(
+                    _quote(HIGH_WATER_MARK), _quote(collection))).fetchone()[0]
+            except sqlite3.OperationalError:  # no table or column
+                return None
+        return t1types.strpt(mark) if mark is not None else None
+
+    def query(self, collection, where=None, params=(), order_by=None,
+              limit=None):
+        """Query the local copy of a collection.
+
+        :param collection: str T1 collection, e.g. "campaigns", or model
+        :param where: str SQL condition, e.g. "advertiser_id = ?"
+        :param params: sequence of values for placeholders in `where`
+        :param order_by: str SQL ordering, e.g. "updated_on DESC"
+        :param limit: int maximum number of entities
+        :return: generator over entity objects
+        :raise ClientError: if the collection hasn't been synced
+        """
+        collection = self._collection(collection)
+        if not os.path.exists(self.path(collection)):
+            raise ClientError('No snapshot of {}; sync it first'.format(
+                collection))
+        sql = 'SELECT * FROM {}'.format(_quote(collection))
+        if where:
+            sql += ' WHERE ' + where
+        if order_by:
+            sql += ' ORDER BY ' + order_by
+        if limit is not None:
+            sql += ' LIMIT {:d}'.format(limit)
+
+        with closing(self.connect(collection)) as conn:
+            for row in conn.execute(sql, params):
+                properties = dict((key, row[key]) for key in row.keys()
+                                  if row[key] is not None)
+                yield self.t1.new(collection, properties=properties)
+
+    @staticmethod
+    def _collection(collection):
+        if type(collection) == type and issubclass(collection, Entity):
+            return MODEL_PATHS[collection]
+        return collection
+
+    @staticmethod
+    def _ensure_table(conn, collection, model, fields):
+        """Create table and indexes, adding columns for new properties."""
+        table = _quote(collection)
+        definitions = []
+        for field in fields:
+            sql_type = SQL_TYPES.get(columns.dtype_for(model._pull[field]),
+                                     'TEXT')
+            if field == 'id':
+                sql_type += ' PRIMARY KEY'
+            definitions.append('{} {}'.format(_quote(field), sql_type))
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS {} ({})'.format(
+                table, ', '.join(definitions)))
+            existing = set(row[1] for row in conn.execute(
+                'PRAGMA table_info({})'.format(table)))
+            for field, definition in zip(fields, definitions):
+                if field not in existing:
+                    conn.execute('ALTER TABLE {} ADD COLUMN {}'.format(
+                        table, definition))
+            for field in fields:
+                if field == HIGH_WATER_MARK or field.endswith('_id'):
+                    conn.execute('CREATE INDEX IF NOT EXISTS {} ON {} ({})'.format(
+                        _quote('{}_{}'.format(collection, field)), table,
+                        _quote(field)))
+
+
+def _quote(identifier):
+    return '"{}"'.format(identifier.replace('"', '""'))
+
+
+def _row(entity, fields):
+    properties = entity.get_properties()
+    return [_sql_value(properties.get(field)) for field in fields]
+
+
+def _sql_value(value):
+    """Convert a property to a value SQLite stores and T1 can parse back.
+
+    Dates are stored as UTC ISO strings so that they sort correctly.
+    """
+    if value is None or isinstance(value, (six.integer_types, float)):
+        return value
+    if isinstance(value, datetime):
+        return t1types.strft(columns._naive_utc(value))
+    if isinstance(value, six.binary_type):
+        return value.decode('utf-8')
+    return six.text_type(value)
@@ -1,114 +1,184 @@
 # -*- coding: utf-8 -*-
-"""Provides lookup dicts for t1 classes and child paths."""
+"""Provides lookup dicts for t1 classes and child paths.
+
+CLASSES, SINGULAR and MODEL_PATHS are read-only mappings that import each
+model class on first lookup (see `terminalone.models`).
+"""
 from __future__ import absolute_import
 
+from . import models
 from .reports import Report
-from .models import *
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+
+class _ModelMapping(Mapping):
+    """Mapping of names to model classes, given by class name."""
+
+    def __init__(self, names):
+        self._names = names
+
+    def __getitem__(self, key):
+        name = self._names[key]
+        if name == 'Report':
+            return Report
+        return getattr(models, name)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, key):
+        try:
+            return key in self._names
+        except TypeError:  # unhashable
+            return False
+
+
+class _ModelPaths(Mapping):
+    """Mapping of model classes to collection names.
+
+    Resolves every class in `classes` on first lookup, since a class may
+    be known by several names (e.g. PixelBundle is Pixel).
+    """
+
+    def __init__(self, classes):
+        self._classes = classes
+        self._paths = None
+
+    @property
+    def _by_class(self):
+        if self._paths is None:
+            # Where a class serves several collections, the last one wins
+            self._paths = dict((self._classes[path], path)
+                               for path in self._classes)
+        return self._paths
+
+    def __getitem__(self, model):
+        try:
+            return self._by_class[model]
+        except TypeError:  # unhashable
+            raise KeyError(model)
+
+    def __iter__(self):
+        return iter(self._by_class)
+
+    def __len__(self):
+        return len(self._by_class)
+
 
 CLASSES = {
-    'ad_servers': AdServer,
-    'advertisers': Advertiser,
-    'agencies': Agency,
-    'atomic_creatives': AtomicCreative,
-    'audience_segments': AudienceSegment,
-    'budget_flights': BudgetFlight,
-    'campaigns': Campaign,
-    'concepts': Concept,
-    'contacts': Contact,
-    'contracts': Contract,
-    'creative_approvals': CreativeApproval,
-    'creatives': Creative,
-    'deals': Deal,
-    'organizations': Organization,
-    'permissions': Permission,
-    'pixel_bundles': PixelBundle,
-    'pixel_providers': PixelProvider,
-    'pixels': ChildPixel,
-    'placement_slots': PlacementSlot,
-    'publisher_sites': PublisherSite,
-    'publishers': Publisher,
-    'reports': Report,
-    'retired_audience_segments': RetiredAudienceSegment,
-    'retired_strategy_audience_segments': RetiredStrategyAudienceSegment,
-    'rmx_strategies': RMXStrategy,
-    'rmx_strategy_roi_target_pixels': RMXStrategyROITargetPixel,
-    'seats': Seat,
-    'site_lists': SiteList,
-    'site_placements': SitePlacement,
-    'strategies': Strategy,
-    'strategy_audience_segments': StrategyAudienceSegment,
-    'strategy_concepts': StrategyConcept,
-    'strategy_deals': StrategyDeal,
-    'strategy_day_parts': StrategyDayPart,
-    'strategy_domain_restrictions': StrategyDomain,
-    'strategy_supply_sources': StrategySupplySource,
-    'strategy_targeting_segments': StrategyTargetingSegment,
-    'supply_sources': SupplySource,
-    'target_dimensions': TargetDimension,
-    'target_values': TargetValue,
-    'target_value_counts': TargetValue,
-    'users': User,
-    'vendor_contracts': VendorContract,
-    'vendor_domains': VendorDomain,
-    'vendor_pixel_domains': VendorPixelDomain,
-    'vendor_pixels': VendorPixel,
-    'vendors': Vendor,
-    'verticals': Vertical,
+    'ad_servers': 'AdServer',
+    'advertisers': 'Advertiser',
+    'agencies': 'Agency',
+    'atomic_creatives': 'AtomicCreative',
+    'audience_segments': 'AudienceSegment',
+    'budget_flights': 'BudgetFlight',
+    'campaigns': 'Campaign',
+    'concepts': 'Concept',
+    'contacts': 'Contact',
+    'contracts': 'Contract',
+    'creative_approvals': 'CreativeApproval',
+    'creatives': 'Creative',
+    'deals': 'Deal',
+    'organizations': 'Organization',
+    'permissions': 'Permission',
+    'pixel_bundles': 'PixelBundle',
+    'pixel_providers': 'PixelProvider',
+    'pixels': 'ChildPixel',
+    'placement_slots': 'PlacementSlot',
+    'publisher_sites': 'PublisherSite',
+    'publishers': 'Publisher',
+    'reports': 'Report',
+    'retired_audience_segments': 'RetiredAudienceSegment',
+    'retired_strategy_audience_segments': 'RetiredStrategyAudienceSegment',
+    'rmx_strategies': 'RMXStrategy',
+    'rmx_strategy_roi_target_pixels': 'RMXStrategyROITargetPixel',
+    'seats': 'Seat',
+    'site_lists': 'SiteList',
+    'site_placements': 'SitePlacement',
+    'strategies': 'Strategy',
+    'strategy_audience_segments': 'StrategyAudienceSegment',
+    'strategy_concepts': 'StrategyConcept',
+    'strategy_deals': 'StrategyDeal',
+    'strategy_day_parts': 'StrategyDayPart',
+    'strategy_domain_restrictions': 'StrategyDomain',
+    'strategy_supply_sources': 'StrategySupplySource',
+    'strategy_targeting_segments': 'StrategyTargetingSegment',
+    'supply_sources': 'SupplySource',
+    'target_dimensions': 'TargetDimension',
+    'target_values': 'TargetValue',
+    'target_value_counts': 'TargetValue',
+    'users': 'User',
+    'vendor_contracts': 'VendorContract',
+    'vendor_domains': 'VendorDomain',
+    'vendor_pixel_domains': 'VendorPixelDomain',
+    'vendor_pixels': 'VendorPixel',
+    'vendors': 'Vendor',
+    'verticals': 'Vertical',
 }
 
-MODEL_PATHS = {v: k for k, v in CLASSES.items()}
 
 SINGULAR = {
-    'ad_server': AdServer,
-    'advertiser': Advertiser,
-    'agency': Agency,
-    'atomic_creative': AtomicCreative,
-    'audience_segment': AudienceSegment,
-    'budget_flight': BudgetFlight,
-    'campaign': Campaign,
-    'concept': Concept,
-    'contact': Contact,
-    'contract': Contract,
-    'creative': Creative,
-    'creative_approval': CreativeApproval,
-    'deal': Deal,
-    'organization': Organization,
-    'permission': Permission,
-    'pixel': ChildPixel,
-    'pixel_bundle': PixelBundle,
-    'pixel_provider': PixelProvider,
-    'placement_slot': PlacementSlot,
-    'publisher': Publisher,
-    'publisher_site': PublisherSite,
-    'report': Report,
-    'retired_audience_segment': RetiredAudienceSegment,
-    'retired_strategy_audience_segment': RetiredStrategyAudienceSegment,
-    'rmx_strategy': RMXStrategy,
-    'rmx_strategy_roi_target_pixel': RMXStrategyROITargetPixel,
-    'seat': Seat,
-    'site_list': SiteList,
-    'site_placement': SitePlacement,
-    'strategy': Strategy,
-    'strategy_audience_segment': StrategyAudienceSegment,
-    'strategy_concept': StrategyConcept,
-    'strategy_deal': StrategyDeal,
-    'strategy_day_part': StrategyDayPart,
-    'strategy_domain_restriction': StrategyDomain,
-    'strategy_supply_source': StrategySupplySource,
-    'strategy_targeting_segment': StrategyTargetingSegment,
-    'supply_source': SupplySource,
-    'target_dimension': TargetDimension,
-    'target_value': TargetValue,
-    'target_value_count': TargetValue,
-    'user': User,
-    'vendor': Vendor,
-    'vendor_contract': VendorContract,
-    'vendor_domain': VendorDomain,
-    'vendor_pixel': VendorPixel,
-    'vendor_pixel_domain': VendorPixelDomain,
-    'vertical': Vertical,
+    'ad_server': 'AdServer',
+    'advertiser': 'Advertiser',
+    'agency': 'Agency',
+    'atomic_creative': 'AtomicCreative',
+    'audience_segment': 'AudienceSegment',
+    'budget_flight': 'BudgetFlight',
+    'campaign': 'Campaign',
+    'concept': 'Concept',
+    'contact': 'Contact',
+    'contract': 'Contract',
+    'creative': 'Creative',
+    'creative_approval': 'CreativeApproval',
+    'deal': 'Deal',
+    'organization': 'Organization',
+    'permission': 'Permission',
+    'pixel': 'ChildPixel',
+    'pixel_bundle': 'PixelBundle',
+    'pixel_provider': 'PixelProvider',
+    'placement_slot': 'PlacementSlot',
+    'publisher': 'Publisher',
+    'publisher_site': 'PublisherSite',
+    'report': 'Report',
+    'retired_audience_segment': 'RetiredAudienceSegment',
+    'retired_strategy_audience_segment': 'RetiredStrategyAudienceSegment',
+    'rmx_strategy': 'RMXStrategy',
+    'rmx_strategy_roi_target_pixel': 'RMXStrategyROITargetPixel',
+    'seat': 'Seat',
+    'site_list': 'SiteList',
+    'site_placement': 'SitePlacement',
+    'strategy': 'Strategy',
+    'strategy_audience_segment': 'StrategyAudienceSegment',
+    'strategy_concept': 'StrategyConcept',
+    'strategy_deal': 'StrategyDeal',
+    'strategy_day_part': 'StrategyDayPart',
+    'strategy_domain_restriction': 'StrategyDomain',
+    'strategy_supply_source': 'StrategySupplySource',
+    'strategy_targeting_segment': 'StrategyTargetingSegment',
+    'supply_source': 'SupplySource',
+    'target_dimension': 'TargetDimension',
+    'target_value': 'TargetValue',
+    'target_value_count': 'TargetValue',
+    'user': 'User',
+    'vendor': 'Vendor',
+    'vendor_contract': 'VendorContract',
+    'vendor_domain': 'VendorDomain',
+    'vendor_pixel': 'VendorPixel',
+    'vendor_pixel_domain': 'VendorPixelDomain',
+    'vertical': 'Vertical',
 }
 
+CLASSES = _ModelMapping(CLASSES)
+SINGULAR = _ModelMapping(SINGULAR)
+MODEL_PATHS = _ModelPaths(CLASSES)
+
 CHILD_PATHS = {
     'acl': ('acl', 0),
     'audience_segments': ('audience_segments', 0),
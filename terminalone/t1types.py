@@ -48,24 +48,76 @@ def default_empty(default):
     return get_value
 
 
+OFFSET_RE = re.compile('([-+][0-9:]+$)')
+_FAST_OFFSET_RE = re.compile(r'[-+][0-9]{2}:?[0-9]{2}$')
+_OFFSETS = {}
+_FIXED_OFFSETS = {}
+
+try:
+    _fromisoformat = datetime.fromisoformat
+except AttributeError:  # Python < 3.7
+    def _fromisoformat(dt_string):
+        # Only called on strings of form YYYY-MM-DDTHH:MM:SS
+        if not (dt_string[0:4] + dt_string[5:7] + dt_string[8:10] +
+                dt_string[11:13] + dt_string[14:16] +
+                dt_string[17:19]).isdigit():
+            raise ValueError(dt_string)
+        return datetime(int(dt_string[0:4]), int(dt_string[5:7]),
+                        int(dt_string[8:10]), int(dt_string[11:13]),
+                        int(dt_string[14:16]), int(dt_string[17:19]))
+
+
+def _offset_minutes(offset_str):
+    offset_str = offset_str.replace(':', '')
+    offset = int(offset_str[-4:-2]) * 60 + int(offset_str[-2:])
+    if offset_str[0] == "-":
+        offset = -offset
+    return offset
+
+
+def _tzinfo(offset_str):
+    """Return shared FixedOffset for an offset string like "+00:00"."""
+    tz = _OFFSETS.get(offset_str)
+    if tz is None:
+        minutes = _offset_minutes(offset_str)
+        tz = _FIXED_OFFSETS.get(minutes)
+        if tz is None:
+            tz = _FIXED_OFFSETS[minutes] = FixedOffset(minutes)
+        _OFFSETS[offset_str] = tz
+    return tz
+
+
 def strpt(dt_string):
     """Convert ISO string time to datetime.datetime. No-op on datetimes"""
     # 2016-11-07T09:07:57
     # 2016-11-07T09:07:57+0000
     # 2016-11-16T12:31:10+00:00
-    offset_re = re.compile('([-+][0-9:]+$)')
     if isinstance(dt_string, datetime):
         return dt_string
     if dt_string == 'now':
         return datetime.now()
 
-    matches = re.split(offset_re, dt_string)
+    # Fast path for the formats above; anything else goes through strptime
+    if (len(dt_string) in (19, 24, 25) and dt_string[4] == '-' and
+            dt_string[7] == '-' and dt_string[10] == 'T' and
+            dt_string[13] == ':' and dt_string[16] == ':'):
+        offset_str = dt_string[19:] or '+0000'
+        if offset_str in _OFFSETS or _FAST_OFFSET_RE.match(offset_str):
+            try:
+                dt = _fromisoformat(dt_string[:19])
+            except ValueError:
+                pass
+            else:
+                return dt.replace(tzinfo=_tzinfo(offset_str))
+    return _strpt(dt_string)
+
+
+def _strpt(dt_string):
+    """Parse with strptime, handling any offset `OFFSET_RE` matches."""
+    matches = re.split(OFFSET_RE, dt_string)
     dt_string = matches[0]
     if len(matches) > 1:
-        offset_str = matches[1].replace(':', '')
-        offset = int(offset_str[-4:-2]) * 60 + int(offset_str[-2:])
-        if offset_str[0] == "-":
-            offset = -offset
+        offset = _offset_minutes(matches[1])
     else:
         offset = 0
 
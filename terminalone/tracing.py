@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Provides tracing of API calls.
+
+High-level calls (`T1.get`, `T1.get_all`, `T1.find`, `Entity.save`,
+`Report.get`) each run in a span, with a child span for every HTTP request
+attempt and for parsing each response. The default `Tracer` does nothing;
+`OpenTelemetryTracer` records spans with OpenTelemetry
+(https://opentelemetry.io/), and other backends can be adapted by
+subclassing `Tracer`.
+
+Span attributes:
+
+- calls: t1.collection, t1.entity_id, t1.page_offset, t1.page_limit, and
+  t1.entity_count (entities yielded) once a returned generator is consumed
+- requests: http.method, http.url, http.status_code, t1.collection,
+  t1.url_template, t1.attempt, t1.page_offset, t1.page_limit
+- parsing: t1.total_count (count reported by the API), t1.response_bytes
+
+Spans of calls returning generators end when the generator is exhausted
+or closed, and are the parent of requests made while iterating. The span
+of `Report.get` ends once the response headers are in, as rows are read
+by the caller afterwards.
+"""
+
+from __future__ import absolute_import
+from functools import wraps
+from types import GeneratorType
+from .errors import ClientError
+from .metadata import __version__
+from .vendor import six
+
+
+class _NoopSpan(object):
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer(object):
+    """Tracer that records nothing, and the interface of tracer adapters.
+
+    Spans returned by `start_span` need a `set_attribute(key, value)`
+    method. Nothing else about them is assumed.
+    """
+
+    #: Whether spans are recorded. When False, the library skips building
+    #: span names and attributes altogether.
+    enabled = False
+
+    def start_span(self, name, attributes=None):
+        """Start a span, a child of the active span if any."""
+        return _NOOP_SPAN
+
+    def end_span(self, span, error=None):
+        """End a span, recording the exception that ended it, if any."""
+
+    def activate(self, span):
+        """Context manager making span the active span (without ending it)."""
+        return _NOOP_SPAN
+
+    def wrap(self, func):
+        """Bind func to the active span, to call it in another thread."""
+        return func
+
+
+NOOP_TRACER = Tracer()
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer recording spans with the OpenTelemetry API.
+
+    Requires the opentelemetry-api package. Spans go to whatever tracer
+    provider the application configured.
+
+    Usage:
+        t1 = T1(..., tracer=OpenTelemetryTracer())
+    """
+
+    enabled = True
+
+    def __init__(self, tracer=None):
+        """Set up adapter.
+
+        :param tracer: opentelemetry.trace.Tracer to create spans with.
+            Defaults to one named "terminalone" from the global provider.
+        :raise ClientError: if opentelemetry-api is not installed
+        """
+        try:
+            from opentelemetry import context, trace
+        except ImportError:
+            raise ClientError('OpenTelemetryTracer requires the '
+                              'opentelemetry-api package')
+        self._context = context
+        self._trace = trace
+        if tracer is None:
+            tracer = trace.get_tracer('terminalone', __version__)
+        self.tracer = tracer
+
+    def start_span(self, name, attributes=None):
+        return self.tracer.start_span(name, attributes=attributes)
+
+    def end_span(self, span, error=None):
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(
+                self._trace.StatusCode.ERROR, '{}: {}'.format(
+                    type(error).__name__, error)))
+        span.end()
+
+    def activate(self, span):
+        # Errors are recorded by end_span, so don't record them twice
+        return self._trace.use_span(span, end_on_exit=False,
+                                    record_exception=False,
+                                    set_status_on_exception=False)
+
+    def wrap(self, func):
+        ctx = self._context.get_current()
+
+        @wraps(func)
+        def run(*args, **kwargs):
+            token = self._context.attach(ctx)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._context.detach(token)
+        return run
+
+
+def attributes(**kwargs):
+    """Span attributes dict, leaving out those without a value.
+
+    Keyword names use "_" in place of "." (e.g. http_method).
+    """
+    return dict((key.replace('_', '.', 1), value)
+                for key, value in kwargs.items() if value is not None)
+
+
+def traced(name, get_attributes=None):
+    """Decorate a Connection method to run in a span of its tracer.
+
+    If the method returns a generator (or a tuple starting with one), the
+    span stays open until it is exhausted or closed, and is active
+    whenever it is advanced.
+
+    :param name: str span name, or function taking the method's arguments
+        and returning one
+    :param get_attributes: function taking the method's arguments and
+        returning a span attributes dict
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = self.tracer
+            if not tracer.enabled:
+                return method(self, *args, **kwargs)
+            span_name = name if isinstance(name, six.string_types) else name(
+                self, *args, **kwargs)
+            span = tracer.start_span(span_name, get_attributes and
+                                     get_attributes(self, *args, **kwargs))
+            try:
+                with tracer.activate(span):
+                    result = method(self, *args, **kwargs)
+            except Exception as exc:
+                tracer.end_span(span, exc)
+                raise
+            if isinstance(result, GeneratorType):
+                return _traced_iter(tracer, span, result)
+            if (isinstance(result, tuple) and result and
+                    isinstance(result[0], GeneratorType)):
+                return (_traced_iter(tracer, span, result[0]),) + result[1:]
+            tracer.end_span(span)
+            return result
+        return wrapper
+    return decorator
+
+
+def _traced_iter(tracer, span, iterator):
+    """Yield from iterator with span active, ending it when done."""
+    count = 0
+    try:
+        while True:
+            with tracer.activate(span):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+            count += 1
+            yield item
+    except GeneratorExit:
+        iterator.close()
+        span.set_attribute('t1.entity_count', count)
+        tracer.end_span(span)
+        raise
+    except Exception as exc:
+        span.set_attribute('t1.entity_count', count)
+        tracer.end_span(span, exc)
+        raise
+    span.set_attribute('t1.entity_count', count)
+    tracer.end_span(span)
@@ -3,11 +3,8 @@
 
 from . import filters
 from .compose import compose
+from .concurrency import bounded_map
 from .credentials import credentials
 from .suppressed import suppress
 from .fixedoffset import FixedOffset
-
-# PMP-D relies on a models import. If any of the models rely on any of these
-# utils, importing from models will cause a circular import. So, make sure
-# PMP-D is imported after all other utils
 from .pmpd import generate_pmpd_tag
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Bounded thread pool helpers for fanning out blocking API calls."""
+
+from __future__ import absolute_import
+from collections import deque
+
+
+def bounded_map(func, iterable, workers, ordered=True):
+    """Map a function over an iterable on a bounded thread pool.
+
+    At most `workers` calls are in flight at once, and the iterable is
+    consumed lazily, so arbitrarily long inputs don't queue up in memory.
+
+    >>> list(bounded_map(lambda x: x * 2, range(5), workers=2))
+    [0, 2, 4, 6, 8]
+
+    :param func: callable taking a single item
+    :param iterable: items to map over
+    :param workers: int maximum number of concurrent calls
+    :param ordered: bool yield results in input order. If False, results are
+        yielded as soon as they complete.
+    :return: generator over results
+    :raise: any exception raised by `func`, when its result is reached
+    """
+    if workers < 1:
+        raise ValueError('workers must be a positive integer')
+
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for item in iterable:
+            if len(pending) >= workers:
+                for result in _drain(pending, ordered):
+                    yield result
+            pending.append(executor.submit(func, item))
+        while pending:
+            for result in _drain(pending, ordered):
+                yield result
+    finally:
+        # If the consumer stops early, don't run the calls queued behind it.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _drain(pending, ordered):
+    """Remove and return the results of at least one pending future."""
+    if ordered:
+        return [pending.popleft().result()]
+
+    from concurrent.futures import FIRST_COMPLETED, wait
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    results = []
+    for future in list(pending):
+        if future in done:
+            pending.remove(future)
+            results.append(future.result())
+    return results
@@ -3,10 +3,6 @@
 
 import os
 from functools import reduce
-from dotenv import load_dotenv
-
-dotenv_path = os.path.join(os.getcwd(), '.env')
-load_dotenv(dotenv_path)
 
 
 def dpath(dict_, path):
@@ -33,7 +29,8 @@ def credentials(filename=None, root=None):
         "api_key": "myapikey"
     }
 
-    If filename not provided, fall back on environment variables:
+    If filename not provided, fall back on environment variables, which can
+    also be set in a .env file in the working directory:
     - T1_API_USERNAME
     - T1_API_PASSWORD
     - T1_API_KEY
@@ -53,6 +50,8 @@ def credentials(filename=None, root=None):
     :return: dict[str]str
     :raise: TypeError: no JSON file or envvars
     """
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.getcwd(), '.env'))
 
     if filename is not None:
         import json
@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 """Utility for generating PMP-D tags"""
 
-from ..models import Publisher, PublisherSite, PlacementSlot
-
 TYPE_MAP = {
     'iframe': 1,
     'js': 2,
@@ -32,6 +30,7 @@ def generate_pmpd_tag(tag_type, placement_slot, publisher_site, publisher):
     :raise: TypeError if param is wrong type.
         ValueError if invalid tag_type.
     """
+    from ..models import Publisher, PublisherSite, PlacementSlot
     if not isinstance(placement_slot, PlacementSlot):
         raise TypeError('placement_slot should be a PlacementSlot instance')
     if not isinstance(publisher_site, PublisherSite):
@@ -25,6 +25,10 @@ class XMLParser(object):
         except ParseError as exc:
             raise ParserException(exc)
 
+        self._parse(result, xml)
+
+    def _parse(self, result, xml):
+        """Check status and set entity count and entities from parsed tree."""
         self.get_status(result, xml)
 
         def xfind(haystack, needle):
@@ -198,3 +202,59 @@ class XMLParser(object):
                                 'new_value': field.attrib['new_value']}
         output['fields'] = fields
         return output
+
+
+class StreamingXMLParser(XMLParser):
+    """Parses XML response incrementally with iterparse.
+
+    For collections, the count is read from the opening `entities` tag and
+    each `entity` is dictified and then dropped from the tree as soon as it
+    is complete, so memory stays flat for any page size. T1 sends `status`
+    after the entities, so an error status is raised once iteration reaches
+    it. Any other response is built in full and parsed as XMLParser would.
+    """
+
+    def __init__(self, source):
+        self.status_code = False
+        self._events = ET.iterparse(source, events=('start', 'end'))
+        self._depth = 0
+        root = None
+
+        for event, elem in self._iter_events():
+            if root is None:
+                root = elem
+            elif event == 'start' and self._depth == 2:
+                if elem.tag == 'entities':
+                    self.entity_count = int(elem.get('count') or 0)
+                    self.entities = self._iter_collection(root, elem)
+                    return
+                if elem.tag != 'status':
+                    # Not a collection: finish building the tree
+                    for _ in self._iter_events():
+                        pass
+                    break
+
+        if root is None:
+            raise ParserException(ParseError('no element found'))
+        self._parse(root, root)
+
+    def _iter_events(self):
+        """Iterate over parse events, tracking depth of the current element."""
+        try:
+            for event, elem in self._events:
+                if event == 'start':
+                    self._depth += 1
+                    yield event, elem
+                else:
+                    yield event, elem
+                    self._depth -= 1
+        except ParseError as exc:
+            raise ParserException(exc)
+
+    def _iter_collection(self, root, entities):
+        """Yield dictified entities, then check status at end of document."""
+        for event, elem in self._iter_events():
+            if event == 'end' and self._depth == 3 and elem.tag == 'entity':
+                yield self.dictify_entity(elem)
+                entities.clear()
+        self.get_status(root, root)
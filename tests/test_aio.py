@@ -0,0 +1,215 @@
+from __future__ import absolute_import
+import asyncio
+import re
+import unittest
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1, filters
+from terminalone.retry import RetryPolicy, TokenBucket
+
+try:
+    import aiohttp
+    from aioresponses import aioresponses, CallbackResult
+    from terminalone.aio import AsyncT1
+except ImportError:
+    aioresponses = None
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+
+@unittest.skipIf(aioresponses is None, 'aiohttp/aioresponses not installed')
+class TestAsyncT1(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+
+    def run_async(self, coro):
+        return asyncio.new_event_loop().run_until_complete(coro)
+
+    def test_get_and_save(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        posted = {}
+
+        def post_callback(url, **kwargs):
+            posted.update(kwargs['data'])
+            return CallbackResult(body=fixture, content_type='application/xml')
+
+        async def run():
+            with aioresponses() as mocked:
+                url = re.compile(r'^https://api\.mediamath\.com/api/v2\.0/advertisers/1')
+                mocked.get(url, body=fixture, content_type='application/xml')
+                mocked.post(url, callback=post_callback)
+                async with AsyncT1(self.t1) as t1a:
+                    adv = await t1a.get('advertisers', 1)
+                    self.assertEqual(1, adv.id)
+                    adv.name = 'Renamed'
+                    await t1a.save(adv)
+                    return adv
+
+        adv = self.run_async(run())
+        self.assertEqual('Renamed', posted['name'])
+        self.assertEqual({}, adv._properties)
+
+    def test_save_strategy(self):
+        with open('tests/fixtures/xml/strategy_with_deals.xml') as f:
+            fixture = f.read()
+        posted = {}
+
+        def post_callback(url, **kwargs):
+            posted.update(kwargs['data'])
+            return CallbackResult(body=fixture, content_type='application/xml')
+
+        async def run():
+            with aioresponses() as mocked:
+                url = re.compile(r'^https://api\.mediamath\.com/api/v2\.0/strategies/1881566')
+                mocked.get(url, body=fixture, content_type='application/xml')
+                mocked.post(url, callback=post_callback)
+                async with AsyncT1(self.t1) as t1a:
+                    strategy = await t1a.get('strategies', 1881566)
+                    strategy.name = 'Renamed'
+                    await t1a.save(strategy)
+                    return strategy
+
+        strategy = self.run_async(run())
+        self.assertEqual({'name': 'Renamed', 'version': '4'}, posted)
+        self.assertEqual({}, strategy.get_changes())
+        self.assertEqual([], strategy.pixel_target_expr['include']['pixels'])
+
+    def test_save_changes_only(self):
+        with open('tests/fixtures/xml/strategy_with_deals.xml') as f:
+            fixture = f.read()
+        posted = []
+
+        def post_callback(url, **kwargs):
+            posted.append(dict(kwargs['data']))
+            return CallbackResult(body=fixture, content_type='application/xml')
+
+        async def run():
+            with aioresponses() as mocked:
+                url = re.compile(r'^https://api\.mediamath\.com/api/v2\.0/strategies/1881566')
+                mocked.get(url, body=fixture, content_type='application/xml')
+                mocked.post(url, callback=post_callback, repeat=True)
+                async with AsyncT1(self.t1) as t1a:
+                    strategy = await t1a.get('strategies', 1881566)
+                    await t1a.save(strategy)
+                    strategy.pixel_target_expr['include']['pixels'].append(123)
+                    await t1a.save(strategy)
+
+        self.run_async(run())
+        self.assertEqual([{'pixel_target_expr': '( [123] )', 'version': '4'}],
+                         posted)
+
+    def test_get_all(self):
+        total = 250
+
+        def page_callback(url, **kwargs):
+            limit = int(url.query['page_limit'])
+            offset = int(url.query.get('page_offset', 0))
+            ids = range(offset + 1, min(offset + limit, total) + 1)
+            body = ('<?xml version="1.0" ?><result><entities count="{}">{}'
+                    '</entities><status code="ok" /></result>').format(
+                total, ''.join('<entity id="{0}" name="org {0}" '
+                               'type="organization" />'.format(i) for i in ids))
+            return CallbackResult(body=body, content_type='application/xml')
+
+        async def run():
+            with aioresponses() as mocked:
+                mocked.get(re.compile(r'^https://api\.mediamath\.com/api/v2\.0/organizations'),
+                           callback=page_callback, repeat=True)
+                async with AsyncT1(self.t1) as t1a:
+                    return [org.id async for org in t1a.get_all('organizations', workers=2)]
+
+        ids = self.run_async(run())
+        self.assertEqual(list(range(1, total + 1)), ids)
+
+    def test_find(self):
+        queries = []
+
+        def page_callback(url, **kwargs):
+            queries.append(url.query['q'])
+            body = ('<?xml version="1.0" ?><result><entities count="2">'
+                    '<entity id="1" name="org 1" type="organization" />'
+                    '<entity id="3" name="org 3" type="organization" />'
+                    '</entities><status code="ok" /></result>')
+            return CallbackResult(body=body, content_type='application/xml')
+
+        async def run():
+            with aioresponses() as mocked:
+                mocked.get(re.compile(r'^https://api\.mediamath\.com/api/v2\.0/organizations'),
+                           callback=page_callback, repeat=True)
+                async with AsyncT1(self.t1) as t1a:
+                    page = await t1a.find('organizations', None, filters.IN, [1, 3])
+                    found = t1a.find('organizations', None, filters.IN, [1, 3],
+                                     get_all=True)
+                    return [org.id for org in page], [org.id async for org in found]
+
+        page, found = self.run_async(run())
+        self.assertEqual([1, 3], page)
+        self.assertEqual([1, 3], found)
+        self.assertEqual(['(1,3)'] * 3, queries)
+
+    def test_retry_and_rate_limit(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        self.t1.retry = RetryPolicy(retries=2, backoff=0)
+        self.t1.rate_limiter = TokenBucket(rate=1000, capacity=1)
+        taken = []
+        try_acquire = self.t1.rate_limiter.try_acquire
+
+        def counting_acquire(tokens=1):
+            wait = try_acquire(tokens)
+            taken.append(wait)
+            return wait
+        self.t1.rate_limiter.try_acquire = counting_acquire
+
+        async def run():
+            with aioresponses() as mocked:
+                url = re.compile(r'^https://api\.mediamath\.com/api/v2\.0/advertisers/1')
+                mocked.get(url, status=503, body='<result/>',
+                           content_type='application/xml')
+                mocked.get(url, exception=aiohttp.ServerDisconnectedError())
+                mocked.get(url, body=fixture, content_type='application/xml')
+                async with AsyncT1(self.t1) as t1a:
+                    return await t1a.get('advertisers', 1)
+
+        adv = self.run_async(run())
+        self.assertEqual(1, adv.id)
+        # One token per attempt, each taken only once the bucket refilled
+        self.assertEqual(3, taken.count(0))
+
+    def test_post_not_retried_after_disconnect(self):
+        self.t1.retry = RetryPolicy(retries=2, backoff=0)
+
+        async def run():
+            with aioresponses() as mocked:
+                url = re.compile(r'^https://api\.mediamath\.com/api/v2\.0/advertisers/1')
+                mocked.post(url, exception=aiohttp.ServerDisconnectedError())
+                async with AsyncT1(self.t1) as t1a:
+                    await t1a._post('api/v2.0', 'advertisers/1',
+                                    data={'name': 'Renamed'})
+
+        with self.assertRaises(aiohttp.ServerDisconnectedError):
+            self.run_async(run())
@@ -0,0 +1,158 @@
+from __future__ import absolute_import
+import unittest
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1
+from terminalone.cache import EntityCache
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+CREATIVES = """<?xml version="1.0" ?>
+<result>
+  <entities count="2">
+    <entity name="Creative 1" id="1" type="atomic_creative" version="0">
+      <entity name="Advertiser" id="29" rel="advertiser" type="advertiser" version="4" />
+      <prop name="advertiser_id" value="29" />
+    </entity>
+    <entity name="Creative 2" id="2" type="atomic_creative" version="0">
+      <entity name="Advertiser" id="29" rel="advertiser" type="advertiser" version="4" />
+      <prop name="advertiser_id" value="29" />
+    </entity>
+  </entities>
+  <status code="ok" />
+</result>
+"""
+
+
+class TestEntityCache(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     cache=True,
+                     **mock_credentials)
+
+    @responses.activate
+    def test_shared_relations(self):
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/api/v2.0/atomic_creatives',
+                      body=CREATIVES,
+                      content_type='application/xml')
+        first, second = self.t1.get('atomic_creatives', include='advertiser')
+        self.assertIs(first.advertiser, second.advertiser)
+
+    @responses.activate
+    def test_relation_not_served_by_get(self):
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/api/v2.0/atomic_creatives',
+                      body=CREATIVES,
+                      content_type='application/xml')
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read().replace('id="1"', 'id="29"')
+        responses.add(responses.GET, 'https://api.mediamath.com/api/v2.0/advertisers/29',
+                      body=fixture,
+                      content_type='application/xml')
+        first, _ = self.t1.get('atomic_creatives', include='advertiser')
+
+        # The relation only holds a few properties, so get fetches it in full
+        adv = self.t1.get('advertisers', 29)
+        self.assertEqual(2, len(responses.calls))
+        self.assertIs(first.advertiser, adv)
+        self.assertEqual(300, adv.agency_id)
+        self.assertIs(adv, self.t1.get('advertisers', 29))
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_get_served_from_cache(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        responses.add(responses.GET, 'https://api.mediamath.com/api/v2.0/advertisers/1',
+                      body=fixture,
+                      content_type='application/xml')
+        adv = self.t1.get('advertisers', 1)
+        self.assertIs(adv, self.t1.get('advertisers', 1))
+        self.assertEqual(1, len(responses.calls))
+
+        self.t1.entity_cache.ttl = 0
+        self.assertIs(adv, self.t1.get('advertisers', 1))
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_unsaved_changes_kept(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        responses.add(responses.GET, 'https://api.mediamath.com/api/v2.0/advertisers/1',
+                      body=fixture,
+                      content_type='application/xml')
+        adv = self.t1.get('advertisers', 1)
+        adv.name = 'Local change'
+        self.t1.entity_cache.ttl = 0
+        self.assertIs(adv, self.t1.get('advertisers', 1))
+        self.assertEqual('Local change', adv.name)
+
+    def test_lru_eviction(self):
+        cache = EntityCache(maxsize=2)
+        ents = [self.t1.new('advertiser', properties={'id': i}) for i in range(3)]
+        for ent in ents:
+            cache.add(ent, fetched=True)
+        self.assertEqual(2, len(cache))
+        self.assertNotIn(('advertisers', 0), cache)
+        self.assertIs(ents[2], cache.get('advertisers', '2'))
+
+    @responses.activate
+    def test_strategy_refreshed(self):
+        with open('tests/fixtures/xml/strategy_with_deals.xml') as f:
+            fixture = f.read()
+        url = 'https://api.mediamath.com/api/v2.0/strategies/1881566'
+        responses.add(responses.GET, url, body=fixture,
+                      content_type='application/xml')
+        responses.add(responses.GET, url,
+                      body=fixture.replace('version="4"', 'version="5"')
+                                  .replace('value="EMT"', 'value="Renamed"'),
+                      content_type='application/xml')
+        strategy = self.t1.get('strategies', 1881566)
+        self.t1.entity_cache.ttl = 0
+        self.assertIs(strategy, self.t1.get('strategies', 1881566))
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual('Renamed', strategy.name)
+        self.assertEqual(5, strategy.version)
+        self.assertEqual({}, strategy.get_changes())
+        self.assertEqual([], strategy.pixel_target_expr['include']['pixels'])
+
+    @responses.activate
+    def test_strategy_in_place_changes_kept(self):
+        with open('tests/fixtures/xml/strategy_with_deals.xml') as f:
+            fixture = f.read()
+        url = 'https://api.mediamath.com/api/v2.0/strategies/1881566'
+        responses.add(responses.GET, url, body=fixture,
+                      content_type='application/xml')
+        responses.add(responses.GET, url,
+                      body=fixture.replace('version="4"', 'version="5"'),
+                      content_type='application/xml')
+        strategy = self.t1.get('strategies', 1881566)
+        strategy.pixel_target_expr['include']['pixels'].append(123)
+        self.t1.entity_cache.ttl = 0
+        self.assertIs(strategy, self.t1.get('strategies', 1881566))
+        self.assertEqual(4, strategy.version)
+        self.assertEqual([123], strategy.pixel_target_expr['include']['pixels'])
+        self.assertEqual('( [123] )', strategy.get_changes()['pixel_target_expr'])
@@ -0,0 +1,108 @@
+from __future__ import absolute_import
+import unittest
+import responses
+import requests
+from terminalone.vendor.six.moves.urllib.parse import parse_qs
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+
+class TestChanges(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+
+    def add_fixture(self, method, url, name):
+        with open('tests/fixtures/xml/' + name) as f:
+            fixture = f.read()
+        responses.add(method, 'https://api.mediamath.com/api/v2.0/' + url,
+                      body=fixture,
+                      content_type='application/xml')
+
+    def posted(self):
+        return [parse_qs(call.request.body) for call in responses.calls
+                if call.request.method == 'POST']
+
+    @responses.activate
+    def test_only_changes_sent(self):
+        self.add_fixture(responses.GET, 'advertisers/1', 'advertiser.xml')
+        self.add_fixture(responses.POST, 'advertisers/1', 'advertiser.xml')
+        adv = self.t1.get('advertisers', 1)
+
+        adv.save()
+        adv.name = 'advertiser 1'
+        adv.status = True
+        self.assertEqual({}, adv.get_changes())
+        adv.save()
+        self.assertEqual([], self.posted())
+
+        adv.name = 'Updated name'
+        self.assertEqual({'name': 'Updated name'}, adv.get_changes())
+        adv.save()
+        self.assertEqual([{'name': ['Updated name'], 'version': ['0']}],
+                         self.posted())
+
+    @responses.activate
+    def test_pixel_target_expr(self):
+        self.add_fixture(responses.GET, 'strategies/1881566', 'strategy_with_deals.xml')
+        self.add_fixture(responses.POST, 'strategies/1881566', 'strategy_with_deals.xml')
+        strategy = self.t1.get('strategies', 1881566)
+        self.assertNotIn('pixel_target_expr', strategy.get_changes())
+
+        strategy.pixel_target_expr['include']['pixels'].append(123)
+        self.assertEqual({'pixel_target_expr': '( [123] )'},
+                         strategy.get_changes())
+        strategy.save()
+        self.assertEqual(['( [123] )'], self.posted()[0]['pixel_target_expr'])
+
+    @responses.activate
+    def test_target_dimensions(self):
+        self.add_fixture(responses.GET, 'strategies/151940/target_dimensions/7',
+                         'target_dimensions.xml')
+        self.add_fixture(responses.POST, 'strategies/151940/target_dimensions/7',
+                         'target_dimensions.xml')
+        region = self.t1.get('strategies', 151940, child='region')
+        region.save()
+        self.assertEqual([], self.posted())
+
+        region.remove(region.include, 251)
+        self.assertEqual({'include': [], 'exclude': []}, region.get_changes())
+        region.save()
+        self.assertEqual(1, len(self.posted()))
+        self.assertEqual([251], [loc.id for loc in region.include])
+        self.assertEqual({}, region.get_changes())
+
+    def test_in_place_changes(self):
+        perm = self.t1.new('permission', properties={
+            'id': 1, 'advertiser': {1: {'agency_id': 2}}, 'agency': None,
+            'organization': None})
+        self.assertEqual({}, perm.get_changes())
+        perm.add('advertiser', 3)
+        self.assertEqual({'advertiser': {1: {'agency_id': 2}, 3: 'placeholder'}},
+                         perm.get_changes())
+        perm.revert()
+        self.assertEqual({1: {'agency_id': 2}}, perm.advertiser)
+        self.assertEqual({}, perm.get_changes())
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+import unittest
+from datetime import datetime
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1, columns
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+ADVERTISERS = """<?xml version="1.0" ?>
+<result>
+  <entities count="3">
+    <entity name="adv 1" id="1" type="advertiser" version="0">
+      <prop name="vertical_id" value="12" />
+      <prop name="status" value="1" />
+      <prop name="created_on" value="2015-08-21T15:28:53+0100" />
+    </entity>
+    <entity name="adv 2" id="2" type="advertiser" version="3">
+      <prop name="status" value="0" />
+      <prop name="created_on" value="2015-08-22T15:28:53" />
+    </entity>
+    <entity name="adv 3" id="3" type="advertiser" version="1">
+      <prop name="vertical_id" value="9" />
+      <prop name="status" value="1" />
+      <prop name="created_on" value="2015-08-23T15:28:53" />
+    </entity>
+  </entities>
+  <status code="ok" />
+</result>
+"""
+
+
+class TestColumns(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+
+    def get_columns(self):
+        responses.add(responses.GET, 'https://api.mediamath.com/api/v2.0/advertisers',
+                      body=ADVERTISERS,
+                      content_type='application/xml')
+        return self.t1.get('advertisers', as_columns=True)
+
+    @responses.activate
+    def test_lists(self):
+        np = columns.np
+        columns.np = None
+        try:
+            cols = self.get_columns()
+        finally:
+            columns.np = np
+        ents = list(self.t1.get('advertisers'))
+
+        self.assertEqual([e.id for e in ents], cols['id'])
+        self.assertEqual([12, None, 9], cols['vertical_id'])
+        self.assertEqual([True, False, True], cols['status'])
+        self.assertEqual([e.created_on for e in ents], cols['created_on'])
+
+    @unittest.skipIf(columns.np is None, 'numpy not installed')
+    @responses.activate
+    def test_arrays(self):
+        cols = self.get_columns()
+        self.assertEqual('int64', cols['id'].dtype)
+        self.assertEqual([1, 2, 3], cols['id'].tolist())
+        self.assertEqual('float64', cols['vertical_id'].dtype)
+        self.assertTrue(columns.np.isnan(cols['vertical_id'][1]))
+        self.assertEqual('bool', cols['status'].dtype)
+        self.assertEqual(datetime(2015, 8, 21, 14, 28, 53),
+                         cols['created_on'][0].astype(datetime))
+        self.assertEqual(object, cols['name'].dtype)
+
+    @unittest.skipIf(columns.pd is None, 'pandas not installed')
+    @responses.activate
+    def test_dataframe(self):
+        frame = columns.to_dataframe(self.get_columns())
+        self.assertEqual(3, len(frame))
+        self.assertEqual('UTC', str(frame['created_on'].dt.tz))
+
+    @responses.activate
+    def test_get_all(self):
+        with open('tests/fixtures/xml/organizations.xml') as f:
+            fixture = f.read()
+        responses.add(responses.GET, 'https://api.mediamath.com/api/v2.0/organizations',
+                      body=fixture,
+                      content_type='application/xml')
+        cols, count = self.t1.get('organizations', get_all=True,
+                                  as_columns=True, count=True)
+        self.assertEqual(count, len(cols['id']))
+
+    def get_report(self):
+        with open('tests/fixtures/performance.csv', 'rb') as f:
+            fixture = f.read()
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/reporting/v1/std/performance',
+                      body=fixture,
+                      content_type='text/csv; charset=UTF-8')
+        with open('tests/fixtures/json/performance_meta.json') as f:
+            fixture = f.read()
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/reporting/v1/std/performance/meta',
+                      body=fixture,
+                      content_type='application/json')
+        report = self.t1.new('report', 'performance')
+        report.set({'dimensions': ['campaign_name'], 'time_window': 'yesterday'})
+        return report
+
+    @responses.activate
+    def test_report_columns(self):
+        report = self.get_report()
+        self.assertEqual('int64', report.column_types(['clicks'])['clicks'])
+
+        np = columns.np
+        columns.np = None
+        try:
+            cols = report.get_columns()
+        finally:
+            columns.np = np
+        self.assertEqual([1, 10], cols['clicks'])
+        self.assertEqual([0.0, 190.15], cols['billed_spend'])
+        self.assertEqual([datetime(2016, 3, 31)] * 2, cols['start_date'])
+        self.assertEqual('Krux BSW test deals', cols['campaign_name'][0])
+        # Not described by the metadata, so left as strings
+        self.assertEqual('0.00', cols['udi_data_cost'][0])
+
+    @unittest.skipIf(columns.np is None, 'numpy not installed')
+    @responses.activate
+    def test_report_arrays(self):
+        chunks = list(self.get_report().get_columns(chunk_size=1))
+        self.assertEqual(2, len(chunks))
+        self.assertEqual('int64', chunks[1]['impressions'].dtype)
+        self.assertEqual([31283], chunks[1]['impressions'].tolist())
+        self.assertEqual('datetime64[us]', chunks[0]['end_date'].dtype)
+
+    @unittest.skipIf(columns.pd is None, 'pandas not installed')
+    @responses.activate
+    def test_report_dataframe(self):
+        frame = self.get_report().get_columns(as_dataframe=True)
+        self.assertEqual([1, 10], frame['clicks'].tolist())
+        self.assertEqual('float64', frame['total_spend'].dtype)
+        self.assertEqual('M', frame['start_date'].dtype.kind)
+        self.assertEqual(u'this is unicode – ∑\xb4†\xa9˙∆˚!',
+                         frame['campaign_name'][1])
@@ -1,4 +1,5 @@
 from __future__ import absolute_import
+import json
 import unittest
 import responses
 import requests
@@ -77,3 +78,21 @@ class TestDeals(unittest.TestCase):
         strategy = self.t1.get('strategies', 11111, child='deals')
         self.assertEqual(11111, strategy.deals[0].id)
         self.assertEqual(22222, strategy.deals[1].id)
+
+    @responses.activate
+    def test_save_posts_json(self):
+        with open('tests/fixtures/json/media_api_deal.json') as f:
+            fixture = f.read()
+        responses.add(responses.GET, 'https://api.mediamath.com/deals/v1.0/deals/11111',
+                      body=fixture,
+                      content_type='application/json')
+        responses.add(responses.POST, 'https://api.mediamath.com/deals/v1.0/deals/11111',
+                      body=fixture,
+                      content_type='application/json')
+        deal = self.t1.get('deals', 11111)
+        deal.name = 'Renamed deal'
+        deal.save()
+
+        request = responses.calls[-1].request
+        self.assertEqual('application/json', request.headers['Content-Type'])
+        self.assertEqual('Renamed deal', json.loads(request.body)['name'])
@@ -0,0 +1,109 @@
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1, export
+from terminalone.errors import ClientError
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+
+@unittest.skipIf(export.pa is None, 'pyarrow not installed')
+class TestExport(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_organizations(self, **kwargs):
+        with open('tests/fixtures/xml/organizations.xml') as f:
+            fixture = f.read()
+        responses.add(responses.GET, 'https://api.mediamath.com/api/v2.0/organizations',
+                      body=fixture,
+                      content_type='application/xml')
+        return self.t1.get('organizations', get_all=True, **kwargs)
+
+    @responses.activate
+    def test_entities_parquet(self):
+        path = os.path.join(self.directory, 'organizations.parquet')
+        ents = list(self.get_organizations())
+        written = export.write_entities(iter(ents), path, batch_size=3)
+
+        table = export.pq.read_table(path)
+        self.assertEqual(len(ents), written)
+        self.assertEqual(len(ents), table.num_rows)
+        self.assertEqual('int64', str(table.schema.field('id').type))
+        self.assertEqual('timestamp[us, tz=UTC]',
+                         str(table.schema.field('created_on').type))
+        self.assertEqual([e.id for e in ents], table.column('id').to_pylist())
+        self.assertEqual([e.name for e in ents], table.column('name').to_pylist())
+        self.assertEqual(os.listdir(self.directory), ['organizations.parquet'])
+
+    @responses.activate
+    def test_compact_arrow(self):
+        path = os.path.join(self.directory, 'organizations.arrow')
+        written = export.write_entities(self.get_organizations(compact=True),
+                                        path, fields=['id', 'name', 'status'])
+        table = export.pa.ipc.open_file(path).read_all()
+        self.assertEqual(['id', 'name', 'status'], table.schema.names)
+        self.assertEqual('bool', str(table.schema.field('status').type))
+        self.assertEqual(written, table.num_rows)
+
+    @responses.activate
+    def test_report(self):
+        with open('tests/fixtures/performance.csv', 'rb') as f:
+            fixture = f.read()
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/reporting/v1/std/performance',
+                      body=fixture,
+                      content_type='text/csv; charset=UTF-8')
+        with open('tests/fixtures/json/performance_meta.json') as f:
+            fixture = f.read()
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/reporting/v1/std/performance/meta',
+                      body=fixture,
+                      content_type='application/json')
+        report = self.t1.new('report', 'performance')
+        report.set({'dimensions': ['campaign_name'], 'time_window': 'yesterday'})
+        path = os.path.join(self.directory, 'performance.parquet')
+
+        self.assertEqual(2, export.write_report(report, path, batch_size=1))
+        table = export.pq.read_table(path)
+        self.assertEqual([1, 10], table.column('clicks').to_pylist())
+        self.assertEqual([0.0, 190.15], table.column('billed_spend').to_pylist())
+        self.assertEqual([datetime(2016, 3, 31)] * 2,
+                         table.column('start_date').to_pylist())
+        self.assertEqual('string', str(table.schema.field('udi_data_cost').type))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ClientError):
+            export.write_entities([], os.path.join(self.directory, 'out.csv'))
@@ -2,8 +2,10 @@ from __future__ import absolute_import
 import unittest
 import responses
 import requests
+from terminalone.vendor.six.moves.urllib.parse import parse_qs, urlparse
 from .requests_patch import patched_extract_cookies_to_jar
 from terminalone import T1, filters
+from terminalone.errors import ClientError
 
 mock_credentials = {
     'username': 'user',
@@ -72,6 +74,106 @@ class TestGets(unittest.TestCase):
             c += 1
         self.assertEqual(c, count)
 
+    @responses.activate
+    def test_get_all_concurrent(self):
+        total = 250
+
+        def page_callback(request):
+            params = parse_qs(urlparse(request.url).query)
+            limit = int(params['page_limit'][0])
+            offset = int(params.get('page_offset', ['0'])[0])
+            ids = range(offset + 1, min(offset + limit, total) + 1)
+            body = ('<?xml version="1.0" ?><result><entities count="{}">{}'
+                    '</entities><status code="ok" /></result>').format(
+                total, ''.join('<entity id="{0}" name="org {0}" '
+                               'type="organization" />'.format(i) for i in ids))
+            return 200, {}, body
+
+        responses.add_callback(responses.GET,
+                               'https://api.mediamath.com/api/v2.0/organizations',
+                               callback=page_callback,
+                               content_type='application/xml')
+        orgs, count = self.t1.get('organizations', count=True,
+                                  get_all=True, workers=3)
+        ids = [org.id for org in orgs]
+        self.assertEqual(total, count)
+        self.assertEqual(list(range(1, total + 1)), ids)
+
+    @responses.activate
+    def test_get_many(self):
+        def in_callback(request):
+            params = parse_qs(urlparse(request.url).query)
+            query = params['q'][0]
+            # Only odd IDs exist, and the API sorts by ID
+            ids = sorted(int(i) for i in query.strip('()').split(',')
+                         if int(i) % 2)
+            body = ('<?xml version="1.0" ?><result><entities count="{}">{}'
+                    '</entities><status code="ok" /></result>').format(
+                len(ids), ''.join('<entity id="{0}" name="org {0}" '
+                                  'type="organization" />'.format(i)
+                                  for i in ids))
+            return 200, {}, body
+
+        responses.add_callback(responses.GET,
+                               'https://api.mediamath.com/api/v2.0/organizations',
+                               callback=in_callback,
+                               content_type='application/xml')
+        wanted = list(range(250, 0, -1)) + [7, 9]
+        orgs = self.t1.get_many('organizations', wanted, chunk_size=40,
+                                workers=3, ordered=True)
+        self.assertEqual([i for i in range(250, 0, -1) if i % 2],
+                         [org.id for org in orgs])
+        self.assertEqual(7, len(responses.calls))
+
+        orgs = self.t1.get_many('organizations', wanted, chunk_size=40)
+        self.assertEqual(set(range(1, 251, 2)), set(org.id for org in orgs))
+
+    @responses.activate
+    def test_get_lazy(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        responses.add(responses.GET, 'https://api.mediamath.com/api/v2.0/advertisers/1',
+                      body=fixture,
+                      content_type='application/xml')
+        eager = self.t1.get('advertisers', 1)
+        self.t1.lazy = True
+        lazy = self.t1.get('advertisers', 1)
+
+        self.assertIn('created_on', lazy._pending)
+        self.assertEqual(eager.created_on, lazy.created_on)
+        self.assertNotIn('created_on', lazy._pending)
+        self.assertEqual(eager.get_properties(), lazy.get_properties())
+        self.assertEqual(set(), lazy._pending)
+
+    @responses.activate
+    def test_get_compact(self):
+        with open('tests/fixtures/xml/atomic_creatives_with_advertiser_concept.xml') as f:
+            fixture = f.read()
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/api/v2.0/atomic_creatives',
+                      body=fixture,
+                      content_type='application/xml')
+        full = next(self.t1.get('atomic_creatives',
+                                include=[['advertiser', ], ['concept', ]]))
+        ac = next(self.t1.get('atomic_creatives',
+                              include=[['advertiser', ], ['concept', ]],
+                              compact=True))
+
+        self.assertFalse(hasattr(ac, '__dict__'))
+        self.assertEqual(full.created_on, ac.created_on)
+        self.assertEqual(full.advertiser.name, ac.advertiser.name)
+        with self.assertRaises(AttributeError):
+            ac.not_a_field
+        with self.assertRaises(ClientError):
+            ac.name = 'Renamed'
+
+        entity = ac.to_entity()
+        self.assertIsInstance(entity, type(full))
+        self.assertEqual(full.get_properties().keys(),
+                         entity.get_properties().keys())
+        self.assertEqual(full.advertiser.get_properties(),
+                         entity.advertiser.get_properties())
+
     @responses.activate
     def test_get_strategy_day_parts(self):
         with open('tests/fixtures/xml/strategy_day_parts.xml') as f:
@@ -0,0 +1,142 @@
+from __future__ import absolute_import
+import asyncio
+import re
+import unittest
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1
+from terminalone.errors import ClientError
+from terminalone.retry import RetryPolicy
+
+try:
+    from aioresponses import aioresponses
+    from terminalone.aio import AsyncT1
+except ImportError:
+    aioresponses = None
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+
+class TestHooks(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     retry=RetryPolicy(retries=2, backoff=0),
+                     **mock_credentials)
+        self.events = []
+        for event in ('before_request', 'after_response', 'after_parse'):
+            self.t1.hooks.add(event, self.record)
+
+    def record(self, info):
+        self.events.append(dict(info))
+
+    def add_fixture(self, method, url, name, **kwargs):
+        with open('tests/fixtures/xml/' + name) as f:
+            fixture = f.read()
+        responses.add(method, 'https://api.mediamath.com/api/v2.0/' + url,
+                      body=fixture, content_type='application/xml', **kwargs)
+
+    @responses.activate
+    def test_collection(self):
+        self.add_fixture(responses.GET, 'advertisers', 'advertisers.xml')
+        self.t1.get('advertisers', page_limit=100)
+
+        self.assertEqual(['before_request', 'after_response', 'after_parse'],
+                         [info['event'] for info in self.events])
+        info = self.events[-1]
+        self.assertEqual('GET', info['method'])
+        self.assertEqual('advertisers', info['collection'])
+        self.assertEqual('advertisers', info['url_template'])
+        self.assertEqual(100, info['params']['page_limit'])
+        self.assertEqual(200, info['status_code'])
+        self.assertEqual(12345, info['entity_count'])
+        self.assertEqual(len(responses.calls[0].response.content), info['bytes'])
+        self.assertGreaterEqual(info['network_time'], 0)
+        self.assertGreaterEqual(info['parse_time'], 0)
+
+    @responses.activate
+    def test_entity_requests(self):
+        self.add_fixture(responses.GET, 'advertisers/1', 'advertiser.xml',
+                         status=503)
+        self.add_fixture(responses.GET, 'advertisers/1', 'advertiser.xml')
+        self.add_fixture(responses.POST, 'advertisers/1', 'advertiser.xml')
+        adv = self.t1.get('advertisers', 1)
+        self.assertEqual([(0, 503), (1, 200)],
+                         [(info['attempt'], info['status_code'])
+                          for info in self.events
+                          if info['event'] == 'after_response'])
+        self.assertEqual('advertisers/{id}', self.events[-1]['url_template'])
+
+        del self.events[:]
+        adv.name = 'Updated name'
+        adv.save()
+        self.assertEqual(['POST'] * 3, [info['method'] for info in self.events])
+        self.assertEqual('advertisers/{id}', self.events[-1]['url_template'])
+
+    @responses.activate
+    def test_report_metadata(self):
+        with open('tests/fixtures/json/performance_meta.json') as f:
+            fixture = f.read()
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/reporting/v1/std/performance/meta',
+                      body=fixture,
+                      content_type='application/json')
+        self.t1.new('report', 'performance').metadata
+
+        self.assertEqual(['before_request', 'after_response', 'after_parse'],
+                         [info['event'] for info in self.events])
+        info = self.events[-1]
+        self.assertEqual('reports', info['collection'])
+        self.assertEqual('reports/performance/meta', info['url_template'])
+        self.assertEqual(len(fixture.encode('utf-8')), info['bytes'])
+
+    def test_registry(self):
+        with self.assertRaises(ClientError):
+            self.t1.hooks.add('before_save', self.record)
+        self.assertTrue(self.t1.hooks.enabled)
+        for event in ('before_request', 'after_response', 'after_parse'):
+            self.t1.hooks.remove(event, self.record)
+        self.assertFalse(self.t1.hooks.enabled)
+        self.assertIsNone(self.t1._request_info('GET', 'url', 'advertisers'))
+
+    @unittest.skipIf(aioresponses is None, 'aiohttp/aioresponses not installed')
+    def test_async(self):
+        with open('tests/fixtures/xml/advertisers.xml') as f:
+            fixture = f.read()
+
+        async def run():
+            with aioresponses() as mocked:
+                mocked.get(re.compile(r'^https://api\.mediamath\.com/api/v2\.0/advertisers'),
+                           body=fixture, content_type='application/xml')
+                async with AsyncT1(self.t1) as t1a:
+                    await t1a.get('advertisers', page_limit=100)
+
+        asyncio.new_event_loop().run_until_complete(run())
+        self.assertEqual(['before_request', 'after_response', 'after_parse'],
+                         [info['event'] for info in self.events])
+        info = self.events[-1]
+        self.assertEqual('advertisers', info['url_template'])
+        self.assertEqual(100, info['params']['page_limit'])
+        self.assertEqual(200, info['status_code'])
+        self.assertEqual(12345, info['entity_count'])
@@ -1,5 +1,7 @@
+import json
 import unittest
-from terminalone.jsonparser import JSONParser
+from terminalone import jsoncodec
+from terminalone.jsonparser import JSONParser, StreamingJSONParser
 from terminalone import errors
 
 
@@ -69,3 +71,98 @@ class TestJSONParsing(unittest.TestCase):
             fixture = f.read()
         parser = JSONParser(fixture)
         self.assertEqual(True, parser.status_code)
+
+
+class TestStreamingJSONParsing(unittest.TestCase):
+    @staticmethod
+    def chunked(path, size=16):
+        with open(path, 'rb') as f:
+            body = f.read()
+        return [body[i:i + size] for i in range(0, len(body), size)]
+
+    def test_collection(self):
+        parser = StreamingJSONParser(
+            self.chunked('tests/fixtures/json/three_entities.json'))
+        self.assertIsNone(parser.entity_count)
+
+        entities = list(parser.entities)
+        with open('tests/fixtures/json/three_entities.json') as f:
+            expected = list(JSONParser(f.read()).entities)
+        self.assertEqual(expected, entities)
+        self.assertEqual(True, parser.status_code)
+        self.assertEqual(3, parser.entity_count)
+
+    def test_meta_first(self):
+        body = (b'{"meta": {"status": "ok", "total_count": 2}, "data": '
+                b'[{"entity_type": "advertiser", "id": 1}, '
+                b'{"entity_type": "advertiser", "id": 2}]}')
+        parser = StreamingJSONParser([body[:40], body[40:]])
+        self.assertEqual(2, parser.entity_count)
+        self.assertEqual([1, 2], [e['id'] for e in parser.entities])
+
+    def test_error_after_data(self):
+        body = (b'{"data": [{"entity_type": "advertiser", "id": 1}], '
+                b'"meta": {"status": "auth_required"}, '
+                b'"errors": [{"message": "Authentication error"}]}')
+        parser = StreamingJSONParser([body])
+        with self.assertRaises(errors.AuthRequiredError):
+            list(parser.entities)
+
+    def test_single_entity(self):
+        parser = StreamingJSONParser(
+            self.chunked('tests/fixtures/json/advertiser.json'))
+        self.assertEqual(True, parser.status_code)
+        self.assertEqual('advertiser', parser.entities['_type'])
+
+    def test_auth_error(self):
+        with self.assertRaises(errors.AuthRequiredError):
+            StreamingJSONParser(
+                self.chunked('tests/fixtures/json/auth_error.json'))
+
+    def test_missing_status(self):
+        body = b'{"data": {"entity_type": "advertiser", "id": 1}}'
+        with self.assertRaises(errors.T1Error) as cm:
+            StreamingJSONParser([body[:20], body[20:]])
+        self.assertEqual(body.decode('utf-8'), cm.exception.message)
+
+
+class TestJSONCodecs(unittest.TestCase):
+    def test_default_codec(self):
+        self.assertIn(jsoncodec.get_codec().name, jsoncodec.PREFERENCE)
+        self.assertEqual('json', jsoncodec.get_codec('json').name)
+        with self.assertRaises(errors.ClientError):
+            jsoncodec.get_codec('simplerjson')
+
+    def test_identical_output(self):
+        codec = jsoncodec.get_codec()
+        for name in ('three_entities', 'campaigns_with_strategies',
+                     'atomic_creatives_with_creative_approvals',
+                     'media_api_deal', 'permissions'):
+            with open('tests/fixtures/json/{}.json'.format(name), 'rb') as f:
+                fixture = f.read()
+            expected = JSONParser(fixture)
+            parser = JSONParser(fixture, loads=codec.loads)
+            self.assertEqual(expected.entity_count, parser.entity_count)
+            if isinstance(expected.entities, dict):
+                self.assertEqual(expected.entities, parser.entities)
+            else:
+                self.assertEqual(list(expected.entities), list(parser.entities))
+
+    def test_stdlib_codec_takes_bytes(self):
+        # json.loads only takes str before Python 3.6
+        codec = jsoncodec.get_codec('json')
+        self.assertEqual({'name': u'caf\xe9'},
+                         codec.loads(u'{"name": "caf\xe9"}'.encode('utf-8')))
+        name = u'\u65e5\u672c'
+        self.assertEqual({'name': name},
+                         codec.loads((u'{"name": "%s"}' % name).encode('utf-8')))
+        self.assertEqual({'name': u'caf\xe9'},
+                         codec.loads(u'{"name": "caf\xe9"}'))
+        with open('tests/fixtures/json/three_entities.json', 'rb') as f:
+            parser = JSONParser(f.read(), loads=codec.loads)
+        self.assertEqual(3, parser.entity_count)
+
+    def test_dumps_round_trip(self):
+        codec = jsoncodec.get_codec()
+        data = {'name': 'deal/1', 'price': {'value': '1.50'}, 'status': True}
+        self.assertEqual(data, json.loads(codec.dumps(data)))
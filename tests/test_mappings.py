@@ -0,0 +1,42 @@
+from __future__ import absolute_import
+import subprocess
+import sys
+import unittest
+from terminalone import models
+from terminalone.t1mappings import CLASSES, MODEL_PATHS, SINGULAR
+from terminalone.reports import Report
+
+
+class TestMappings(unittest.TestCase):
+    def test_lookups(self):
+        self.assertIs(models.Advertiser, CLASSES['advertisers'])
+        self.assertIs(models.Advertiser, SINGULAR['advertiser'])
+        self.assertIs(Report, CLASSES['reports'])
+        self.assertEqual('advertisers', MODEL_PATHS[models.Advertiser])
+        self.assertEqual('pixels', MODEL_PATHS[models.ChildPixel])
+        self.assertIn('strategies', CLASSES)
+        self.assertNotIn('nope', CLASSES)
+        with self.assertRaises(KeyError):
+            CLASSES['nope']
+        self.assertEqual('pixel_bundles', MODEL_PATHS[models.PixelBundle])
+        self.assertEqual('pixel_bundles', MODEL_PATHS[models.Pixel])
+        with self.assertRaises(KeyError):
+            MODEL_PATHS[object]
+        self.assertEqual(len(CLASSES), len(dict(CLASSES)))
+
+    def test_models(self):
+        self.assertIn('Strategy', dir(models))
+        namespace = {}
+        exec('from terminalone.models import *', namespace)
+        self.assertIs(models.Vertical, namespace['Vertical'])
+        with self.assertRaises(AttributeError):
+            models.Nope
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'models import eagerly')
+    def test_import_is_lazy(self):
+        code = ('import sys, terminalone; print(sorted(m for m in sys.modules '
+                'if m.startswith("terminalone.models.") or m in ("jwt", "numpy")))')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         stderr=subprocess.STDOUT)
+        self.assertEqual("[]",
+                         output.decode('utf-8').strip().splitlines()[-1])
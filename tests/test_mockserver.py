@@ -0,0 +1,91 @@
+from __future__ import absolute_import
+import unittest
+from terminalone import T1, filters
+from terminalone.errors import NotFoundError, ValidationError
+from terminalone.mockserver import MockServer
+from terminalone.retry import RetryPolicy
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+
+class TestMockServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockServer(size=250, retry_after=0, seed=1).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        """set up test fixtures"""
+        self.server.throttle = 0
+        self.t1 = T1(auth_method='cookie',
+                     api_base=self.server.api_base,
+                     **mock_credentials)
+
+    def test_session(self):
+        self.assertEqual(1, self.t1.user_id)
+        self.assertIn(self.t1.session_id, self.server.sessions)
+
+    def test_get_all(self):
+        for json in (False, True):
+            t1 = T1(auth_method='cookie', api_base=self.server.api_base,
+                    json=json, **mock_credentials)
+            campaigns, count = t1.get('campaigns', get_all=True, count=True,
+                                      workers=3)
+            self.assertEqual(250, count)
+            self.assertEqual(list(range(1, 251)), [c.id for c in campaigns])
+
+    def test_includes(self):
+        adv = self.t1.get('advertisers', 5,
+                          include=[['agency', 'organization']])
+        self.assertEqual(5, adv.agency.id)
+        self.assertEqual(5, adv.agency.organization.id)
+        campaign = self.t1.get('campaigns', 3, include='strategies')
+        self.assertEqual([3], [s.id for s in campaign.strategies])
+
+    def test_find(self):
+        strategies = self.t1.find('strategies', None, filters.IN, [3, 1, 999])
+        self.assertEqual([1, 3], sorted(s.id for s in strategies))
+        with self.assertRaises(NotFoundError):
+            self.t1.get('strategies', 999)
+
+    def test_save(self):
+        adv = self.t1.get('advertisers', 7)
+        stale = self.t1.get('advertisers', 7)
+        adv.name = 'renamed'
+        adv.save()
+        self.assertEqual('renamed', self.t1.get('advertisers', 7).name)
+        stale.name = 'other'
+        with self.assertRaises(ValidationError):
+            stale.save()
+
+    def test_report(self):
+        report = self.t1.new('report', 'performance')
+        report.set({
+            'dimensions': ['advertiser_id'],
+            'metrics': ['impressions', 'clicks'],
+            'start_date': '2016-01-01',
+            'end_date': '2016-01-02',
+            'filter': {'advertiser_id': 5},
+        })
+        headers, rows = report.get()
+        rows = list(rows)
+        self.assertEqual(['start_date', 'end_date', 'advertiser_id',
+                          'impressions', 'clicks'], headers)
+        self.assertEqual([['2016-01-01', '2016-01-01', '5'],
+                          ['2016-01-02', '2016-01-02', '5']],
+                         [row[:3] for row in rows])
+
+    def test_throttle(self):
+        t1 = T1(auth_method='cookie', api_base=self.server.api_base,
+                retry=RetryPolicy(retries=20, backoff=0), **mock_credentials)
+        self.server.throttle = 0.5
+        throttled = self.server.stats['throttled']
+        self.assertEqual(250, len(list(t1.get_all('organizations'))))
+        self.assertLess(throttled, self.server.stats['throttled'])
@@ -0,0 +1,358 @@
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+import responses
+import requests
+from terminalone.vendor.six.moves.urllib.parse import parse_qs, urlparse
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1
+from terminalone.errors import ClientError
+from terminalone import reports
+from terminalone.reportcache import ReportCache
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+UNAVAILABLE = ('<?xml version="1.0" ?><result><status code="error">'
+               'Service Unavailable</status></result>')
+
+
+def daily_rows(start, end):
+    """CSV body with one row per day between start and end inclusive."""
+    lines = ['start_date,end_date,impressions']
+    day = start
+    while day <= end:
+        lines.append('{0},{0},{1}'.format(day.isoformat(), day.day))
+        day += timedelta(days=1)
+    return '\n'.join(lines) + '\n'
+
+
+class TestReports(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+
+    @responses.activate
+    def test_get_sharded(self):
+        failed = []
+
+        def report_callback(request):
+            params = parse_qs(urlparse(request.url).query)
+            start = params['start_date'][0]
+            if start == '2016-03-08' and not failed:
+                failed.append(start)
+                return 503, {'Content-Type': 'application/xml'}, UNAVAILABLE
+            start = date(*map(int, start.split('-')))
+            end = date(*map(int, params['end_date'][0].split('-')))
+            return 200, {}, daily_rows(start, end)
+
+        responses.add_callback(responses.GET,
+                               'https://api.mediamath.com/reporting/v1/std/performance',
+                               callback=report_callback,
+                               content_type='text/csv; charset=UTF-8')
+        report = self.t1.new('report', 'performance')
+        report.set({
+            'dimensions': ['campaign_id'],
+            'time_rollup': 'by_day',
+            'start_date': '2016-03-01',
+            'end_date': '2016-03-31',
+        })
+        calls = []
+        headers, data = report.get_sharded(
+            days=7, workers=3,
+            progress=lambda done, total, shard: calls.append((done, total)))
+
+        self.assertEqual(['start_date', 'end_date', 'impressions'], headers)
+        self.assertEqual([str(d) for d in range(1, 32)],
+                         [row[2] for row in data])
+        self.assertEqual(['2016-03-08'], failed)
+        self.assertEqual([(i, 5) for i in range(1, 6)], calls)
+        # Every shard once, plus one retry
+        self.assertEqual(6, len(responses.calls))
+
+    def test_sharding_needs_dates(self):
+        report = self.t1.new('report', 'performance')
+        report.set({'time_window': 'last_30_days'})
+        with self.assertRaises(ClientError):
+            report.get_sharded()
+
+
+class TestReportCache(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.directory = tempfile.mkdtemp()
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     report_cache=ReportCache(self.directory),
+                     **mock_credentials)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def add_responses(self):
+        def report_callback(request):
+            params = parse_qs(urlparse(request.url).query)
+            start = date(*map(int, params['start_date'][0].split('-')))
+            end = date(*map(int, params['end_date'][0].split('-')))
+            return 200, {}, daily_rows(start, end)
+
+        responses.add_callback(responses.GET,
+                               'https://api.mediamath.com/reporting/v1/std/performance',
+                               callback=report_callback,
+                               content_type='text/csv; charset=UTF-8')
+        with open('tests/fixtures/json/performance_meta.json') as f:
+            fixture = f.read()
+        responses.add(responses.GET,
+                      'https://api.mediamath.com/reporting/v1/std/performance/meta',
+                      body=fixture,
+                      content_type='application/json')
+
+    def report(self, start, end):
+        report = self.t1.new('report', 'performance')
+        report.set({'time_rollup': 'by_day',
+                    'start_date': start.isoformat(),
+                    'end_date': end.isoformat()})
+        return report
+
+    @responses.activate
+    def test_closed_range_cached(self):
+        self.add_responses()
+        start, end = date(2016, 3, 1), date(2016, 3, 10)
+
+        _, first = self.report(start, end).get()
+        self.assertEqual(10, len(list(first)))
+        self.assertIn('structure', self.report(start, end).metadata)
+        calls = len(responses.calls)
+
+        headers, rows = self.report(start, end).get()
+        self.assertEqual(['start_date', 'end_date', 'impressions'], headers)
+        self.assertEqual(10, len(list(rows)))
+        self.assertIn('structure', self.report(start, end).metadata)
+        cols = self.report(start, end).get_columns()
+        self.assertEqual(10, len(cols['impressions']))
+        self.assertEqual(calls, len(responses.calls))
+        self.assertFalse([n for n in os.listdir(self.directory)
+                          if n.endswith('.part')])
+
+    @responses.activate
+    def test_cache_not_shared_between_users(self):
+        self.add_responses()
+        start, end = date(2016, 3, 1), date(2016, 3, 10)
+        _, rows = self.report(start, end).get()
+        list(rows)
+        calls = len(responses.calls)
+
+        report = self.report(start, end)
+        report.user_id = self.t1.user_id + 1
+        _, rows = report.get()
+        self.assertEqual(10, len(list(rows)))
+        self.assertEqual(calls + 1, len(responses.calls))
+
+    @responses.activate
+    def test_open_range_not_cached(self):
+        self.add_responses()
+        start, end = date.today() - timedelta(days=3), date.today()
+        for _ in range(2):
+            _, rows = self.report(start, end).get()
+            self.assertEqual(4, len(list(rows)))
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_sharded_uses_cache(self):
+        self.add_responses()
+        start, end = date.today() - timedelta(days=13), date.today()
+        for _ in range(2):
+            _, rows = self.report(start, end).get_sharded(days=7, workers=2)
+            self.assertEqual(14, len(list(rows)))
+        # The closed window is only fetched once
+        self.assertEqual(3, len(responses.calls))
+
+    def test_lru_eviction(self):
+        cache = ReportCache(self.directory, max_size=10)
+        first = cache.put(cache.key('first'), [b'12345'])
+        os.utime(first, (0, 0))
+        cache.put(cache.key('second'), [b'12345'])
+        self.assertIsNotNone(cache.get(cache.key('first')))
+        cache.put(cache.key('third'), [b'12345'])
+
+        self.assertIsNotNone(cache.get(cache.key('first')))
+        self.assertIsNone(cache.get(cache.key('second')))
+        self.assertEqual(10, cache.size())
+        self.assertIsNone(cache.get(cache.key('third'), ttl=-1))
+
+
+class TestDownload(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'performance.csv')
+        self.body = daily_rows(date(2016, 3, 1), date(2016, 3, 31)).encode('utf-8')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def add_response(self, ranges=True):
+        def report_callback(request):
+            headers = {'ETag': '"v1"'}
+            requested = request.headers.get('Range')
+            if not ranges or requested is None:
+                return 200, headers, self.body
+            offset = int(requested[len('bytes='):-1])
+            if offset >= len(self.body):
+                return 416, headers, b''
+            headers['Content-Range'] = 'bytes {}-{}/{}'.format(
+                offset, len(self.body) - 1, len(self.body))
+            return 206, headers, self.body[offset:]
+
+        responses.add_callback(responses.GET,
+                               'https://api.mediamath.com/reporting/v1/std/performance',
+                               callback=report_callback,
+                               content_type='text/csv; charset=UTF-8')
+
+    def report(self):
+        report = self.t1.new('report', 'performance')
+        report.set({'time_rollup': 'by_day',
+                    'start_date': '2016-03-01',
+                    'end_date': '2016-03-31'})
+        return report
+
+    def write_part(self, data, report=None, validator='"v1"'):
+        """Leave a partial download as an interrupted download of report."""
+        with open(self.path + '.part', 'wb') as f:
+            f.write(data)
+        report = report or self.report()
+        key = ReportCache.key(report._url(report.report), report._get_params())
+        reports._write_part_state(self.path + '.part.json', key, validator)
+
+    @responses.activate
+    def test_download(self):
+        self.add_response()
+        self.assertEqual(self.path, self.report().download(self.path))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(self.body, f.read())
+        self.assertEqual(['performance.csv'], os.listdir(self.directory))
+
+        headers, rows = self.report().get(path=self.path)
+        self.assertEqual(['start_date', 'end_date', 'impressions'], headers)
+        self.assertEqual([str(d) for d in range(1, 32)],
+                         [row[2] for row in rows])
+
+    @responses.activate
+    def test_resume(self):
+        self.add_response()
+        self.write_part(self.body[:100])
+        self.report().download(self.path)
+
+        self.assertEqual('bytes=100-', responses.calls[0].request.headers['Range'])
+        self.assertEqual('"v1"', responses.calls[0].request.headers['If-Range'])
+        with open(self.path, 'rb') as f:
+            self.assertEqual(self.body, f.read())
+        self.assertEqual(['performance.csv'], os.listdir(self.directory))
+
+    @responses.activate
+    def test_part_of_other_query_not_resumed(self):
+        self.add_response()
+        other = self.report()
+        other.set({'end_date': '2016-03-30'})
+        self.write_part(b'stale', report=other)
+        self.report().download(self.path)
+
+        self.assertNotIn('Range', responses.calls[0].request.headers)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(self.body, f.read())
+
+    @responses.activate
+    def test_part_without_validator_not_resumed(self):
+        self.add_response()
+        self.write_part(b'stale', validator=None)
+        self.report().download(self.path)
+
+        self.assertNotIn('Range', responses.calls[0].request.headers)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(self.body, f.read())
+
+    @responses.activate
+    def test_resume_complete(self):
+        self.add_response()
+        self.write_part(self.body)
+        self.report().download(self.path)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(self.body, f.read())
+
+    @responses.activate
+    def test_restart_without_ranges(self):
+        self.add_response(ranges=False)
+        self.write_part(b'stale')
+        self.report().download(self.path)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(self.body, f.read())
+
+    @responses.activate
+    def test_gzip(self):
+        self.add_response()
+        self.report().download(self.path, compress='gzip')
+        with open(self.path, 'rb') as f:
+            self.assertEqual(reports.GZIP_MAGIC, f.read(2))
+        _, rows = self.report().get(path=self.path, as_dict=True)
+        self.assertEqual(31, len(list(rows)))
+
+    @unittest.skipIf(reports.zstd is None, 'zstandard not installed')
+    @responses.activate
+    def test_zstd(self):
+        self.add_response()
+        self.report().download(self.path, compress='zstd')
+        with open(self.path, 'rb') as f:
+            self.assertEqual(reports.ZSTD_MAGIC, f.read(4))
+        _, rows = self.report().get(path=self.path)
+        self.assertEqual([str(d) for d in range(1, 32)],
+                         [row[2] for row in rows])
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ClientError):
+            self.report().download(self.path, compress='bz2')
@@ -0,0 +1,130 @@
+from __future__ import absolute_import
+import time
+import unittest
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1, errors
+from terminalone.retry import RetryPolicy, TokenBucket
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+UNAVAILABLE = ('<?xml version="1.0" ?><result><status code="error">'
+               'Service Unavailable</status></result>')
+
+
+class TestRetry(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     retry=RetryPolicy(retries=2, backoff=0),
+                     rate_limit=1000,
+                     **mock_credentials)
+
+    @responses.activate
+    def test_get_retried(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        url = 'https://api.mediamath.com/api/v2.0/advertisers/1'
+        responses.add(responses.GET, url, body=UNAVAILABLE, status=503,
+                      content_type='application/xml')
+        responses.add(responses.GET, url, body=fixture,
+                      content_type='application/xml')
+
+        adv = self.t1.get('advertisers', 1)
+        self.assertEqual(1, adv.id)
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_post_not_retried_when_unsafe(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        url = 'https://api.mediamath.com/api/v2.0/advertisers/1'
+        responses.add(responses.GET, url, body=fixture,
+                      content_type='application/xml')
+        responses.add(responses.POST, url, body=UNAVAILABLE, status=503,
+                      content_type='application/xml')
+
+        adv = self.t1.get('advertisers', 1)
+        self.assertIs(self.t1.retry, adv.retry)
+        self.assertIs(self.t1.rate_limiter, adv.rate_limiter)
+        adv.name = 'Renamed'
+        with self.assertRaises(errors.APIError):
+            adv.save()
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_throttled_post_retried(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        url = 'https://api.mediamath.com/api/v2.0/advertisers/1'
+        responses.add(responses.GET, url, body=fixture,
+                      content_type='application/xml')
+        responses.add(responses.POST, url, body=UNAVAILABLE, status=429,
+                      adding_headers={'Retry-After': '0'},
+                      content_type='application/xml')
+        responses.add(responses.POST, url, body=fixture,
+                      content_type='application/xml')
+
+        adv = self.t1.get('advertisers', 1)
+        adv.name = 'Renamed'
+        adv.save()
+        self.assertEqual(3, len(responses.calls))
+
+    @responses.activate
+    def test_gives_up(self):
+        url = 'https://api.mediamath.com/api/v2.0/advertisers/1'
+        responses.add(responses.GET, url, body=UNAVAILABLE, status=503,
+                      content_type='application/xml')
+
+        with self.assertRaises(errors.APIError):
+            self.t1.get('advertisers', 1)
+        self.assertEqual(3, len(responses.calls))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        for attempt in range(6):
+            self.assertTrue(0 <= policy.delay(attempt) <= min(5, 2 ** attempt))
+
+        response = requests.Response()
+        response.status_code = 429
+        response.headers['Retry-After'] = '3'
+        self.assertEqual(3, policy.delay(0, response))
+        self.assertTrue(policy.should_retry('GET', 0, response))
+
+        # Not retried early when asked to wait longer than the cap
+        response.headers['Retry-After'] = '60'
+        self.assertFalse(policy.should_retry('GET', 0, response))
+        self.assertFalse(policy.should_retry('POST', 0, response))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.time()
+        for _ in range(4):
+            bucket.acquire()
+        # First token is available immediately, the next three at 50/s
+        self.assertGreaterEqual(time.time() - start, 0.05)
@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+import re
+import unittest
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1
+from terminalone.errors import NotFoundError, ValidationError
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+SAVED = """<?xml version="1.0" ?>
+<result>
+  <entity name="{name}" id="{id}" type="advertiser" version="{version}">
+    <prop name="status" value="0"/>
+  </entity>
+  <status code="ok"/>
+</result>
+"""
+
+CONFLICT = """<?xml version="1.0" ?>
+<result>
+  <errors>
+    <field-error name="version" error="Entity has been modified" />
+  </errors>
+  <status code="invalid">Validation errors</status>
+</result>
+"""
+
+NOT_FOUND = """<?xml version="1.0" ?>
+<result><status code="not_found">Not found</status></result>
+"""
+
+
+class TestSaveMany(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+
+    @responses.activate
+    def test_save_many(self):
+        def save_callback(request):
+            ent_id = int(request.path_url.split('?')[0].rsplit('/', 1)[1])
+            if ent_id == 3:
+                return 200, {}, CONFLICT
+            if ent_id == 4:
+                return 404, {}, NOT_FOUND
+            return 200, {}, SAVED.format(name='adv {}'.format(ent_id),
+                                         id=ent_id, version=2)
+
+        responses.add_callback(responses.POST,
+                               re.compile(r'https://api\.mediamath\.com/api/v2\.0/advertisers/\d+'),
+                               callback=save_callback,
+                               content_type='application/xml')
+        ents = [self.t1.new('advertiser', properties={
+            'id': i, 'name': 'adv {}'.format(i), 'version': 1, 'status': True})
+            for i in range(1, 7)]
+        for ent in ents:
+            ent.status = False
+
+        results = self.t1.save_many(iter(ents), workers=3)
+
+        self.assertEqual(ents, [result.entity for result in results])
+        self.assertEqual([True, True, False, False, True, True],
+                         [result.ok for result in results])
+        self.assertEqual([False, False, True, False, False, False],
+                         [result.conflict for result in results])
+        self.assertIsInstance(results[2].error, ValidationError)
+        self.assertIn('version', results[2].error.errors)
+        self.assertIsInstance(results[3].error, NotFoundError)
+        # Successful saves are updated from the response
+        self.assertEqual(2, ents[0].version)
+        self.assertEqual(1, ents[2].version)
+        self.assertEqual(6, len(responses.calls))
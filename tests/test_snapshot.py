@@ -0,0 +1,122 @@
+from __future__ import absolute_import
+import shutil
+import tempfile
+import unittest
+from contextlib import closing
+from datetime import datetime
+import responses
+import requests
+from terminalone.vendor.six.moves.urllib.parse import parse_qs, urlparse
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1
+from terminalone.errors import ClientError
+from terminalone.snapshot import SnapshotStore
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+ENTITY = """
+    <entity name="{name}" id="{id}" type="advertiser" version="{version}">
+      <prop name="agency_id" value="7" />
+      <prop name="status" value="{status}" />
+      <prop name="updated_on" value="{updated_on}" />
+    </entity>"""
+
+ALL = [
+    dict(id=1, name='adv 1', version=0, status=1, updated_on='2015-08-21T15:28:53'),
+    dict(id=2, name='adv 2', version=3, status=0, updated_on='2015-08-23T10:00:00'),
+    dict(id=3, name='adv 3', version=1, status=1, updated_on='2015-08-22T09:00:00'),
+]
+
+CHANGED = [
+    dict(id=2, name='adv 2', version=3, status=0, updated_on='2015-08-23T10:00:00'),
+    dict(id=3, name='renamed', version=2, status=0, updated_on='2015-08-24T12:00:00'),
+    dict(id=4, name='adv 4', version=0, status=1, updated_on='2015-08-24T12:30:00'),
+]
+
+
+def advertisers(ents):
+    return ('<?xml version="1.0" ?><result><entities count="{}">{}'
+            '</entities><status code="ok" /></result>').format(
+        len(ents), ''.join(ENTITY.format(**ent) for ent in ents))
+
+
+class TestSnapshot(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     **mock_credentials)
+        self.directory = tempfile.mkdtemp()
+        self.store = SnapshotStore(self.t1, self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def add_responses(self):
+        def callback(request):
+            query = parse_qs(urlparse(request.url).query)
+            if 'q' in query:
+                return 200, {}, advertisers(CHANGED)
+            return 200, {}, advertisers(ALL)
+
+        responses.add_callback(responses.GET,
+                               'https://api.mediamath.com/api/v2.0/advertisers',
+                               callback=callback,
+                               content_type='application/xml')
+
+    @responses.activate
+    def test_incremental_sync(self):
+        self.add_responses()
+        self.assertEqual(3, self.store.sync('advertisers'))
+        self.assertEqual(datetime(2015, 8, 23, 10),
+                         self.store.high_water_mark('advertisers').replace(tzinfo=None))
+
+        self.assertEqual(3, self.store.sync('advertisers'))
+        query = parse_qs(urlparse(responses.calls[-1].request.url).query)
+        self.assertEqual(['updated_on>=2015-08-23T10:00:00'], query['q'])
+
+        ents = list(self.store.query('advertisers', order_by='id'))
+        self.assertEqual([1, 2, 3, 4], [ent.id for ent in ents])
+        self.assertEqual('renamed', ents[2].name)
+        self.assertEqual(2, ents[2].version)
+        self.assertIs(False, ents[2].status)
+        self.assertEqual(datetime(2015, 8, 24, 12),
+                         ents[2].updated_on.replace(tzinfo=None))
+
+    @responses.activate
+    def test_query(self):
+        self.add_responses()
+        self.store.sync('advertisers')
+        active = list(self.store.query('advertisers', 'status = ?', (1,),
+                                       order_by='id DESC', limit=1))
+        self.assertEqual([3], [ent.id for ent in active])
+
+        with closing(self.store.connect('advertisers')) as conn:
+            indexes = [row['name'] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")]
+        self.assertIn('advertisers_updated_on', indexes)
+        self.assertIn('advertisers_agency_id', indexes)
+
+    def test_not_synced(self):
+        self.assertIsNone(self.store.high_water_mark('advertisers'))
+        with self.assertRaises(ClientError):
+            list(self.store.query('advertisers'))
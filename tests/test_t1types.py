@@ -40,6 +40,23 @@ class TestT1Types(unittest.TestCase):
         self.assertEqual(36000, dt_two.tzinfo.utcoffset().seconds)
         self.assertEqual(3600, dt_three.tzinfo.utcoffset().seconds)
 
+    def test_strpt_matches_strptime(self):
+        dates = ['2016-11-07T09:07:57', '2016-11-07T09:07:57+0000',
+                 '2016-11-16T12:31:10+00:00', '2016-11-16T12:31:10-0530',
+                 '2016-11-16T12:31:10-05:30', '2016-11-16T12:31:10-0030']
+        for date in dates:
+            parsed = t1types.strpt(date)
+            self.assertEqual(t1types._strpt(date), parsed)
+            self.assertEqual(t1types._strpt(date).utcoffset(),
+                             parsed.utcoffset())
+        self.assertIs(t1types.strpt(dates[1]).tzinfo,
+                      t1types.strpt(dates[2]).tzinfo)
+
+        for date in ['2016-11-07T09:07:57.123', '2016-13-07T09:07:57',
+                     '2016-11-07 09:07:57', 'not a date']:
+            with self.assertRaises(ValueError):
+                t1types.strpt(date)
+
     def test_strft(self):
         date_str = '2016-11-07T09:07:57+01:00'
         expected_no_offset = '2016-11-07T09:07:57'
@@ -0,0 +1,160 @@
+from __future__ import absolute_import
+import asyncio
+import re
+import unittest
+import responses
+import requests
+from .requests_patch import patched_extract_cookies_to_jar
+from terminalone import T1
+from terminalone.vendor.six.moves.urllib.parse import parse_qs, urlparse
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import \
+        InMemorySpanExporter
+    from terminalone.tracing import OpenTelemetryTracer
+except ImportError:
+    TracerProvider = None
+
+try:
+    from aioresponses import aioresponses
+    from terminalone.aio import AsyncT1
+except ImportError:
+    aioresponses = None
+
+mock_credentials = {
+    'username': 'user',
+    'password': 'password',
+    'api_key': 'api_key',
+}
+
+API_BASE = 'api.mediamath.com'
+
+requests.sessions.extract_cookies_to_jar = patched_extract_cookies_to_jar
+requests.adapters.extract_cookies_to_jar = patched_extract_cookies_to_jar
+
+
+@unittest.skipIf(TracerProvider is None, 'opentelemetry-sdk not installed')
+class TestTracing(unittest.TestCase):
+    @responses.activate
+    def setUp(self):
+        """set up test fixtures"""
+        with open('tests/fixtures/xml/session.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST, 'https://api.mediamath.com/api/v2.0/login',
+                      body=fixture,
+                      adding_headers={
+                          'Set-Cookie': 'adama_session=1',
+                      },
+                      content_type='application/xml')
+
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        tracer = OpenTelemetryTracer(provider.get_tracer('tests'))
+        self.t1 = T1(auth_method='cookie',
+                     api_base=API_BASE,
+                     tracer=tracer,
+                     **mock_credentials)
+        self.exporter.clear()
+
+    def spans(self):
+        spans = self.exporter.get_finished_spans()
+        by_id = dict((span.context.span_id, span) for span in spans)
+
+        def parent(span):
+            return by_id[span.parent.span_id].name if span.parent else None
+        return [(span.name, parent(span), dict(span.attributes))
+                for span in sorted(spans, key=lambda span: span.start_time)]
+
+    @responses.activate
+    def test_get_all(self):
+        total = 150
+
+        def page_callback(request):
+            params = parse_qs(urlparse(request.url).query)
+            limit = int(params['page_limit'][0])
+            offset = int(params.get('page_offset', ['0'])[0])
+            ids = range(offset + 1, min(offset + limit, total) + 1)
+            body = ('<?xml version="1.0" ?><result><entities count="{}">{}'
+                    '</entities><status code="ok" /></result>').format(
+                total, ''.join('<entity id="{0}" name="org {0}" '
+                               'type="organization" />'.format(i) for i in ids))
+            return 200, {}, body
+
+        responses.add_callback(responses.GET,
+                               'https://api.mediamath.com/api/v2.0/organizations',
+                               callback=page_callback,
+                               content_type='application/xml')
+        orgs = self.t1.get_all('organizations', workers=2)
+        self.assertEqual([], self.spans())
+        self.assertEqual(total, len(list(orgs)))
+
+        spans = self.spans()
+        self.assertEqual(('T1.get_all', None), spans[0][:2])
+        self.assertEqual(total, spans[0][2]['t1.entity_count'])
+        # count probe, then one T1.get per page, in worker threads
+        self.assertEqual([('HTTP GET', 'T1.get_all'), ('parse', 'T1.get_all')],
+                         [span[:2] for span in spans[1:3]])
+        self.assertEqual(1, spans[1][2]['t1.page_limit'])
+        pages = [span for span in spans if span[0] == 'T1.get']
+        self.assertEqual([('T1.get', 'T1.get_all')] * 2,
+                         [span[:2] for span in pages])
+        self.assertEqual([0, 100], sorted(span[2]['t1.page_offset']
+                                          for span in pages))
+        requests_ = [span for span in spans[3:] if span[0] == 'HTTP GET']
+        self.assertEqual(['T1.get'] * 2, [span[1] for span in requests_])
+        self.assertEqual('organizations', requests_[0][2]['t1.url_template'])
+        self.assertEqual(200, requests_[0][2]['http.status_code'])
+        parses = [span for span in spans if span[0] == 'parse']
+        self.assertEqual([total] * 3,
+                         [span[2]['t1.total_count'] for span in parses])
+
+    @responses.activate
+    def test_save(self):
+        with open('tests/fixtures/xml/advertiser.xml') as f:
+            fixture = f.read()
+        responses.add(responses.POST,
+                      'https://api.mediamath.com/api/v2.0/advertisers/1',
+                      body=fixture, content_type='application/xml')
+        adv = self.t1.new('advertiser', properties={
+            'id': 1, 'name': 'adv', 'version': 0, 'status': True})
+        adv.status = False
+        adv.save()
+
+        self.assertEqual(
+            [('Entity.save', None, {'t1.collection': 'advertisers',
+                                    't1.entity_id': 1}),
+             ('HTTP POST', 'Entity.save'), ('parse', 'Entity.save')],
+            [self.spans()[0]] + [span[:2] for span in self.spans()[1:]])
+        self.assertEqual('advertisers/{id}',
+                         self.spans()[1][2]['t1.url_template'])
+
+    def test_error(self):
+        with responses.RequestsMock():
+            with self.assertRaises(requests.ConnectionError):
+                self.t1.get('advertisers', 1)
+        spans = self.exporter.get_finished_spans()
+        self.assertEqual(['HTTP GET', 'T1.get'], [span.name for span in spans])
+        self.assertEqual([False, False], [span.status.is_ok for span in spans])
+
+    @unittest.skipIf(aioresponses is None, 'aiohttp/aioresponses not installed')
+    def test_async(self):
+        with open('tests/fixtures/xml/advertisers.xml') as f:
+            fixture = f.read()
+
+        async def run():
+            with aioresponses() as mocked:
+                mocked.get(re.compile(r'^https://api\.mediamath\.com/api/v2\.0/advertisers'),
+                           body=fixture, content_type='application/xml')
+                async with AsyncT1(self.t1) as t1a:
+                    await t1a.get('advertisers', page_limit=100, page_offset=200)
+
+        asyncio.new_event_loop().run_until_complete(run())
+        spans = self.spans()
+        self.assertEqual(['HTTP GET', 'parse'], [span[0] for span in spans])
+        self.assertEqual('advertisers', spans[0][2]['t1.url_template'])
+        self.assertEqual(100, spans[0][2]['t1.page_limit'])
+        self.assertEqual(200, spans[0][2]['t1.page_offset'])
+        self.assertEqual(200, spans[0][2]['http.status_code'])
@@ -1,5 +1,6 @@
+import io
 import unittest
-from terminalone.xmlparser import XMLParser
+from terminalone.xmlparser import XMLParser, StreamingXMLParser
 from terminalone import errors
 
 
@@ -58,3 +59,43 @@ class TestXMLParsing(unittest.TestCase):
         parser = XMLParser(fixture)
         self.assertEqual(True, parser.status_code)
         self.assertEqual(3, parser.entity_count)
+
+
+class TestStreamingXMLParsing(unittest.TestCase):
+    def test_collection(self):
+        with open('tests/fixtures/xml/campaigns_with_strategies.xml', 'rb') as f:
+            parser = StreamingXMLParser(f)
+            self.assertFalse(parser.status_code)
+            entities = list(parser.entities)
+        with open('tests/fixtures/xml/campaigns_with_strategies.xml', 'rb') as f:
+            expected = list(XMLParser(f.read()).entities)
+
+        self.assertEqual(expected, entities)
+        self.assertEqual(True, parser.status_code)
+
+    def test_count_before_entities(self):
+        with open('tests/fixtures/xml/advertisers.xml', 'rb') as f:
+            parser = StreamingXMLParser(f)
+            self.assertEqual(12345, parser.entity_count)
+            self.assertEqual('advertiser 1', next(parser.entities)['name'])
+
+    def test_error_after_entities(self):
+        body = io.BytesIO(b'<result><entities count="1"><entity id="1" '
+                          b'type="advertiser" /></entities><status '
+                          b'code="auth_required">Authentication error'
+                          b'</status></result>')
+        parser = StreamingXMLParser(body)
+        with self.assertRaises(errors.AuthRequiredError):
+            list(parser.entities)
+
+    def test_single_entity(self):
+        with open('tests/fixtures/xml/advertiser.xml', 'rb') as f:
+            parser = StreamingXMLParser(f)
+        self.assertEqual(True, parser.status_code)
+        self.assertEqual(1, parser.entity_count)
+        self.assertEqual('advertiser', parser.entities['_type'])
+
+    def test_auth_error(self):
+        with open('tests/fixtures/xml/auth_error.xml', 'rb') as f:
+            with self.assertRaises(errors.AuthRequiredError):
+                StreamingXMLParser(f)